@@ -0,0 +1,217 @@
+"""
+Measure the compact histories (PIPELINE.compact_history) on the evaluation set, and
+check the outlines keep what the code needs.
+
+The recorded conversations of data/test/test_data.jsonl that start with the types
+are replayed: the types answer is outlined as it is sent to the initial code, and
+every name of the types the reference code (the last answer) uses, type or field,
+must be in the outline. The specs of a directory, if it exists, are outlined as
+they are sent to the feedback, and every operation must be in the outline, with
+its parameters.
+
+Usage (from the repository root):
+    python -m benchmarks.history
+    python -m benchmarks.history --specs data/specification-batch
+"""
+
+import argparse
+import ast
+import json
+import re
+import sys
+from pathlib import Path
+
+from sdkgenerator.batch import find_specs
+from sdkgenerator.constants import DATA_DIR
+from sdkgenerator.history import api_spec_outline, types_outline
+from sdkgenerator.manifier import get_minified_api, get_operations
+from sdkgenerator.tokens import count_tokens
+from sdkgenerator.types import MinifiedApi, Operation
+from sdkgenerator.utils import get_code_from_model_response
+
+
+def code_names(code: str) -> set[str]:
+    """
+    Get the names and the strings of a code, which hold the fields of the TypedDicts.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return set()
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            names.add(node.value)
+
+    return names
+
+
+def types_names(types_code: str) -> set[str]:
+    """
+    Get the types and the fields a types module defines.
+    """
+    names = set()
+    for node in ast.parse(types_code).body:
+        if isinstance(node, ast.ClassDef):
+            names.add(node.name)
+            names.update(
+                item.target.id
+                for item in node.body
+                if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name)
+            )
+        elif isinstance(node, ast.Assign):
+            names.update(
+                target.id for target in node.targets if isinstance(target, ast.Name)
+            )
+
+    return names
+
+
+def measure_conversations(test_data: Path) -> list[dict]:
+    results = []
+    for index, line in enumerate(test_data.read_text().splitlines()):
+        messages = json.loads(line)["messages"]
+        if not messages[1]["content"].lstrip().startswith("Write the types"):
+            continue
+
+        types_code, _ = get_code_from_model_response(messages[2]["content"])
+        reference, _ = get_code_from_model_response(messages[-1]["content"])
+        if not types_code or not reference:
+            continue
+        try:
+            defined = types_names(types_code)
+        except SyntaxError:
+            continue
+
+        outline = types_outline(types_code)
+        used = code_names(reference) & defined
+        results.append(
+            {
+                "name": f"conversation {index}",
+                "tokens": count_tokens(types_code, step="initial_code"),
+                "sent_tokens": count_tokens(outline, step="initial_code"),
+                "missing": sorted(used - set(re.findall(r"\w+", outline))),
+            }
+        )
+
+    return results
+
+
+def operation_parameters(minified: MinifiedApi, operation: Operation) -> list[str]:
+    """
+    Get the names of the parameters of an operation of a minified spec.
+    """
+    for endpoint in minified["paths"][operation["path"]]["endpoints"]:
+        metadata = endpoint["metadata"]
+        if metadata["method"] == operation["method"]:
+            return [
+                parameter["name"]
+                for parameter in metadata["parameters"]
+                if parameter.get("in") != "body"
+            ]
+
+    return []
+
+
+def outline_has(outline: str, key: str, name: str | None) -> bool:
+    """
+    Check the line of an operation is in the outline, with a parameter if given.
+    """
+    return any(
+        line.startswith(f"{key} ") and (name is None or f" {name}" in line)
+        for line in outline.splitlines()
+    )
+
+
+def measure_specs(specs_dir: Path) -> list[dict]:
+    results = []
+    for file_path in find_specs(specs_dir):
+        try:
+            minified = get_minified_api(file_path)
+        except Exception as e:
+            print(f"Skipping {file_path.name}: {e}")
+            continue
+
+        outline = api_spec_outline(minified)
+        results.append(
+            {
+                "name": file_path.stem,
+                "tokens": count_tokens(minified["api_spec"], step="feedback"),
+                "sent_tokens": count_tokens(outline, step="feedback"),
+                "missing": [
+                    f"{key} {name}" if name else key
+                    for key, operation in get_operations(minified["paths"]).items()
+                    for name in [None] + operation_parameters(minified, operation)
+                    if not outline_has(outline, key, name)
+                ],
+            }
+        )
+
+    return results
+
+
+def format_results(title: str, results: list[dict]) -> str:
+    lines = [
+        title,
+        f"{'':<4}{'name':<36}{'tokens':>10}{'outline':>10}{'saved':>8}{'missing':>9}",
+    ]
+    for result in results:
+        saved = 1 - result["sent_tokens"] / result["tokens"] if result["tokens"] else 0
+        lines.append(
+            f"{'':<4}{result['name'][:35]:<36}{result['tokens']:>10}"
+            f"{result['sent_tokens']:>10}{saved:>8.0%}{len(result['missing']):>9}"
+        )
+
+    tokens = sum(result["tokens"] for result in results)
+    sent_tokens = sum(result["sent_tokens"] for result in results)
+    if tokens:
+        lines.append(
+            f"{'':<4}{'total':<36}{tokens:>10}{sent_tokens:>10}"
+            f"{1 - sent_tokens / tokens:>8.0%}"
+            f"{sum(len(result['missing']) for result in results):>9}"
+        )
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--test-data",
+        type=Path,
+        default=DATA_DIR / "test" / "test_data.jsonl",
+        help="The recorded conversations.",
+    )
+    parser.add_argument(
+        "--specs",
+        type=Path,
+        default=DATA_DIR / "specification-batch",
+        help="Directory of specs to outline, if it exists.",
+    )
+    args = parser.parse_args()
+
+    results = measure_conversations(args.test_data)
+    print(format_results("Types in the history of the initial code", results))
+    if args.specs.is_dir():
+        spec_results = measure_specs(args.specs)
+        print()
+        print(format_results("Spec in the history of the feedback", spec_results))
+        results += spec_results
+
+    missing = [
+        f"- {result['name']}: {', '.join(result['missing'])}"
+        for result in results
+        if result["missing"]
+    ]
+    if missing:
+        print("\nThe outlines miss names the code uses:\n" + "\n".join(missing))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the throughput of the sync and async LLM clients against the local mock server.
+
+Usage (from the repository root):
+    python -m benchmarks.llm_client --requests 500 --concurrency 100 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from sdkgenerator.mock_server import start_mock_server
+from sdkgenerator.utils import aclose_async_client, get_async_client, get_session
+
+request_body = {
+    "model": "stub",
+    "temperature": 0,
+    "max_tokens": 256,
+    "messages": [{"role": "user", "content": "Write me an sdk for my api"}],
+}
+
+
+def bench_threads(post, url: str, n: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for response in executor.map(
+            lambda _: post(url, json=request_body, timeout=60), range(n)
+        ):
+            response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def bench_async(url: str, n: int, concurrency: int) -> float:
+    client = get_async_client()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post():
+        async with semaphore:
+            response = await client.post(url, json=request_body)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(post() for _ in range(n)))
+    elapsed = time.perf_counter() - start
+    await aclose_async_client()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        port=0, latency={"distribution": "fixed", "mean": args.latency}
+    )
+    url = f"{server.url}/v1/chat/completions"
+
+    results = {
+        "sync, requests.post": bench_threads(
+            requests.post, url, args.requests, args.concurrency
+        ),
+        "sync, shared session": bench_threads(
+            get_session().post, url, args.requests, args.concurrency
+        ),
+        "async, shared client": asyncio.run(
+            bench_async(url, args.requests, args.concurrency)
+        ),
+    }
+    server.shutdown()
+
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"server latency {args.latency}s"
+    )
+    for name, elapsed in results.items():
+        print(f"{name:<24}{elapsed:>8.2f}s{args.requests / elapsed:>10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare the load time of the specs with the pure-Python parsers, the fast parsers
+and the parsed spec cache.
+
+Usage (from the repository root):
+    python -m benchmarks.load data/specification-batch
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from sdkgenerator import loader
+from sdkgenerator.loader import load_spec, parse_spec
+
+
+def load_pure_python(file_path: Path) -> dict:
+    with open(file_path, "r", encoding="utf-8") as file:
+        if file_path.suffix == ".json":
+            return json.load(file)
+        return yaml.safe_load(file)
+
+
+def timed(function, file_path: Path) -> tuple[float, dict]:
+    start = time.perf_counter()
+    spec = function(file_path)
+    return time.perf_counter() - start, spec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "specs",
+        type=Path,
+        nargs="?",
+        default=Path("data") / "specification-batch",
+        help="Directory of the specs to load.",
+    )
+    args = parser.parse_args()
+
+    files = sorted(
+        file
+        for file in args.specs.iterdir()
+        if file.suffix.lower() in loader.json_extensions | loader.yaml_extensions
+    )
+    print(
+        f"YAML loader: {loader.SpecLoader.__name__}, "
+        f"JSON parser: {'orjson' if loader.orjson else 'json'}\n"
+    )
+    print(f"{'spec':<40}{'size (KB)':>10}{'pure python':>13}{'fast':>10}{'cached':>10}")
+
+    totals = [0.0, 0.0, 0.0]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with mock.patch.object(loader, "SPEC_CACHE_DIR", Path(cache_dir)):
+            for file in files:
+                pure, expected = timed(load_pure_python, file)
+                fast, spec = timed(
+                    lambda path: parse_spec(path.read_bytes(), path.suffix.lower()),
+                    file,
+                )
+                # the first cached load parses and writes the cache, the second reads it
+                load_spec(file, use_cache=True)
+                cached, cached_spec = timed(
+                    lambda path: load_spec(path, use_cache=True), file
+                )
+
+                if not expected == spec == cached_spec:
+                    raise Exception(f"The loaded specs of {file.name} differ.")
+
+                for i, seconds in enumerate((pure, fast, cached)):
+                    totals[i] += seconds
+                print(
+                    f"{file.name[:39]:<40}{file.stat().st_size / 1024:>10.0f}"
+                    f"{pure:>12.3f}s{fast:>9.3f}s{cached:>9.3f}s"
+                )
+
+    print(f"{'total':<50}{totals[0]:>12.3f}s{totals[1]:>9.3f}s{totals[2]:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
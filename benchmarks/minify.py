@@ -0,0 +1,166 @@
+"""
+Compare the minification time of the per-spec schema index with the previous resolver,
+which re-abbreviated all the accumulated types after every endpoint.
+
+Usage (from the repository root):
+    python -m benchmarks.minify --endpoints 100 500 2000 --specs data/specification-batch
+"""
+
+import argparse
+import copy
+import time
+from pathlib import Path
+from unittest import mock
+
+from sdkgenerator import manifier
+from sdkgenerator.manifier import (
+    SchemaIndex,
+    abbreviate,
+    load_file,
+    minify,
+    resolve_refs_types,
+    types_key_abbreviations,
+)
+
+
+class LegacySchemaIndex(SchemaIndex):
+    """
+    The previous resolution: one types dict, fully abbreviated after every endpoint.
+    """
+
+    def resolve(self, ref):
+        return resolve_refs_types(self.openapi_spec, ref, self.types)
+
+    def abbreviate_pending(self):
+        if self.types:
+            self.types = abbreviate(self.types, types_key_abbreviations)
+
+    def get_types(self) -> dict:
+        return self.types
+
+
+def synthetic_spec(endpoints: int) -> dict:
+    """
+    Build a spec with `endpoints` operations, each with its own request body schema
+    referencing shared and recursive schemas.
+    """
+    schemas = {
+        "Pet": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string", "description": "The name of the pet"},
+                "tag": {"$ref": "#/components/schemas/Tag"},
+                "status": {"type": "string", "enum": ["available", "sold"]},
+            },
+        },
+        "Tag": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "parent": {"$ref": "#/components/schemas/Tag"},
+            },
+        },
+    }
+    paths = {}
+    for i in range(0, endpoints, 2):
+        schemas[f"Model{i}"] = {
+            "type": "object",
+            "properties": {
+                "pet": {"$ref": "#/components/schemas/Pet"},
+                "count": {"type": "integer", "minimum": 0},
+                "previous": {"$ref": f"#/components/schemas/Model{max(i - 2, 0)}"},
+            },
+        }
+        paths[f"/resource{i}/{{id}}"] = {
+            "parameters": [{"$ref": "#/components/parameters/Id"}],
+            "get": {
+                "operationId": f"getResource{i}",
+                "summary": f"Get resource {i}",
+                "parameters": [
+                    {"name": "limit", "in": "query", "schema": {"type": "integer"}}
+                ],
+            },
+            "put": {
+                "operationId": f"updateResource{i}",
+                "summary": f"Update resource {i}",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": f"#/components/schemas/Model{i}"}
+                        }
+                    }
+                },
+            },
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "synthetic", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "components": {
+            "schemas": schemas,
+            "parameters": {
+                "Id": {
+                    "name": "id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                }
+            },
+        },
+        "paths": paths,
+    }
+
+
+def time_minify(spec: dict, repeat: int) -> tuple[float, tuple]:
+    # minify mutates the parameters of the spec, so each run gets a fresh copy
+    copies = [copy.deepcopy(spec) for _ in range(repeat)]
+    start = time.perf_counter()
+    for spec_copy in copies:
+        result = minify(spec_copy)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def bench(name: str, spec: dict, repeat: int):
+    with mock.patch.object(manifier, "SchemaIndex", LegacySchemaIndex):
+        before, legacy_result = time_minify(spec, repeat)
+    after, result = time_minify(spec, repeat)
+
+    if repr(result) != repr(legacy_result):
+        raise Exception(f"The minified outputs of {name} differ.")
+
+    endpoints = sum(len(path["endpoints"]) for path in result[0].values())
+    print(
+        f"{name:<32}{endpoints:>10}{len(result[2]):>8}"
+        f"{before:>12.3f}s{after:>10.3f}s{before / after:>9.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", type=int, nargs="*", default=[100, 500, 2000])
+    parser.add_argument(
+        "--specs",
+        type=Path,
+        default=Path("data") / "specification-batch",
+        help="Directory of real specs to benchmark, if it exists.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'spec':<32}{'endpoints':>10}{'types':>8}{'before':>13}{'after':>11}{'speedup':>10}"
+    )
+    for endpoints in args.endpoints:
+        bench(f"synthetic-{endpoints}", synthetic_spec(endpoints), args.repeat)
+
+    if args.specs.is_dir():
+        for file in sorted(args.specs.iterdir()):
+            if file.suffix in {".json", ".yaml", ".yml"}:
+                bench(file.stem, load_file(file), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
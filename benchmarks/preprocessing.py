@@ -0,0 +1,351 @@
+"""
+Benchmark the spec preprocessing: loading, validation, minification, splitting and
+token counting, over synthetic specs of three sizes and the real specs.
+
+Each benchmark reports its time (best and median of the rounds), its peak memory
+and the tokens of its output. Save the results as a baseline, then compare a later
+run against it to catch regressions: slower, larger, or a different output.
+
+Usage (from the repository root):
+    python -m benchmarks.preprocessing --save baseline.json
+    python -m benchmarks.preprocessing --compare baseline.json
+    python -m benchmarks.preprocessing --sizes small --benchmarks minify write_dict_to_text
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+from unittest import mock
+
+# measure the parsing, not the parsed spec cache
+os.environ["SDKGEN_NO_CACHE"] = "1"
+
+from benchmarks.minify import synthetic_spec
+from sdkgenerator import loader, manifier
+from sdkgenerator.chunker import split_openapi_spec
+from sdkgenerator.manifier import (
+    extract_information,
+    format_information,
+    load_file,
+    minify,
+    resolve_refs_types,
+)
+from sdkgenerator.tokens import count_tokens, is_within_budget, step_budget_report
+from sdkgenerator.utils import validate_openapi_spec
+
+spec_sizes = {"small": 20, "medium": 400, "huge": 4000}
+
+
+class SpecCase(NamedTuple):
+    name: str
+    file: Path
+    spec: dict
+
+
+class Benchmark(NamedTuple):
+    # the input of a round, built before the timer starts
+    setup: Callable[[SpecCase], Any]
+    run: Callable[[Any], Any]
+    # the text of the result whose tokens are counted, None if it has no text
+    output: Callable[[Any], str | None]
+
+
+def described_spec(endpoints: int) -> dict:
+    """
+    A synthetic spec whose operations and schemas have the HTML and punctuation
+    of real descriptions, which the text conversion strips.
+
+    The chains of `previous` models are cut every 10 models, so every operation
+    fits in the prompts and the large specs can be split.
+    """
+    spec = synthetic_spec(endpoints)
+    schemas = spec["components"]["schemas"]
+    for i in range(0, endpoints, 20):
+        schemas[f"Model{i}"]["properties"]["previous"] = {
+            "$ref": f"#/components/schemas/Model{i}"
+        }
+    for path, methods in spec["paths"].items():
+        for method, operation in methods.items():
+            if method != "parameters":
+                operation["description"] = (
+                    f"<p>{method.upper()} the <b>resource</b> at <code>{path}</code>; "
+                    "see the <a href='https://example.com/docs'>docs</a> (v2)!</p>"
+                )
+    for name, schema in schemas.items():
+        schema["description"] = f"<p>The <i>{name}</i> object: `{name.lower()}`.</p>"
+
+    return spec
+
+
+def write_dict_inputs(spec: dict) -> list:
+    """
+    Record the data converted by the outer calls of `write_dict_to_text` while
+    the spec is minified.
+    """
+    inputs = []
+    original = manifier.write_dict_to_text
+    depth = 0
+
+    def recording(data):
+        nonlocal depth
+        if depth == 0:
+            inputs.append(copy.deepcopy(data))
+        depth += 1
+        try:
+            return original(data)
+        finally:
+            depth -= 1
+
+    with mock.patch.object(manifier, "write_dict_to_text", recording):
+        minify(copy.deepcopy(spec))
+
+    return inputs
+
+
+def split_spec(file: Path) -> list[str]:
+    """
+    Split a spec into a temporary directory.
+
+    :return: The sub specs, none if the spec fits in the prompts.
+    :raises ValueError: If the spec doesn't fit and failed to split.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                files = split_openapi_spec(file, output_dir_path=Path(output_dir))
+            except ValueError:
+                # only a spec that fits, as build_sdk checks it, has nothing to split
+                api_spec, types_json = extract_information(load_file(file))
+                if not is_within_budget(
+                    step_budget_report(api_spec, types_json, user_rules="")
+                ):
+                    raise
+                return []
+
+        return [file.read_text() for file in files]
+
+
+def minified_text(result: tuple) -> str:
+    paths_with_metadata, server_url, _, api_security_scopes, security_schemes = result
+    return format_information(
+        paths_with_metadata, server_url, api_security_scopes, security_schemes
+    )
+
+
+def join_texts(inputs: list) -> str:
+    return "\n".join(manifier.write_dict_to_text(data) for data in inputs)
+
+
+benchmarks: dict[str, Benchmark] = {
+    "load_file": Benchmark(lambda case: case.file, load_file, lambda _: None),
+    "validate_openapi_spec": Benchmark(
+        lambda case: case.spec, validate_openapi_spec, lambda _: None
+    ),
+    # minify and extract_information change the parameters of the spec
+    "minify": Benchmark(lambda case: copy.deepcopy(case.spec), minify, minified_text),
+    "resolve_refs_types": Benchmark(
+        lambda case: case.spec,
+        lambda spec: resolve_refs_types(spec, spec["paths"], {}),
+        str,
+    ),
+    "write_dict_to_text": Benchmark(
+        lambda case: write_dict_inputs(case.spec), join_texts, lambda text: text
+    ),
+    "extract_information": Benchmark(
+        lambda case: copy.deepcopy(case.spec),
+        extract_information,
+        lambda result: result[0],
+    ),
+    "split_openapi_spec": Benchmark(lambda case: case.file, split_spec, "".join),
+    "count_tokens": Benchmark(
+        lambda case: extract_information(copy.deepcopy(case.spec))[0],
+        lambda text: count_tokens(text, step="initial_code"),
+        lambda _: None,
+    ),
+}
+
+
+def measure(benchmark: Benchmark, case: SpecCase, repeat: int) -> dict:
+    """
+    Run a benchmark once to warm up and count its output tokens, `repeat` times
+    to time it, and once more under tracemalloc for its peak memory.
+    """
+    result = benchmark.run(benchmark.setup(case))
+    output = benchmark.output(result)
+    tokens = count_tokens(output, step="initial_code") if output is not None else None
+
+    times = []
+    for _ in range(repeat):
+        arguments = benchmark.setup(case)
+        start = time.perf_counter()
+        benchmark.run(arguments)
+        times.append(time.perf_counter() - start)
+
+    arguments = benchmark.setup(case)
+    tracemalloc.start()
+    try:
+        benchmark.run(arguments)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "peak_kb": peak / 1024,
+        "tokens": tokens,
+    }
+
+
+def spec_cases(sizes: list[str], specs_dir: Path, work_dir: Path) -> list[SpecCase]:
+    cases = []
+    for size in sizes:
+        spec = described_spec(spec_sizes[size])
+        file = work_dir / f"synthetic-{size}.json"
+        file.write_text(json.dumps(spec))
+        cases.append(SpecCase(f"synthetic-{size}", file, spec))
+
+    if specs_dir.is_dir():
+        for file in sorted(specs_dir.iterdir()):
+            if file.suffix.lower() in loader.json_extensions | loader.yaml_extensions:
+                cases.append(SpecCase(file.stem, file, load_file(file)))
+
+    return cases
+
+
+def compare(
+    results: dict, baseline: dict, *, time_threshold: float, memory_threshold: float
+) -> list[str]:
+    """
+    List the regressions of the results against the baseline.
+
+    :param time_threshold: The allowed slowdown of the best time, as a fraction.
+    :param memory_threshold: The allowed growth of the peak memory, as a fraction.
+    :return: A line per regression.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+
+        if "error" in result or "error" in base:
+            if result.get("error") != base.get("error"):
+                regressions.append(
+                    f"{key}: {base.get('error', 'ok')} -> {result.get('error', 'ok')}"
+                )
+            continue
+
+        # ignore sub-millisecond differences, which are noise
+        if (
+            result["min"] > base["min"] * (1 + time_threshold)
+            and result["min"] - base["min"] > 0.001
+        ):
+            regressions.append(
+                f"{key}: {base['min'] * 1000:.1f}ms -> {result['min'] * 1000:.1f}ms"
+            )
+        if result["peak_kb"] > base["peak_kb"] * (1 + memory_threshold):
+            regressions.append(
+                f"{key}: peak {base['peak_kb']:.0f}KB -> {result['peak_kb']:.0f}KB"
+            )
+        if result["tokens"] != base["tokens"]:
+            regressions.append(
+                f"{key}: output tokens {base['tokens']} -> {result['tokens']}"
+            )
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="*",
+        choices=list(spec_sizes),
+        default=list(spec_sizes),
+        help="Sizes of the synthetic specs.",
+    )
+    parser.add_argument(
+        "--specs",
+        type=Path,
+        default=Path("data") / "specification-batch",
+        help="Directory of real specs to benchmark, if it exists.",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="*",
+        choices=list(benchmarks),
+        default=list(benchmarks),
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", type=Path, help="Write the results to this file.")
+    parser.add_argument(
+        "--compare", type=Path, help="Compare the results with this baseline file."
+    )
+    parser.add_argument("--time-threshold", type=float, default=0.2)
+    parser.add_argument("--memory-threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        cases = spec_cases(args.sizes, args.specs, Path(work_dir))
+
+        print(
+            f"{'benchmark':<52}{'best':>10}{'median':>10}{'peak (KB)':>12}{'tokens':>10}"
+        )
+        for name in args.benchmarks:
+            for case in cases:
+                key = f"{name}[{case.name}]"
+                try:
+                    result = measure(benchmarks[name], case, args.repeat)
+                except Exception as e:
+                    results[key] = {"error": f"failed: {e}"}
+                    print(f"{key:<52}failed: {e}")
+                    continue
+                results[key] = result
+                tokens = "-" if result["tokens"] is None else result["tokens"]
+                print(
+                    f"{key:<52}{result['min'] * 1000:>8.1f}ms"
+                    f"{result['median'] * 1000:>8.1f}ms"
+                    f"{result['peak_kb']:>12.0f}{tokens:>10}"
+                )
+
+    if args.save:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(
+            results,
+            baseline,
+            time_threshold=args.time_threshold,
+            memory_threshold=args.memory_threshold,
+        )
+        if regressions:
+            print("\nRegressions:\n" + "\n".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
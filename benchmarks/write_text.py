@@ -0,0 +1,135 @@
+"""
+Compare `write_dict_to_text` with the previous implementation, which cleaned the
+text character by character and joined the text of every nested node, and check
+that both minify the specs to the same text.
+
+Usage (from the repository root):
+    python -m benchmarks.write_text --endpoints 100 500 2000 --specs data/specification-batch
+"""
+
+import argparse
+import copy
+import re
+import string
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.preprocessing import described_spec, write_dict_inputs
+from sdkgenerator import manifier
+from sdkgenerator.manifier import extract_information, load_file
+
+
+def legacy_write_dict_to_text(data):
+    """
+    The previous `write_dict_to_text`.
+    """
+
+    def remove_html_tags_and_punctuation(input_str):
+        # Strip HTML tags
+        no_html_str = re.sub("<.*?>", "", input_str)
+        # Define the characters that should be considered as punctuation
+        modified_punctuation = set(string.punctuation) - {
+            "/",
+            "#",
+            "_",
+            "-",
+            "|",
+            ".",
+            ",",
+            "{",
+            "}",
+        }
+        # Remove punctuation characters
+        return "".join(
+            ch for ch in no_html_str if ch not in modified_punctuation
+        ).strip()
+
+    # List to accumulate the formatted text parts
+    formatted_text_parts = []
+
+    # Check if data is a dictionary
+    if isinstance(data, dict):
+        # Iterate over items in the dictionary
+        for key, value in data.items():
+            # Remove HTML tags and punctuation from key
+            key = remove_html_tags_and_punctuation(key)
+
+            # Depending on the data type, write the content
+            if isinstance(value, (dict, list)):
+                # Append the key followed by its sub-elements
+                formatted_text_parts.append(key)
+                formatted_text_parts.append(legacy_write_dict_to_text(value))
+            else:
+                # Remove HTML tags and punctuation from value
+                value = remove_html_tags_and_punctuation(str(value))
+                # Append the key-value pair
+                if key == "ref":
+                    formatted_text_parts.append(f"{key}: #{value.split('/')[-1]}")
+                else:
+                    formatted_text_parts.append(f"{key}: {value}")
+    # Check if data is a list
+    elif isinstance(data, list):
+        # Append each element in the list
+        for item in data:
+            formatted_text_parts.append(legacy_write_dict_to_text(item))
+    # If data is a string or other type
+    else:
+        # Remove HTML tags and punctuation from data
+        data = remove_html_tags_and_punctuation(str(data))
+        # Append the data directly
+        formatted_text_parts.append(data)
+
+    # Join the formatted text parts with a single newline character
+    # but filter out any empty strings before joining
+    return "\n".join(filter(lambda x: x.strip(), formatted_text_parts))
+
+
+def time_texts(write, inputs: list, repeat: int) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        texts = [write(data) for data in inputs]
+    return (time.perf_counter() - start) / repeat, texts
+
+
+def bench(name: str, spec: dict, repeat: int):
+    with mock.patch.object(manifier, "write_dict_to_text", legacy_write_dict_to_text):
+        legacy_information = extract_information(copy.deepcopy(spec))
+    if extract_information(copy.deepcopy(spec)) != legacy_information:
+        raise Exception(f"The minified texts of {name} differ.")
+
+    inputs = write_dict_inputs(spec)
+    before, legacy_texts = time_texts(legacy_write_dict_to_text, inputs, repeat)
+    after, texts = time_texts(manifier.write_dict_to_text, inputs, repeat)
+    if texts != legacy_texts:
+        raise Exception(f"The texts of {name} differ.")
+
+    print(
+        f"{name:<32}{len(inputs):>8}{before:>12.3f}s{after:>10.3f}s{before / after:>9.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", type=int, nargs="*", default=[100, 500, 2000])
+    parser.add_argument(
+        "--specs",
+        type=Path,
+        default=Path("data") / "specification-batch",
+        help="Directory of real specs to benchmark, if it exists.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'spec':<32}{'nodes':>8}{'before':>13}{'after':>11}{'speedup':>10}")
+    for endpoints in args.endpoints:
+        bench(f"synthetic-{endpoints}", described_spec(endpoints), args.repeat)
+
+    if args.specs.is_dir():
+        for file in sorted(args.specs.iterdir()):
+            if file.suffix in {".json", ".yaml", ".yml"}:
+                bench(file.stem, load_file(file), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 from pathlib import Path
+import queue
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import gradio as gr
 from gradio.utils import NamedString
 from sdkgenerator.generate import generate_sdk
-from sdkgenerator.types import Language
+from sdkgenerator.streaming import stream_listener
+from sdkgenerator.types import Language, Step
 
 
 def process_openapi_file(
@@ -21,9 +25,33 @@ def process_openapi_file(
     with open(uploaded_file_path, "wb") as file:
         file.write(openapi_content)
 
-    sdk_folder, sdk_output_file, types_file = generate_sdk(
-        uploaded_file_path, user_rules=user_input, language=language
-    )
+    # show the code as it streams in, when STREAMING is enabled
+    events: queue.Queue[tuple[Step, str]] = queue.Queue()
+
+    def generate():
+        stream_listener.set(lambda step, piece: events.put((step, piece)))
+        return generate_sdk(
+            uploaded_file_path, user_rules=user_input, language=language
+        )
+
+    streamed_code, streamed_types, code_step = "", "", None
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(copy_context().run, generate)
+        while not future.done() or not events.empty():
+            try:
+                step, piece = events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if step == "types":
+                streamed_types += piece
+            elif step != "feedback":
+                if step != code_step:
+                    streamed_code, code_step = "", step
+                streamed_code += piece
+            yield streamed_code, streamed_types, None
+
+        sdk_folder, sdk_output_file, types_file = future.result()
 
     sdk_path = COMPRESSED_SDKS / f"{sdk_folder.stem}_sdk.zip"
     zipped_sdk = zipfile.ZipFile(sdk_path, "w")
@@ -44,9 +72,10 @@ def process_openapi_file(
     if types_file and types_file.is_file():
         types_code = types_file.read_text()
 
-        return sdk_code, types_code, str(sdk_path.absolute())
+        yield sdk_code, types_code, str(sdk_path.absolute())
+        return
 
-    return sdk_code, "No shared types generated.", str(sdk_path.absolute())
+    yield sdk_code, "No shared types generated.", str(sdk_path.absolute())
 
 
 interface = gr.Interface(
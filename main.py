@@ -1,29 +1,111 @@
-from sdkgenerator.generate import generate_sdk
+import argparse
+import json
 from pathlib import Path
-import traceback
+
+from sdkgenerator.batch import find_specs, generate_batch, format_report
+from sdkgenerator.cache import get_response_cache
+from sdkgenerator.config import BATCH, PIPELINE
+from sdkgenerator.metrics import write_metrics
 
 # Mock user rules
 user_rules = "- Return type: All methods must return the 'Response' object from the 'requests' library."
 
 
 def main():
-    training_specs_dir = Path(__file__).parent / "data" / "specification-batch"
-    for file in training_specs_dir.iterdir():
-        if not file.is_file():
-            print(f"Skipping {file.stem} because it is not a file.")
-            continue
-
-        if not (file.suffix == ".json" or file.suffix == ".yaml"):
-            print(f"Skipping {file.stem} because it is not a JSON or YAML file.")
-            continue
-
-        print(f"Generating SDK for {file.stem}...")
-
-        try:
-            generate_sdk(file, user_rules=user_rules, language="python")
-        except Exception as e:
-            print(f"Failed to generate SDK for {file.stem}: {e}")
-            print(traceback.format_exc())
+    parser = argparse.ArgumentParser(
+        description="Generate SDKs for every OpenAPI spec in a directory."
+    )
+    parser.add_argument(
+        "specs_dir",
+        nargs="?",
+        type=Path,
+        default=Path(__file__).parent / "data" / "specification-batch",
+        help="Directory containing the JSON/YAML specs.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=BATCH["workers"],
+        help="Number of specs generated concurrently.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write the batch report as JSON to this file.",
+    )
+    parser.add_argument(
+        "--types-backend",
+        choices=["llm", "compiler"],
+        default=PIPELINE["types_backend"],
+        help="Write the types with the language model or compile them from the schemas.",
+    )
+    parser.add_argument(
+        "--code-backend",
+        choices=["llm", "render", "render_gaps"],
+        default=PIPELINE["code_backend"],
+        help="Write the code with the language model, render it from the spec, "
+        "or render it and ask the language model for the authentication and the names.",
+    )
+    parser.add_argument(
+        "--adaptive-feedback",
+        action="store_true",
+        default=PIPELINE["adaptive_feedback"],
+        help="Skip the feedback and final code when the initial code passes the static checks.",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        default=PIPELINE["repair"],
+        help="Regenerate the missing and broken methods of the final code.",
+    )
+    parser.add_argument(
+        "--compact-history",
+        action="store_true",
+        default=PIPELINE["compact_history"],
+        help="Send outlines of the spec and the types in the histories of the steps.",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="Write the metrics in the Prometheus text format to this file.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the LLM response cache.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate the endpoints and types that changed since the last run.",
+    )
+    args = parser.parse_args()
+
+    PIPELINE["types_backend"] = args.types_backend
+    PIPELINE["code_backend"] = args.code_backend
+    PIPELINE["adaptive_feedback"] = args.adaptive_feedback
+    PIPELINE["repair"] = args.repair
+    PIPELINE["compact_history"] = args.compact_history
+
+    if args.no_cache:
+        get_response_cache().enabled = False
+
+    report = generate_batch(
+        find_specs(args.specs_dir),
+        user_rules=user_rules,
+        language="python",
+        workers=args.workers,
+        incremental=args.incremental,
+    )
+
+    print(format_report(report))
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2))
+
+    if args.metrics:
+        write_metrics(args.metrics)
 
 
 if __name__ == "__main__":
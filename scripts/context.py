@@ -4,4 +4,5 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from sdkgenerator import *
-from sdkgenerator.db import db
+from sdkgenerator.db import get_db
+from sdkgenerator.loader import load_spec
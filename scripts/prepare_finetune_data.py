@@ -1,4 +1,4 @@
-from context import db
+from context import get_db
 from pathlib import Path
 import json
 
@@ -52,7 +52,7 @@ pipeline = [
 
 
 def generate_finetune_data():
-    data = list(db["train_data"].aggregate(pipeline))
+    data = list(get_db()["train_data"].aggregate(pipeline))
 
     output_file = Path(__file__).parent.parent / "data" / "finetune_data.jsonl"
 
@@ -1,10 +1,14 @@
 import os
-import yaml
+import sys
 import json
 from datetime import datetime, date
 from typing import override
 from tqdm import tqdm
 
+# the loader alone, context.py imports the whole package and its database
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from sdkgenerator.loader import load_spec
+
 
 class DateTimeEncoder(json.JSONEncoder):
     @override
@@ -24,8 +28,7 @@ def convert_yaml_to_json(yaml_file, json_file):
       yaml_file: Path to the YAML file.
       json_file: Path to the output JSON file.
     """
-    with open(yaml_file, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    data = load_spec(yaml_file)
     with open(json_file, "w", encoding="utf-8") as f:
         json.dump(data, f, cls=DateTimeEncoder)
 
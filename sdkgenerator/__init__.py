@@ -1,2 +1,3 @@
 from .utils import *
 from .manifier import process_file
+from .chunker import split_openapi_spec
@@ -0,0 +1,307 @@
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from sdkgenerator.cache import get_response_cache
+from sdkgenerator.checker import code_checks
+from sdkgenerator.config import BATCH
+from sdkgenerator.constants import GENERATED_SDK_DIR
+from sdkgenerator.generate import generate_sdk, regenerate_sdk
+from sdkgenerator.history import history_savings
+from sdkgenerator.pipeline import node_timings
+from sdkgenerator.scheduler import get_scheduler
+from sdkgenerator.types import (
+    BatchReport,
+    CodeCheck,
+    FeedbackStats,
+    HistorySaving,
+    Language,
+    NodeTiming,
+    SpecResult,
+    Step,
+    StepLatency,
+    StepTiming,
+)
+from sdkgenerator.utils import step_timings
+
+spec_extensions = {".json", ".yaml", ".yml"}
+
+
+def find_specs(specs_dir: Path) -> list[Path]:
+    """
+    List the OpenAPI spec files (JSON or YAML) in a directory.
+
+    :param specs_dir: The directory containing the specs.
+    :return: The spec files sorted by name.
+    """
+    specs = []
+    for file in sorted(specs_dir.iterdir()):
+        if not file.is_file():
+            print(f"Skipping {file.stem} because it is not a file.")
+            continue
+
+        if file.suffix not in spec_extensions:
+            print(f"Skipping {file.stem} because it is not a JSON or YAML file.")
+            continue
+
+        specs.append(file)
+
+    return specs
+
+
+def generate_one(
+    file_path: Path,
+    *,
+    output_dir: Path,
+    language: Language,
+    user_rules: str,
+    incremental: bool = False,
+) -> SpecResult:
+    """
+    Generate the SDK for a single spec, never raising so one failure can't stop the batch.
+
+    :param file_path: The OpenAPI spec file.
+    :param output_dir: The directory where the SDK is generated.
+    :param language: The language of the generated code.
+    :param user_rules: The user rules for the SDK.
+    :param incremental: Only regenerate what changed since the last generation.
+    :return: The result of the generation.
+    """
+    generate = regenerate_sdk if incremental else generate_sdk
+    timings: list[StepTiming] = []
+    token = step_timings.set(timings)
+    nodes: list[NodeTiming] = []
+    nodes_token = node_timings.set(nodes)
+    checks: list[CodeCheck] = []
+    checks_token = code_checks.set(checks)
+    savings: list[HistorySaving] = []
+    savings_token = history_savings.set(savings)
+    start = time.perf_counter()
+    print(f"Generating SDK for {file_path.stem}...")
+
+    try:
+        generate(
+            file_path, output_dir=output_dir, user_rules=user_rules, language=language
+        )
+        status, error = "success", None
+    except Exception as e:
+        print(f"Failed to generate SDK for {file_path.stem}: {e}")
+        print(traceback.format_exc())
+        status, error = "failed", f"{type(e).__name__}: {e}"
+    finally:
+        step_timings.reset(token)
+        node_timings.reset(nodes_token)
+        code_checks.reset(checks_token)
+        history_savings.reset(savings_token)
+
+    return {
+        "name": file_path.stem,
+        "file": str(file_path),
+        "status": status,
+        "seconds": time.perf_counter() - start,
+        "error": error,
+        "step_timings": timings,
+        "node_timings": nodes,
+        "code_checks": checks,
+        "history_savings": savings,
+    }
+
+
+def summarize_step_latency(results: list[SpecResult]) -> dict[Step, StepLatency]:
+    """
+    Aggregate the per-step latencies of all the LLM calls in a batch.
+
+    :param results: The results of the batch.
+    :return: The count, total, mean and max latency per step.
+    """
+    latency: dict[Step, StepLatency] = {}
+    for result in results:
+        for timing in result["step_timings"]:
+            stats = latency.setdefault(
+                timing["step"], {"count": 0, "total": 0.0, "mean": 0.0, "max": 0.0}
+            )
+            stats["count"] += 1
+            stats["total"] += timing["seconds"]
+            stats["max"] = max(stats["max"], timing["seconds"])
+
+    for stats in latency.values():
+        stats["mean"] = stats["total"] / stats["count"]
+
+    return latency
+
+
+def summarize_feedback(results: list[SpecResult]) -> FeedbackStats:
+    """
+    Aggregate the static checks of the initial code (PIPELINE.adaptive_feedback)
+    of a batch: how many SDKs skipped the feedback, and the defects of the others.
+
+    :param results: The results of the batch.
+    :return: The checked and skipped SDKs, and the defects by kind.
+    """
+    checks = [check for result in results for check in result["code_checks"]]
+    skipped = sum(check["skipped_feedback"] for check in checks)
+    defects: dict[str, int] = {}
+    for check in checks:
+        for kind, count in check["kinds"].items():
+            defects[kind] = defects.get(kind, 0) + count
+
+    return {
+        "checked": len(checks),
+        "skipped": skipped,
+        "skip_rate": skipped / len(checks) if checks else 0.0,
+        "defects": defects,
+    }
+
+
+def summarize_history_savings(results: list[SpecResult]) -> dict[Step, int]:
+    """
+    Add up the prompt tokens the compact histories (PIPELINE.compact_history)
+    saved in a batch, per step.
+    """
+    saved: dict[Step, int] = {}
+    for result in results:
+        for saving in result["history_savings"]:
+            saved[saving["step"]] = (
+                saved.get(saving["step"], 0) + saving["tokens"] - saving["sent_tokens"]
+            )
+
+    return saved
+
+
+def generate_batch(
+    spec_files: list[Path],
+    *,
+    user_rules: str,
+    language: Language = "python",
+    output_dir: Path = GENERATED_SDK_DIR,
+    workers: int | None = None,
+    incremental: bool = False,
+) -> BatchReport:
+    """
+    Generate the SDKs for many specs concurrently.
+
+    Each spec runs in its own worker, a failing spec is recorded in the report
+    and does not affect the others. The number of in-flight requests per
+    provider is bounded by the CONCURRENCY section of the config, and their rate
+    per model by the RATE_LIMITS section.
+
+    :param spec_files: The OpenAPI spec files.
+    :param user_rules: The user rules for the SDKs.
+    :param language: The language of the generated code.
+    :param output_dir: The directory where the SDKs are generated.
+    :param workers: The number of specs generated at the same time. Defaults to BATCH.workers.
+    :param incremental: Only regenerate the operations and types that changed since the last generation.
+    :return: The batch report.
+    """
+    workers = workers or BATCH["workers"]
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results: list[SpecResult] = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                generate_one,
+                file,
+                output_dir=output_dir,
+                language=language,
+                user_rules=user_rules,
+                incremental=incremental,
+            )
+            for file in spec_files
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            print(
+                f"[{len(results) + 1}/{len(futures)}] {result['name']}: "
+                f"{result['status']} in {result['seconds']:.2f}s"
+            )
+            results.append(result)
+
+    results.sort(key=lambda result: result["name"])
+
+    return {
+        "workers": workers,
+        "wall_time": time.perf_counter() - start,
+        "succeeded": sum(result["status"] == "success" for result in results),
+        "failed": sum(result["status"] == "failed" for result in results),
+        "step_latency": summarize_step_latency(results),
+        "cache": get_response_cache().stats(),
+        "scheduler": get_scheduler().stats(),
+        "feedback": summarize_feedback(results),
+        "history_tokens_saved": summarize_history_savings(results),
+        "results": results,
+    }
+
+
+def format_report(report: BatchReport) -> str:
+    """
+    Format the batch report as a human-readable summary.
+
+    :param report: The batch report.
+    :return: The summary.
+    """
+    lines = [
+        f"Generated {report['succeeded'] + report['failed']} specs with {report['workers']} workers "
+        f"in {report['wall_time']:.2f}s ({report['succeeded']} succeeded, {report['failed']} failed)",
+        "",
+        f"{'step':<14}{'calls':>8}{'mean (s)':>12}{'max (s)':>12}{'total (s)':>12}",
+    ]
+    for step, stats in report["step_latency"].items():
+        lines.append(
+            f"{step:<14}{stats['count']:>8}{stats['mean']:>12.2f}"
+            f"{stats['max']:>12.2f}{stats['total']:>12.2f}"
+        )
+
+    cache = report["cache"]
+    if cache["enabled"]:
+        lines += [
+            "",
+            f"Response cache: {cache['hits']} hits, {cache['misses']} misses "
+            f"({cache['entries']} entries, {cache['size_mb']:.1f} MB)",
+        ]
+    else:
+        lines += ["", "Response cache: bypassed"]
+
+    if report["scheduler"]:
+        lines += [
+            "",
+            f"{'model':<44}{'requests':>10}{'throttled':>11}{'wait (s)':>10}"
+            f"{'429s':>6}{'retries':>9}{'failed':>8}{'max queue':>11}",
+        ]
+        for model, stats in report["scheduler"].items():
+            lines.append(
+                f"{model:<44}{stats['requests']:>10}{stats['throttled']:>11}"
+                f"{stats['throttle_seconds']:>10.1f}{stats['rate_limited']:>6}"
+                f"{stats['retries']:>9}{stats['failed']:>8}{stats['max_queue_depth']:>11}"
+            )
+
+    feedback = report["feedback"]
+    if feedback["checked"]:
+        lines += [
+            "",
+            f"Feedback: skipped for {feedback['skipped']} of {feedback['checked']} "
+            f"checked SDKs ({feedback['skip_rate']:.0%})",
+        ]
+        lines += [
+            f"- {kind}: {count} defects" for kind, count in feedback["defects"].items()
+        ]
+
+    if report["history_tokens_saved"]:
+        lines += [
+            "",
+            f"History: saved {sum(report['history_tokens_saved'].values())} prompt tokens",
+        ]
+        lines += [
+            f"- {step}: {tokens} tokens"
+            for step, tokens in report["history_tokens_saved"].items()
+        ]
+
+    failures = [result for result in report["results"] if result["status"] == "failed"]
+    if failures:
+        lines += ["", "Failures:"]
+        lines += [f"- {result['name']}: {result['error']}" for result in failures]
+
+    return "\n".join(lines)
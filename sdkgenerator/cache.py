@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from sdkgenerator.config import CACHE
+from sdkgenerator.constants import CACHE_DIR
+from sdkgenerator.types import CacheStats
+
+
+def request_conversation(body: dict) -> tuple[str, list[dict]]:
+    """
+    Get the model and the full conversation of an LLM request, in the OpenAI format.
+
+    :param body: The JSON body sent to the provider (OpenAI or Eden AI format).
+    :return: The model and the messages, the prompt last.
+    """
+    if "messages" in body:
+        return body["model"], body["messages"]
+
+    messages = (
+        [{"role": "system", "content": body["chatbot_global_action"]}]
+        + [
+            {"role": item["role"], "content": item["message"]}
+            for item in body["previous_history"]
+        ]
+        + [{"role": "user", "content": body["text"]}]
+    )
+
+    return body["settings"]["openai"], messages
+
+
+def cache_key(url: str, body: dict) -> str:
+    """
+    Compute the content address of an LLM request.
+
+    The key covers the provider, the model, the sampling parameters and the full
+    conversation, so any change in a prompt produces a new key.
+
+    :param url: The provider endpoint (responses of different providers have different shapes).
+    :param body: The JSON body sent to the provider (OpenAI or Eden AI format).
+    :return: The sha256 hex digest of the request.
+    """
+    model, messages = request_conversation(body)
+    request = {
+        "url": url,
+        "model": model,
+        "temperature": body["temperature"],
+        "max_tokens": body["max_tokens"],
+        "messages": messages,
+    }
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False)
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent content-addressed cache of the LLM responses, stored in SQLite.
+
+    Entries older than `ttl` seconds are never returned, and the least recently
+    used entries are evicted when the cache holds more than `max_entries`
+    entries or `max_size_mb` megabytes of responses.
+    """
+
+    # Evict at most once every this many writes
+    evict_every = 50
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float,
+        max_entries: int,
+        max_size_mb: float,
+        enabled: bool = True,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+        return self._connection
+
+    def get(self, key: str) -> dict | None:
+        """
+        Get a cached response, counting the hit or miss.
+
+        :param key: The key of the request (see `cache_key`).
+        :return: The cached JSON response, or None if missing, expired or the cache is bypassed.
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key: str, response: dict):
+        """
+        Store a response, evicting expired and least recently used entries when needed.
+
+        :param key: The key of the request (see `cache_key`).
+        :param response: The JSON response of the provider.
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        data = json.dumps(response, ensure_ascii=False)
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict(now)
+
+    def evict(self):
+        """
+        Remove the expired entries, then the least recently used ones above the size limits.
+        """
+        with self._lock:
+            self._evict(time.time())
+
+    def _evict(self, now: float):
+        self.connection.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+        )
+        self.connection.execute(
+            """
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT
+                        key,
+                        ROW_NUMBER() OVER (ORDER BY accessed_at DESC) AS position,
+                        SUM(size) OVER (ORDER BY accessed_at DESC) AS total_size
+                    FROM responses
+                )
+                WHERE position > ? OR total_size > ?
+            )
+            """,
+            (self.max_entries, self.max_bytes),
+        )
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            self.connection.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Get the hit/miss counters of this process and the current size of the cache.
+        """
+        with self._lock:
+            entries, size = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "size_mb": size / 1024 / 1024,
+        }
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the response cache shared by all the LLM calls of the process.
+
+    The cache is bypassed when CACHE.enabled is false or SDKGEN_NO_CACHE is set.
+
+    :return: The shared response cache.
+    """
+    global _response_cache
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                CACHE_DIR / "responses.sqlite3",
+                ttl=CACHE["ttl"],
+                max_entries=CACHE["max_entries"],
+                max_size_mb=CACHE["max_size_mb"],
+                enabled=CACHE["enabled"] and not os.getenv("SDKGEN_NO_CACHE"),
+            )
+
+    return _response_cache
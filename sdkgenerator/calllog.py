@@ -0,0 +1,186 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterator
+
+from sdkgenerator.constants import CALL_LOGS_DIR
+from sdkgenerator.types import LlmCallLog, LogCompression, Step
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+segment_suffixes = {".jsonl": None, ".gz": "gzip", ".zst": "zstd"}
+
+
+class CallLogWriter:
+    """
+    Append the LLM call logs as JSON lines to rotating segment files.
+
+    Every process writes its own segments, named after the time they were started
+    and the process id. A segment is closed once it holds `max_mb` megabytes or is
+    `max_age` seconds old, and is then compressed with gzip or zstd, if set.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_mb: float,
+        max_age: float,
+        compression: LogCompression | None = None,
+    ):
+        if compression == "zstd" and zstandard is None:
+            print("zstandard is not installed, compressing the call logs with gzip.")
+            compression = "gzip"
+
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age
+        self.compression = compression
+        self._file: io.BufferedWriter | None = None
+        self._path: Path | None = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._sequence = 0
+
+    def write(self, records: list[LlmCallLog]):
+        for record in records:
+            if self._file is not None and (
+                self._size >= self.max_bytes
+                or time.time() - self._opened_at >= self.max_age
+            ):
+                self.rotate()
+            if self._file is None:
+                self._open()
+
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            self._file.write(line)
+            self._size += len(line)
+
+        if self._file is not None:
+            self._file.flush()
+
+    def rotate(self):
+        """
+        Close the current segment and compress it.
+        """
+        if self._file is None:
+            return
+
+        self._file.close()
+        self._file = None
+        compress_segment(self._path, self.compression)
+
+    def close(self):
+        self.rotate()
+
+    def _open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._opened_at = time.time()
+        self._sequence += 1
+        started = time.strftime("%Y%m%dT%H%M%S", time.gmtime(self._opened_at))
+        self._path = (
+            self.directory / f"calls-{started}-{os.getpid()}-{self._sequence}.jsonl"
+        )
+        self._file = open(self._path, "ab")
+        self._size = self._path.stat().st_size
+
+
+def compress_segment(path: Path, compression: LogCompression | None) -> Path:
+    """
+    Compress a closed segment, replacing it with the .gz or .zst file.
+    """
+    if compression is None:
+        return path
+
+    if compression == "gzip":
+        compressed = path.with_suffix(".jsonl.gz")
+        with open(path, "rb") as source, gzip.open(compressed, "wb") as target:
+            shutil.copyfileobj(source, target)
+    elif compression == "zstd":
+        compressed = path.with_suffix(".jsonl.zst")
+        with open(path, "rb") as source, open(compressed, "wb") as target:
+            zstandard.ZstdCompressor().copy_stream(source, target)
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    path.unlink()
+    return compressed
+
+
+def open_segment(path: Path) -> io.TextIOBase:
+    """
+    Open a segment as text, decompressing it on the fly.
+    """
+    compression = segment_suffixes.get(path.suffix)
+    if compression == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if compression == "zstd":
+        if zstandard is None:
+            raise Exception(f"zstandard is needed to read {path.name}.")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(reader, encoding="utf-8")
+
+    return open(path, "r", encoding="utf-8")
+
+
+def list_segments(directory: Path = CALL_LOGS_DIR) -> list[Path]:
+    """
+    List the segments of the call log, oldest first.
+    """
+    if not directory.is_dir():
+        return []
+
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.name.startswith("calls-") and path.suffix in segment_suffixes
+    )
+
+
+def iter_call_logs(
+    directory: Path = CALL_LOGS_DIR,
+    *,
+    sdk_name: str | None = None,
+    step: Step | None = None,
+) -> Iterator[LlmCallLog]:
+    """
+    Stream the LLM call logs, oldest first, one segment line at a time.
+
+    Lines that can't match the filters are skipped before being parsed.
+
+    :param directory: The directory of the call log.
+    :param sdk_name: Only the calls made for this SDK.
+    :param step: Only the calls of this step.
+    :return: The matching logs.
+    """
+    needles = [
+        json.dumps(value, ensure_ascii=False)
+        for value in (sdk_name, step)
+        if value is not None
+    ]
+
+    for path in list_segments(directory):
+        with open_segment(path) as file:
+            for line in file:
+                if not all(needle in line for needle in needles):
+                    continue
+
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # the last line of a segment still being written
+                    continue
+
+                if sdk_name is not None and record["sdk_name"] != sdk_name:
+                    continue
+                if step is not None and record["step"] != step:
+                    continue
+
+                yield record
@@ -0,0 +1,334 @@
+import ast
+import builtins
+import types
+from collections import Counter
+from contextvars import ContextVar
+
+from sdkgenerator.codeedit import (
+    definition_names,
+    find_client_class,
+    get_methods,
+    normalize_path,
+    string_constants,
+    to_snake_case,
+)
+from sdkgenerator.types import CodeCheck, CodeDefect, DefectKind, Operation
+
+builtin_names = set(dir(builtins))
+
+# The checks of the SDKs generated in the current context, set by the batch
+code_checks: ContextVar[list[CodeCheck] | None] = ContextVar(
+    "code_checks", default=None
+)
+
+
+def defect(
+    kind: DefectKind,
+    message: str,
+    *,
+    operation: str | None = None,
+    method: str | None = None,
+) -> CodeDefect:
+    return {"kind": kind, "message": message, "operation": operation, "method": method}
+
+
+def bound_names(tree: ast.AST) -> set[str]:
+    """
+    Get every name the code binds, in any scope: the check is for names bound
+    nowhere, not for the scoping mistakes.
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.alias) and node.name != "*":
+            names.add((node.asname or node.name).split(".")[0])
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)):
+            if node.name:
+                names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+
+    return names
+
+
+def module_names(code: str) -> set[str] | None:
+    """
+    Get the names a star import of a module gives, None if it doesn't parse.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update(
+                (alias.asname or alias.name).split(".")[0]
+                for alias in node.names
+                if alias.name != "*"
+            )
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names.update(
+                target.id
+                for item in targets
+                for target in ast.walk(item)
+                if isinstance(target, ast.Name)
+            )
+
+    return {name for name in names if not name.startswith("_")}
+
+
+def annotation_nodes(tree: ast.AST) -> list[ast.expr]:
+    annotations = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            arguments = node.args
+            for argument in (
+                arguments.posonlyargs
+                + arguments.args
+                + arguments.kwonlyargs
+                + [arguments.vararg, arguments.kwarg]
+            ):
+                if argument is not None and argument.annotation is not None:
+                    annotations.append(argument.annotation)
+            if node.returns is not None:
+                annotations.append(node.returns)
+        elif isinstance(node, ast.AnnAssign):
+            annotations.append(node.annotation)
+
+    return annotations
+
+
+def annotation_names(annotation: ast.expr) -> list[str]:
+    """
+    Get the names an annotation loads, in its string (forward reference) parts too.
+    """
+    names = []
+    for node in ast.walk(annotation):
+        if isinstance(node, ast.Name):
+            names.append(node.id)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            try:
+                names += annotation_names(ast.parse(node.value, mode="eval").body)
+            except SyntaxError:
+                continue
+
+    return names
+
+
+def client_attributes(class_node: ast.ClassDef) -> set[str] | None:
+    """
+    Get the attributes of the instances of the client: its methods, its class
+    attributes and the attributes its methods set on self. None if they can't be
+    known, when it has a base class or sets them dynamically.
+    """
+    if any(
+        not (isinstance(base, ast.Name) and base.id == "object")
+        for base in class_node.bases
+    ):
+        return None
+
+    attributes = set()
+    for item in class_node.body:
+        attributes.update(definition_names(item))
+    for node in ast.walk(class_node):
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id == "self"
+            and not isinstance(node.ctx, ast.Load)
+        ):
+            attributes.add(node.attr)
+        elif isinstance(node, ast.Call) and ast.unparse(node.func) == "setattr":
+            return None
+
+    if "__getattr__" in attributes:
+        return None
+
+    return attributes
+
+
+def missing_operations(
+    class_node: ast.ClassDef, operations: dict[str, Operation]
+) -> list[str]:
+    """
+    List the operations no method of the client implements (see
+    `codeedit.method_matches_operation`), indexing the methods once.
+    """
+    names = set()
+    calls = set()
+    for method in get_methods(class_node).values():
+        names.add(method.name)
+        strings = string_constants(method)
+        http_methods = {string.upper() for string in strings}
+        paths = {normalize_path(string) for string in strings if "/" in string}
+        calls.update(
+            (http_method, path) for http_method in http_methods for path in paths
+        )
+
+    return [
+        key
+        for key, operation in operations.items()
+        if to_snake_case(operation["operation_id"]) not in names
+        and (operation["method"].upper(), normalize_path(operation["path"]))
+        not in calls
+    ]
+
+
+def check_code(
+    code: str, operations: dict[str, Operation], *, types_code: str | None = None
+) -> list[CodeDefect]:
+    """
+    Check the generated code of an SDK without running it: it parses, its client
+    class has a method per operation, the attributes of self it uses are set, the
+    names it uses are defined and the types of its annotations are defined (by
+    types.py for `from types import *`).
+
+    :param code: The generated code.
+    :param operations: The operations of the spec (see `manifier.get_operations`).
+    :param types_code: The types module, None if the SDK has no types.
+    :return: The defects, none if the code passed every check.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return [defect("syntax", f"The code doesn't parse: {e.msg} (line {e.lineno})")]
+
+    client = find_client_class(tree)
+    if client is None:
+        return [defect("no_client", "The code has no client class")]
+
+    defects = [
+        defect(
+            "missing_method",
+            f"No method for {key} (operationId {operations[key]['operation_id']})",
+            operation=key,
+        )
+        for key in missing_operations(client, operations)
+    ]
+
+    # the method of every node, to point the defects at
+    owners = {
+        id(child): method.name
+        for method in get_methods(client).values()
+        for child in ast.walk(method)
+    }
+    reported = set()
+
+    def report(kind: DefectKind, name: str, node: ast.AST, message: str):
+        method = owners.get(id(node))
+        if (kind, name, method) not in reported:
+            reported.add((kind, name, method))
+            defects.append(defect(kind, message, method=method))
+
+    attributes = client_attributes(client)
+    if attributes is not None:
+        for node in ast.walk(client):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == "self"
+                and isinstance(node.ctx, ast.Load)
+                and node.attr not in attributes
+            ):
+                where = f" in {owners[id(node)]}" if id(node) in owners else ""
+                report(
+                    "undefined_attribute",
+                    node.attr,
+                    node,
+                    f"The attribute self.{node.attr}{where} is never set",
+                )
+
+    names = bound_names(tree) | builtin_names
+    # without a types module, `from types import *` imports the standard library one
+    types_names = (
+        module_names(types_code) if types_code is not None else set(types.__all__)
+    )
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and any(
+            alias.name == "*" for alias in node.names
+        ):
+            if node.module != "types" or types_names is None:
+                # the names of an unknown module can't be checked
+                return defects
+            names |= types_names
+
+    annotation_ids = set()
+    for annotation in annotation_nodes(tree):
+        annotation_ids.update(id(child) for child in ast.walk(annotation))
+        for name in annotation_names(annotation):
+            if name not in names:
+                where = (
+                    f" in {owners[id(annotation)]}" if id(annotation) in owners else ""
+                )
+                report(
+                    "unknown_type",
+                    name,
+                    annotation,
+                    f"The type {name}{where} isn't defined",
+                )
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == "types":
+            for alias in node.names:
+                if (
+                    alias.name != "*"
+                    and types_code is not None
+                    and types_names is not None
+                    and alias.name not in types_names
+                ):
+                    report(
+                        "unknown_type",
+                        alias.name,
+                        node,
+                        f"The type {alias.name} isn't in types.py",
+                    )
+        elif (
+            isinstance(node, ast.Name)
+            and isinstance(node.ctx, ast.Load)
+            and node.id not in names
+            and id(node) not in annotation_ids
+        ):
+            where = f" in {owners[id(node)]}" if id(node) in owners else ""
+            report(
+                "undefined_name",
+                node.id,
+                node,
+                f"The name {node.id}{where} isn't defined",
+            )
+
+    return defects
+
+
+def format_defects(defects: list[CodeDefect]) -> str:
+    """
+    Format the defects for the feedback prompt, a line per defect.
+    """
+    return "\n".join(f"- {defect['message']}" for defect in defects)
+
+
+def record_code_check(sdk_name: str, defects: list[CodeDefect], *, skipped: bool):
+    """
+    Record the check of an SDK in the checks of the current context, if any.
+    """
+    checks = code_checks.get()
+    if checks is not None:
+        checks.append(
+            {
+                "sdk_name": sdk_name,
+                "defects": len(defects),
+                "kinds": dict(Counter(defect["kind"] for defect in defects)),
+                "skipped_feedback": skipped,
+            }
+        )
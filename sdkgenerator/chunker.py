@@ -0,0 +1,427 @@
+import copy
+import json
+import re
+from pathlib import Path
+
+from sdkgenerator.config import MAX_PROMPT_LENGTH
+from sdkgenerator.loader import load_spec
+from sdkgenerator.manifier import (
+    DateTimeEncoder,
+    SchemaIndex,
+    extract_information,
+    format_header,
+    format_path,
+    minify_path,
+    minify_security,
+)
+from sdkgenerator.tokens import (
+    count_tokens,
+    format_rules,
+    is_within_budget,
+    step_budget_report,
+    template_tokens,
+)
+from sdkgenerator.types import Language, OperationCost, SpecChunk, Step
+
+http_methods = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+
+
+def lookup_ref(spec: dict, ref: str):
+    ref_object = spec
+    for p in ref.split("/")[1:]:
+        ref_object = ref_object.get(p, {})
+    return ref_object
+
+
+def collect_refs(spec: dict, node) -> set[str]:
+    """
+    Collect the local `$ref`s of a node and, transitively, of the objects they point to.
+    """
+    refs = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/") and ref not in refs:
+                refs.add(ref)
+                stack.append(lookup_ref(spec, ref))
+            stack.extend(value for key, value in current.items() if key != "$ref")
+        elif isinstance(current, list):
+            stack.extend(current)
+
+    return refs
+
+
+def operation_group(path: str, operation: dict) -> str:
+    """
+    Get the group of an operation: its first tag, or the first static segment of its path.
+    """
+    if operation.get("tags"):
+        return str(operation["tags"][0])
+
+    for segment in path.split("/"):
+        if segment and not segment.startswith("{"):
+            return segment
+
+    return "default"
+
+
+def measure_operations(
+    spec: dict,
+) -> tuple[list[OperationCost], dict[str, int], dict[str, int]]:
+    """
+    Measure the minified size of every operation of the spec.
+
+    :param spec: The OpenAPI spec.
+    :return: The operations with the tokens of their endpoint text and the types they
+        use, the tokens of the text of each path (path line and parameters), and
+        the tokens of each type.
+    """
+    # minify modifies the parameters of the spec
+    minified_spec = copy.deepcopy(spec)
+    schema_index = SchemaIndex(minified_spec)
+    operations: list[OperationCost] = []
+    path_tokens: dict[str, int] = {}
+
+    for path, methods in minified_spec["paths"].items():
+        path_data = minify_path(path, methods, minified_spec, schema_index)
+        empty_path_tokens = count_tokens(
+            format_path(path, {"parameters": [], "endpoints": []}), step="initial_code"
+        )
+        path_tokens[path] = count_tokens(
+            format_path(path, {"parameters": path_data["parameters"], "endpoints": []}),
+            step="initial_code",
+        )
+
+        path_item = spec["paths"][path]
+        path_parameters = path_item.get("parameters", [])
+        for endpoint in path_data["endpoints"]:
+            method = endpoint["metadata"]["method"]
+            operation = path_item[method]
+            endpoint_tokens = count_tokens(
+                format_path(path, {"parameters": [], "endpoints": [endpoint]}),
+                step="initial_code",
+            )
+            # the types come from the request body and the parameters only
+            type_refs = collect_refs(
+                spec,
+                [
+                    operation.get("requestBody"),
+                    operation.get("parameters"),
+                    path_parameters,
+                ],
+            )
+            operations.append(
+                {
+                    "index": len(operations),
+                    "path": path,
+                    "method": method,
+                    "group": operation_group(path, operation),
+                    "spec_tokens": endpoint_tokens - empty_path_tokens,
+                    "types": {ref.split("/")[-1] for ref in type_refs},
+                    "refs": collect_refs(spec, [operation, path_parameters]),
+                }
+            )
+
+    type_tokens = {
+        name: count_tokens(f"{name!r}: {value!r}, ", step="types")
+        for name, value in schema_index.get_types().items()
+    }
+
+    return operations, path_tokens, type_tokens
+
+
+def step_budgets(spec: dict, *, user_rules: str, language: Language) -> dict[Step, int]:
+    """
+    Get the tokens left for the endpoints in the initial code prompt, and for the
+    types in the types prompt, once the templates and the spec header are counted.
+    """
+    rules = format_rules(user_rules)
+    security_schemes, api_security_scopes = minify_security(spec)
+    header = format_header(
+        spec["servers"][0]["url"], api_security_scopes, security_schemes
+    )
+
+    initial_code_overhead = count_tokens(header, step="initial_code") + max(
+        template_tokens(
+            "initial_code", language=language, with_types=with_types, rules=rules
+        )
+        for with_types in (True, False)
+    )
+    types_overhead = count_tokens("{}", step="types") + template_tokens(
+        "types", language=language, with_types=True, rules=rules
+    )
+
+    return {
+        "initial_code": MAX_PROMPT_LENGTH["initial_code"] - initial_code_overhead,
+        "types": MAX_PROMPT_LENGTH["types"] - types_overhead,
+    }
+
+
+def new_chunk() -> SpecChunk:
+    return {
+        "name": "",
+        "groups": [],
+        "operations": [],
+        "paths": set(),
+        "types": set(),
+        "spec_tokens": 0,
+        "types_tokens": 0,
+    }
+
+
+def pack_operations(
+    operations: list[OperationCost],
+    *,
+    path_tokens: dict[str, int],
+    type_tokens: dict[str, int],
+    budgets: dict[Step, int],
+) -> list[SpecChunk]:
+    """
+    Pack the operations into as few chunks as possible, each fitting the prompt budgets.
+
+    The operations are grouped by tag or resource, and the groups are packed
+    first-fit decreasing, a group too big for a single chunk operation by
+    operation. When filling the chunks with the operations in group order needs
+    fewer chunks, that packing is used instead. A path or a type shared by the
+    operations of a chunk is counted once.
+
+    :param operations: The operations (see `measure_operations`).
+    :param path_tokens: The tokens of the text of each path.
+    :param type_tokens: The tokens of each type.
+    :param budgets: The tokens available for the endpoints and for the types.
+    :return: The chunks.
+    :raises ValueError: If an operation alone does not fit the budgets.
+    """
+
+    def added_tokens(chunk: SpecChunk, items: list[OperationCost]) -> tuple[int, int]:
+        paths = {item["path"] for item in items} - chunk["paths"]
+        types = set().union(*(item["types"] for item in items)) - chunk["types"]
+        return (
+            sum(item["spec_tokens"] for item in items)
+            + sum(path_tokens[path] for path in paths),
+            sum(type_tokens.get(name, 0) for name in types),
+        )
+
+    def fits(chunk: SpecChunk, items: list[OperationCost]) -> bool:
+        spec_tokens, types_tokens = added_tokens(chunk, items)
+        return (
+            chunk["spec_tokens"] + spec_tokens <= budgets["initial_code"]
+            and chunk["types_tokens"] + types_tokens <= budgets["types"]
+        )
+
+    def add(chunk: SpecChunk, items: list[OperationCost]):
+        spec_tokens, types_tokens = added_tokens(chunk, items)
+        chunk["spec_tokens"] += spec_tokens
+        chunk["types_tokens"] += types_tokens
+        chunk["operations"] += items
+        for item in items:
+            chunk["paths"].add(item["path"])
+            chunk["types"].update(item["types"])
+            if item["group"] not in chunk["groups"]:
+                chunk["groups"].append(item["group"])
+
+    def place(chunks: list[SpecChunk], items: list[OperationCost]) -> bool:
+        for chunk in chunks:
+            if fits(chunk, items):
+                add(chunk, items)
+                return True
+
+        chunk = new_chunk()
+        if not fits(chunk, items):
+            return False
+        add(chunk, items)
+        chunks.append(chunk)
+        return True
+
+    def too_long(operation: OperationCost) -> ValueError:
+        return ValueError(
+            f"The operation {operation['method'].upper()} {operation['path']} "
+            f"alone is too long for the prompts."
+        )
+
+    def size(items: list[OperationCost]) -> int:
+        return sum(added_tokens(new_chunk(), items))
+
+    groups: dict[str, list[OperationCost]] = {}
+    for operation in operations:
+        groups.setdefault(operation["group"], []).append(operation)
+    ordered_groups = sorted(groups.values(), key=size, reverse=True)
+
+    # whole groups, first-fit decreasing
+    grouped: list[SpecChunk] = []
+    for group in ordered_groups:
+        if place(grouped, group):
+            continue
+
+        for operation in sorted(group, key=lambda item: size([item]), reverse=True):
+            if not place(grouped, [operation]):
+                raise too_long(operation)
+
+    # operations in group order, filling each chunk before opening the next one,
+    # which splits some groups but needs fewer chunks when the groups are large
+    filled: list[SpecChunk] = []
+    for group in ordered_groups:
+        for operation in group:
+            if not filled or not fits(filled[-1], [operation]):
+                if not fits(new_chunk(), [operation]):
+                    raise too_long(operation)
+                filled.append(new_chunk())
+            add(filled[-1], [operation])
+
+    chunks = grouped if len(grouped) <= len(filled) else filled
+    for chunk in chunks:
+        chunk["operations"].sort(key=lambda item: item["index"])
+
+    return chunks
+
+
+def name_chunks(chunks: list[SpecChunk]):
+    """
+    Name the chunks after their groups, as valid and unique module names.
+    """
+    names = set()
+    for chunk in chunks:
+        groups = [
+            re.sub(r"\W+", "_", group).strip("_") or "default"
+            for group in chunk["groups"]
+        ]
+        name = "_".join(groups[:3])
+        if len(groups) > 3:
+            name += f"_and_{len(groups) - 3}_more"
+        if name[0].isdigit():
+            name = f"_{name}"
+
+        unique_name, count = name, 1
+        while unique_name in names:
+            count += 1
+            unique_name = f"{name}_{count}"
+        names.add(unique_name)
+        chunk["name"] = unique_name
+
+
+def build_sub_spec(spec: dict, operations: list[OperationCost]) -> dict:
+    """
+    Build the spec of some operations, keeping only the components they reference.
+    """
+    refs = set().union(*(operation["refs"] for operation in operations))
+    containers = {ref.split("/")[1] for ref in refs}
+    sub_spec = {
+        key: value
+        for key, value in spec.items()
+        if key != "paths" and key not in containers
+    }
+    if "components" in containers and "securitySchemes" in spec["components"]:
+        sub_spec["components"] = {
+            "securitySchemes": spec["components"]["securitySchemes"]
+        }
+
+    for ref in sorted(refs):
+        parts = ref.split("/")[1:]
+        target = sub_spec
+        for p in parts[:-1]:
+            target = target.setdefault(p, {})
+        target[parts[-1]] = lookup_ref(spec, ref)
+
+    paths = {}
+    for operation in operations:
+        path_item = spec["paths"][operation["path"]]
+        if operation["path"] not in paths:
+            paths[operation["path"]] = {
+                key: value
+                for key, value in path_item.items()
+                if key not in http_methods
+            }
+        paths[operation["path"]][operation["method"]] = path_item[operation["method"]]
+    sub_spec["paths"] = paths
+
+    return sub_spec
+
+
+def chunk_openapi_spec(
+    spec: dict, *, user_rules: str = "", language: Language = "python"
+) -> list[tuple[SpecChunk, dict]]:
+    """
+    Split an OpenAPI spec into as few sub specs as possible that fit the prompts.
+
+    Every sub spec holds whole groups of operations (by tag or resource) when they
+    fit, and only the components its operations reference. A packed chunk the
+    prompt checks still find too long, because the estimate is a sum of separately
+    counted parts, is split in two.
+
+    :param spec: The OpenAPI spec.
+    :param user_rules: The user rules, which take space in the prompts.
+    :param language: The language of the generated code.
+    :return: The chunks with their sub specs.
+    """
+    operations, path_tokens, type_tokens = measure_operations(spec)
+    budgets = step_budgets(spec, user_rules=user_rules, language=language)
+    if min(budgets.values()) <= 0:
+        raise ValueError("The prompt templates alone are too long for the prompts.")
+
+    chunks = pack_operations(
+        operations, path_tokens=path_tokens, type_tokens=type_tokens, budgets=budgets
+    )
+
+    checked: list[tuple[SpecChunk, dict]] = []
+    while chunks:
+        chunk = chunks.pop(0)
+        sub_spec = build_sub_spec(spec, chunk["operations"])
+        api_spec, types_json = extract_information(copy.deepcopy(sub_spec))
+        report = step_budget_report(
+            api_spec, types_json, user_rules=user_rules, language=language
+        )
+        if len(chunk["operations"]) > 1 and not is_within_budget(report):
+            middle = len(chunk["operations"]) // 2
+            for half in (chunk["operations"][:middle], chunk["operations"][middle:]):
+                smaller = new_chunk()
+                smaller["operations"] = half
+                smaller["groups"] = list(dict.fromkeys(item["group"] for item in half))
+                chunks.insert(0, smaller)
+            continue
+
+        checked.append((chunk, sub_spec))
+
+    name_chunks([chunk for chunk, _ in checked])
+
+    return checked
+
+
+def split_openapi_spec(
+    file_path: Path,
+    output_dir_path: Path,
+    *,
+    user_rules: str = "",
+    language: Language = "python",
+) -> list[Path]:
+    """
+    Split an OpenAPI specification file into sub specs that each fit the prompts.
+    :param file_path: Path to the OpenAPI specification file.
+    :param output_dir_path: Path to the directory where the split files will be saved.
+    :param user_rules: The user rules, which take space in the prompts.
+    :param language: The language of the generated code.
+
+    :return: The paths of the sub specs.
+    """
+    spec = load_spec(file_path)
+    chunks = chunk_openapi_spec(spec, user_rules=user_rules, language=language)
+    if len(chunks) < 2:
+        raise ValueError("Failed to split the OpenAPI spec.")
+
+    print(
+        f"Split {file_path.stem} into {len(chunks)} sub specs: "
+        + ", ".join(
+            f"{chunk['name']} ({len(chunk['operations'])} operations)"
+            for chunk, _ in chunks
+        )
+    )
+
+    output_files = []
+    for chunk, sub_spec in chunks:
+        output_file = output_dir_path / f"{chunk['name']}.json"
+        with open(output_file, "w", encoding="utf-8") as file:
+            json.dump(sub_spec, file, indent=2, cls=DateTimeEncoder)
+        output_files.append(output_file)
+
+    return output_files
@@ -0,0 +1,427 @@
+import ast
+import re
+import textwrap
+
+from sdkgenerator.types import Operation
+
+path_param_pattern = re.compile(r"\{[^}]*\}")
+
+
+def node_lines(node: ast.stmt) -> tuple[int, int]:
+    """
+    Get the line range of a statement, including its decorators.
+
+    :param node: The statement.
+    :return: The first line (0-based) and the line after the last one.
+    """
+    decorators = getattr(node, "decorator_list", [])
+    start = min([node.lineno] + [decorator.lineno for decorator in decorators])
+    return start - 1, node.end_lineno
+
+
+def node_source(source: str, node: ast.stmt) -> str:
+    """
+    Get the source of a statement, including its decorators, dedented.
+    """
+    start, end = node_lines(node)
+    return textwrap.dedent("\n".join(source.splitlines()[start:end]))
+
+
+def splice(source: str, edits: list[tuple[int, int, str]]) -> str:
+    """
+    Replace line ranges of the source.
+
+    :param source: The source code.
+    :param edits: The (start, end, text) edits, with 0-based [start, end) line ranges.
+        An empty range inserts the text, an empty text removes the range.
+    :return: The edited source code.
+    """
+    lines = source.splitlines()
+    # apply from the bottom so the line numbers of the remaining edits stay valid
+    # (insertions at the same line keep their order)
+    ordered = sorted(
+        enumerate(edits),
+        key=lambda item: (item[1][0], item[1][1], item[0]),
+        reverse=True,
+    )
+    for _, (start, end, text) in ordered:
+        if not text and start > 0 and end < len(lines):
+            # don't leave two blank lines where a definition was removed
+            if not lines[start - 1].strip() and not lines[end].strip():
+                end += 1
+        lines[start:end] = text.splitlines() if text else []
+
+    return "\n".join(lines) + "\n"
+
+
+def find_client_class(tree: ast.Module) -> ast.ClassDef | None:
+    """
+    Find the SDK client class: the class with the most methods.
+
+    :param tree: The parsed SDK module.
+    :return: The client class, or None if the module has no class.
+    """
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+    if not classes:
+        return None
+
+    return max(
+        classes,
+        key=lambda node: sum(
+            isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+            for item in node.body
+        ),
+    )
+
+
+def get_methods(class_node: ast.ClassDef) -> dict[str, ast.FunctionDef]:
+    """
+    Get the methods of a class by name.
+    """
+    return {
+        item.name: item
+        for item in class_node.body
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+
+def is_stub(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    """
+    Check if a function has no body but a docstring and `...` or `pass`, like the
+    methods of a class skeleton (see `class_skeleton`).
+    """
+    body = node.body
+    if ast.get_docstring(node) is not None:
+        body = body[1:]
+
+    return all(
+        isinstance(item, ast.Pass)
+        or (
+            isinstance(item, ast.Expr)
+            and isinstance(item.value, ast.Constant)
+            and item.value.value is Ellipsis
+        )
+        for item in body
+    )
+
+
+def get_functions(code: str) -> dict[str, str]:
+    """
+    Get the source of every function in a code snippet, whether top-level or inside a class.
+
+    :param code: The generated code.
+    :return: The dedented source of each function, by name.
+    """
+    tree = ast.parse(code)
+    functions = {}
+    for node in tree.body:
+        items = node.body if isinstance(node, ast.ClassDef) else [node]
+        for item in items:
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions[item.name] = node_source(code, item)
+
+    return functions
+
+
+def definition_names(node: ast.stmt) -> list[str]:
+    """
+    Get the names defined by a top-level class, function or assignment.
+    """
+    if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+        return [node.name]
+
+    if isinstance(node, (ast.Assign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return [target.id for target in targets if isinstance(target, ast.Name)]
+
+    return []
+
+
+def get_definitions(code: str) -> dict[str, str]:
+    """
+    Get the source of the top-level classes, functions and assignments of a module.
+
+    :param code: The module source.
+    :return: The source of each definition, by name.
+    """
+    tree = ast.parse(code)
+    return {
+        name: node_source(code, node)
+        for node in tree.body
+        for name in definition_names(node)
+    }
+
+
+def merge_imports(source: str, code: str) -> str:
+    """
+    Add the top-level imports of a code snippet that are missing from the source.
+
+    :param source: The module source.
+    :param code: The code snippet.
+    :return: The source with the missing imports added after its last import.
+    """
+    tree = ast.parse(source)
+    existing = {
+        ast.unparse(node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    }
+    missing = [
+        ast.unparse(node)
+        for node in ast.parse(code).body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+        and ast.unparse(node) not in existing
+    ]
+    if not missing:
+        return source
+
+    imports = [
+        node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    position = imports[-1].end_lineno if imports else 0
+    return splice(source, [(position, position, "\n".join(missing))])
+
+
+def merge_modules(codes: list[str]) -> str:
+    """
+    Merge modules generated separately into one.
+
+    The imports are gathered at the top, then come the definitions in order. A
+    name defined again by a later module keeps its first definition. A module
+    that doesn't parse is appended as is.
+
+    :param codes: The modules source.
+    :return: The merged module.
+    """
+    if len(codes) == 1:
+        return codes[0]
+
+    imports: list[str] = []
+    definitions: list[str] = []
+    defined: set[str] = set()
+
+    for code in codes:
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            definitions.append(code.strip())
+            continue
+
+        for node in tree.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                if ast.unparse(node) not in imports:
+                    imports.append(ast.unparse(node))
+                continue
+
+            names = set(definition_names(node))
+            if names and names <= defined:
+                continue
+            defined |= names
+            definitions.append(node_source(code, node))
+
+    return "\n".join(imports) + "\n\n\n" + "\n\n\n".join(definitions) + "\n"
+
+
+def method_indent(class_node: ast.ClassDef) -> str:
+    """
+    Get the indentation of the methods of a class.
+    """
+    methods = get_methods(class_node)
+    if methods:
+        return " " * next(iter(methods.values())).col_offset
+
+    return " " * (class_node.col_offset + 4)
+
+
+def string_constants(node: ast.AST) -> list[str]:
+    """
+    Get the string constants of a node, rendering f-strings with "{}" for the formatted values.
+    """
+    strings = []
+    f_string_parts = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.JoinedStr):
+            f_string_parts.update(id(value) for value in child.values)
+            strings.append(
+                "".join(
+                    value.value if isinstance(value, ast.Constant) else "{}"
+                    for value in child.values
+                )
+            )
+        elif (
+            isinstance(child, ast.Constant)
+            and isinstance(child.value, str)
+            and id(child) not in f_string_parts
+        ):
+            strings.append(child.value)
+
+    return strings
+
+
+def to_snake_case(name: str) -> str:
+    name = re.sub(r"[^0-9a-zA-Z]+", "_", name)
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    return name.strip("_").lower()
+
+
+def method_matches_operation(
+    method: ast.FunctionDef, *, path: str, http_method: str, operation_id: str
+) -> bool:
+    """
+    Check if a method implements an operation.
+
+    A method matches when its name is the snake case operationId, or when it
+    uses the operation's HTTP method and builds the url of its path.
+    """
+    if method.name == to_snake_case(operation_id):
+        return True
+
+    strings = string_constants(method)
+    if http_method.upper() not in {string.upper() for string in strings}:
+        return False
+
+    normalized_path = normalize_path(path)
+    return any(
+        normalize_path(string) == normalized_path for string in strings if "/" in string
+    )
+
+
+def find_method(
+    methods: dict[str, ast.FunctionDef], operation: Operation
+) -> str | None:
+    """
+    Find the name of the method implementing an operation.
+    """
+    for name, method in methods.items():
+        if method_matches_operation(
+            method,
+            path=operation["path"],
+            http_method=operation["method"],
+            operation_id=operation["operation_id"],
+        ):
+            return name
+
+    return None
+
+
+def generated_method_edits(
+    code: str,
+    class_node: ast.ClassDef,
+    methods: dict[str, ast.FunctionDef],
+    operations: dict[str, Operation],
+    keys: list[str],
+    *,
+    old_operations: dict[str, Operation] | None = None,
+) -> list[tuple[int, int, str]]:
+    """
+    Get the edits that splice the generated methods of some operations into the
+    client class (see `splice`).
+
+    The method of each operation replaces its existing method, or is added to the
+    class. The other generated functions are added as helpers, unless a method has
+    their name: the constructor, the private helpers and the methods of the other
+    operations are kept. The stubs the model echoes from a skeleton are dropped.
+
+    :param code: The generated code, the methods alone or in a class.
+    :param class_node: The client class.
+    :param methods: The methods of the class, the replaced ones are removed from it.
+    :param operations: The operations, by key.
+    :param keys: The operations whose methods were generated.
+    :param old_operations: The operations the existing methods implement, if they
+        changed since. Default to `operations`.
+    :return: The edits.
+    """
+    old_operations = old_operations or operations
+    generated = {}
+    for node in ast.parse(code).body:
+        items = node.body if isinstance(node, ast.ClassDef) else [node]
+        for item in items:
+            if (
+                isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and not (item.name.startswith("_") and item.name in methods)
+                and not is_stub(item)
+            ):
+                generated[item.name] = item
+
+    indent = method_indent(class_node)
+    end = class_node.end_lineno
+
+    def render(item: ast.FunctionDef) -> str:
+        return textwrap.indent(node_source(code, item), indent)
+
+    edits = []
+    for key in keys:
+        old_name = find_method(methods, old_operations.get(key) or operations[key])
+        new_name = (
+            old_name
+            if old_name in generated
+            else find_method(generated, operations[key])
+        )
+        if new_name is None:
+            continue
+
+        text = render(generated.pop(new_name))
+        if old_name:
+            edits.append((*node_lines(methods.pop(old_name)), text))
+        else:
+            edits.append((end, end, "\n" + text))
+
+    # the helpers of the generated methods
+    for name, item in generated.items():
+        if name not in methods:
+            edits.append((end, end, "\n" + render(item)))
+
+    return edits
+
+
+def normalize_path(url: str) -> str:
+    """
+    Normalize a url or a path template for comparison: "{}" for every parameter,
+    without the base url ("{}" prefix or scheme and host), query string and trailing slash.
+    """
+    url = path_param_pattern.sub("{}", url).split("?")[0].rstrip("/")
+    url = re.sub(r"^https?://[^/]+", "", url)
+    if url.startswith("{}/"):
+        url = url[2:]
+    return url
+
+
+def class_skeleton(
+    source: str, class_node: ast.ClassDef, *, public_methods: bool = True
+) -> str:
+    """
+    Render a class with the bodies of its public methods omitted.
+
+    The private methods (like `_make_authenticated_request`) and `__init__`
+    are kept whole since they show how the class handles auth and urls.
+
+    :param source: The module source.
+    :param class_node: The class.
+    :param public_methods: Keep the signatures of the public methods, else leave them out.
+    :return: The skeleton of the class.
+    """
+    lines = source.splitlines()
+    start, _ = node_lines(class_node)
+    skeleton = lines[start : class_node.body[0].lineno - 1]
+
+    for item in class_node.body:
+        item_start, item_end = node_lines(item)
+        if (
+            not isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+            or item.name.startswith("_")
+            or item.body[0].lineno == item.lineno
+        ):
+            skeleton += lines[item_start:item_end]
+            continue
+
+        if not public_methods:
+            continue
+
+        skeleton += lines[item_start : item.body[0].lineno - 1]
+        body_indent = " " * item.body[0].col_offset
+        docstring = ast.get_docstring(item)
+        if docstring:
+            skeleton.append(f'{body_indent}"""{docstring.splitlines()[0]}"""')
+        skeleton.append(f"{body_indent}...")
+
+    return textwrap.dedent("\n".join(skeleton))
@@ -1,5 +1,21 @@
 import yaml
-from sdkgenerator.types import Step, Agent
+from sdkgenerator.types import (
+    Step,
+    Agent,
+    BatchConfig,
+    CorpusConfig,
+    CacheConfig,
+    HttpConfig,
+    LoggingConfig,
+    MockServerConfig,
+    PipelineConfig,
+    RateLimit,
+    RetryConfig,
+    StreamingConfig,
+    TelemetryConfig,
+    ModelPrice,
+    Provider,
+)
 from pathlib import Path
 
 # Load the configuration file
@@ -12,3 +28,16 @@ TEMPERATURE: dict[Step, float] = config["TEMPERATURE"]
 AGENT: dict[Step, Agent] = config["AGENT"]
 MAX_PROMPT_LENGTH: dict[Step, int] = config["MAX_PROMPT_LENGTH"]
 MAX_TOKENS: dict[Step, int] = config["MAX_TOKENS"]
+BATCH: BatchConfig = config["BATCH"]
+PIPELINE: PipelineConfig = config["PIPELINE"]
+CORPUS: CorpusConfig = config["CORPUS"]
+CONCURRENCY: dict[Provider, int] = config["CONCURRENCY"]
+HTTP: HttpConfig = config["HTTP"]
+CACHE: CacheConfig = config["CACHE"]
+LOGGING: LoggingConfig = config["LOGGING"]
+RATE_LIMITS: dict[str, RateLimit] = config["RATE_LIMITS"]
+RETRY: RetryConfig = config["RETRY"]
+STREAMING: StreamingConfig = config["STREAMING"]
+TELEMETRY: TelemetryConfig = config["TELEMETRY"]
+PRICING: dict[str, ModelPrice] = config["PRICING"]
+MOCK_SERVER: MockServerConfig = config["MOCK_SERVER"]
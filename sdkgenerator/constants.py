@@ -2,8 +2,12 @@ import pathlib
 
 
 API_CALLS_DIR = pathlib.Path(__file__).parent.parent.absolute() / "api_calls"
+CALL_LOGS_DIR = API_CALLS_DIR / "calls"
+TRACES_DIR = API_CALLS_DIR / "traces"
+METRICS_FILE = API_CALLS_DIR / "metrics.prom"
 DATA_DIR = pathlib.Path(__file__).parent.parent.absolute() / "data"
 GENERATED_SDK_DIR = pathlib.Path(__file__).parent.parent.absolute() / "generated_sdk"
+CACHE_DIR = pathlib.Path(__file__).parent.parent.absolute() / ".cache"
 
 EDEN_AI_API = "https://api.edenai.run/v2/text/chat"
 OPENAI_API = "https://api.openai.com/v1/chat/completions"
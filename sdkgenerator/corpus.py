@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sdkgenerator.batch import find_specs
+from sdkgenerator.config import CORPUS
+from sdkgenerator.loader import load_spec
+from sdkgenerator.manifier import DateTimeEncoder, format_information, minify
+from sdkgenerator.types import CorpusFileResult, CorpusReport
+from sdkgenerator.utils import validate_openapi_spec
+
+MANIFEST_FILE = "manifest.json"
+
+# Bump when the minified output changes, so every spec is minified again
+corpus_version = 1
+
+
+def spec_digest(file_path: Path) -> str:
+    """
+    Hash the content of a spec along with the corpus version.
+    """
+    digest = hashlib.sha256(f"{corpus_version}:".encode("utf-8"))
+    with open(file_path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def output_files(file_path: Path, output_dir: Path) -> tuple[Path, Path]:
+    """
+    Get the files of the minified spec: the text of the api spec and the types.
+    """
+    return (
+        output_dir / f"{file_path.stem}.txt",
+        output_dir / f"{file_path.stem}.types.json",
+    )
+
+
+def minify_spec_file(
+    file_path: Path, output_dir: Path, digest: str
+) -> CorpusFileResult:
+    """
+    Minify a spec and write it to the output directory, never raising so one
+    failure can't stop the corpus. Runs in the worker processes.
+    """
+    result: CorpusFileResult = {
+        "name": file_path.stem,
+        "file": str(file_path),
+        "digest": digest,
+        "status": "minified",
+        "bytes": file_path.stat().st_size,
+        "load_seconds": 0.0,
+        "minify_seconds": 0.0,
+        "write_seconds": 0.0,
+        "error": None,
+    }
+    try:
+        start = time.perf_counter()
+        # the corpus is hashed already, the parsed spec cache would only take space
+        spec = load_spec(file_path, use_cache=False)
+        validate_openapi_spec(spec)
+        loaded = time.perf_counter()
+        result["load_seconds"] = loaded - start
+
+        (
+            paths_with_metadata,
+            server_url,
+            types,
+            api_security_scopes,
+            security_schemes,
+        ) = minify(spec)
+        api_spec = format_information(
+            paths_with_metadata, server_url, api_security_scopes, security_schemes
+        )
+        minified = time.perf_counter()
+        result["minify_seconds"] = minified - loaded
+
+        text_file, types_file = output_files(file_path, output_dir)
+        text_file.write_text(api_spec, encoding="utf-8")
+        types_file.write_text(
+            json.dumps(types, indent=2, cls=DateTimeEncoder), encoding="utf-8"
+        )
+        result["write_seconds"] = time.perf_counter() - minified
+    except Exception as e:
+        traceback.print_exc()
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def minify_spec_chunk(
+    tasks: list[tuple[Path, str]], output_dir: Path
+) -> list[CorpusFileResult]:
+    return [
+        minify_spec_file(file_path, output_dir, digest) for file_path, digest in tasks
+    ]
+
+
+def load_manifest(output_dir: Path) -> dict[str, CorpusFileResult]:
+    manifest_file = output_dir / MANIFEST_FILE
+    if not manifest_file.exists():
+        return {}
+
+    try:
+        return json.loads(manifest_file.read_text())
+    except (OSError, ValueError):
+        print(f"Ignoring the invalid manifest {manifest_file}.")
+        return {}
+
+
+def save_manifest(output_dir: Path, manifest: dict[str, CorpusFileResult]):
+    manifest_file = output_dir / MANIFEST_FILE
+    tmp_file = manifest_file.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps(manifest, indent=2))
+    tmp_file.replace(manifest_file)
+
+
+def is_unchanged(
+    file_path: Path, digest: str, output_dir: Path, manifest: dict
+) -> bool:
+    entry = manifest.get(file_path.name)
+    return (
+        entry is not None
+        and entry["digest"] == digest
+        and entry["status"] == "minified"
+        and all(file.exists() for file in output_files(file_path, output_dir))
+    )
+
+
+def minify_corpus(
+    specs_dir: Path,
+    output_dir: Path,
+    *,
+    workers: int = CORPUS["workers"],
+    chunk_size: int = CORPUS["chunk_size"],
+    force: bool = False,
+) -> CorpusReport:
+    """
+    Minify every spec of a directory in a pool of processes.
+
+    Each spec is written to `output_dir` as `<name>.txt` (the minified api spec)
+    and `<name>.types.json` by the worker that minifies it. The specs whose
+    content didn't change since the last run are skipped, as recorded in the
+    manifest of the output directory, which is saved after every chunk.
+
+    :param specs_dir: The directory of the specs.
+    :param output_dir: The directory of the minified specs.
+    :param workers: The number of processes, 0 for one per CPU.
+    :param chunk_size: The number of specs sent to a process at a time.
+    :param force: Minify the unchanged specs too.
+    :return: The report of the corpus, with the timings of every spec.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    manifest = load_manifest(output_dir)
+    start = time.perf_counter()
+
+    results: list[CorpusFileResult] = []
+    tasks: list[tuple[Path, str]] = []
+    for file_path in find_specs(specs_dir):
+        digest = spec_digest(file_path)
+        if not force and is_unchanged(file_path, digest, output_dir, manifest):
+            results.append({**manifest[file_path.name], "status": "skipped"})
+        else:
+            tasks.append((file_path, digest))
+
+    chunks = [tasks[i : i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    print(
+        f"Minifying {len(tasks)} specs with {workers} processes "
+        f"({len(results)} unchanged)..."
+    )
+
+    if chunks:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            for chunk_results in executor.map(
+                minify_spec_chunk, chunks, [output_dir] * len(chunks)
+            ):
+                for result in chunk_results:
+                    manifest[Path(result["file"]).name] = result
+                    print(f"{result['name']}: {result['status']}")
+                results.extend(chunk_results)
+                save_manifest(output_dir, manifest)
+
+    return {
+        "workers": workers,
+        "wall_time": time.perf_counter() - start,
+        "minified": sum(result["status"] == "minified" for result in results),
+        "skipped": sum(result["status"] == "skipped" for result in results),
+        "failed": sum(result["status"] == "failed" for result in results),
+        "results": sorted(results, key=lambda result: result["name"]),
+    }
+
+
+def format_corpus_report(report: CorpusReport, *, slowest: int = 10) -> str:
+    """
+    Format the corpus report as a human-readable summary, with the slowest specs.
+
+    :param report: The corpus report.
+    :param slowest: The number of specs listed.
+    :return: The summary.
+    """
+    processed = [
+        result for result in report["results"] if result["status"] != "skipped"
+    ]
+    lines = [
+        f"Minified {report['minified']} specs with {report['workers']} processes "
+        f"in {report['wall_time']:.2f}s ({report['skipped']} unchanged, "
+        f"{report['failed']} failed)",
+    ]
+
+    if processed:
+        lines += [
+            "",
+            f"{'spec':<40}{'size (KB)':>10}{'load (s)':>10}{'minify (s)':>12}{'write (s)':>11}",
+        ]
+        processed.sort(
+            key=lambda result: result["load_seconds"]
+            + result["minify_seconds"]
+            + result["write_seconds"],
+            reverse=True,
+        )
+        for result in processed[:slowest]:
+            lines.append(
+                f"{result['name'][:39]:<40}{result['bytes'] / 1024:>10.0f}"
+                f"{result['load_seconds']:>10.2f}{result['minify_seconds']:>12.2f}"
+                f"{result['write_seconds']:>11.2f}"
+            )
+        lines.append(
+            f"{'total':<40}{sum(result['bytes'] for result in processed) / 1024:>10.0f}"
+            f"{sum(result['load_seconds'] for result in processed):>10.2f}"
+            f"{sum(result['minify_seconds'] for result in processed):>12.2f}"
+            f"{sum(result['write_seconds'] for result in processed):>11.2f}"
+        )
+
+    failures = [result for result in report["results"] if result["status"] == "failed"]
+    if failures:
+        lines += ["", "Failures:"]
+        lines += [f"- {result['name']}: {result['error']}" for result in failures]
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Minify every OpenAPI spec of a directory."
+    )
+    parser.add_argument("specs_dir", type=Path, help="Directory of the specs.")
+    parser.add_argument(
+        "output_dir", type=Path, help="Directory of the minified specs."
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=CORPUS["workers"],
+        help="Number of processes, 0 for one per CPU.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CORPUS["chunk_size"],
+        help="Number of specs sent to a process at a time.",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Minify the unchanged specs too."
+    )
+    parser.add_argument(
+        "--report", type=Path, help="Write the report as JSON to this file."
+    )
+    args = parser.parse_args()
+
+    report = minify_corpus(
+        args.specs_dir,
+        args.output_dir,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        force=args.force,
+    )
+    print(format_corpus_report(report))
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
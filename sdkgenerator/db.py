@@ -1,19 +1,42 @@
 from pymongo.mongo_client import MongoClient
+from pymongo.database import Database
 from dotenv import load_dotenv
 import os
+import threading
 
 load_dotenv()
 
-uri = os.getenv("MONGODB_URI")
+_client: MongoClient | None = None
+_db: Database | None = None
+_lock = threading.Lock()
 
-if uri is None:
-    raise Exception("MONGODB_URI not found in .env file.")
 
-client = MongoClient(uri)
+def get_db() -> Database:
+    """
+    Get the database, connecting on the first call instead of at import time.
 
-try:
-    client.admin.command("ping")
-    db = client["sdk-gen"]
-    print("Database connected successfully. (MongoDB)")
-except Exception as e:
-    print(e)
+    :raises Exception: If MONGODB_URI is not set or the server can't be reached.
+    :return: The sdk-gen database.
+    """
+    global _client, _db
+
+    with _lock:
+        if _db is None:
+            uri = os.getenv("MONGODB_URI")
+            if uri is None:
+                raise Exception("MONGODB_URI not found in .env file.")
+
+            client = MongoClient(uri)
+            client.admin.command("ping")
+            print("Database connected successfully. (MongoDB)")
+            _client, _db = client, client["sdk-gen"]
+
+    return _db
+
+
+def __getattr__(name: str):
+    # keeps `from sdkgenerator.db import db` working, connecting on first access
+    if name == "db":
+        return get_db()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1 +1,2 @@
 from .generate_sdk import generate_sdk
+from .regenerate_sdk import regenerate_sdk
@@ -1,14 +1,47 @@
+import ast
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
 from pathlib import Path
 from dotenv import load_dotenv
 
-from sdkgenerator.manifier import get_api_data
-from sdkgenerator.utils import (
-    is_all_steps_within_limit,
-    split_openapi_spec,
+from sdkgenerator.checker import check_code, format_defects, record_code_check
+from sdkgenerator.codeedit import merge_modules
+from sdkgenerator.generate.repair_sdk import repair_code
+from sdkgenerator.history import HistoryBuilder
+from sdkgenerator.manifier import get_minified_api, get_operations, DateTimeEncoder
+from sdkgenerator.chunker import split_openapi_spec
+from sdkgenerator.pipeline import Pipeline, PipelineNode, format_node_timings
+from sdkgenerator.renderer import (
+    apply_method_names,
+    client_class_name,
+    get_rendered_operations,
+    method_listing,
+    parse_method_names,
+    render_sdk,
 )
-from sdkgenerator.types import Language
+from sdkgenerator.tokens import (
+    count_tokens,
+    format_budget_report,
+    is_within_budget,
+    step_budget_report,
+)
+from sdkgenerator.metrics import (
+    code_check_decisions,
+    minify_seconds,
+    sdk_seconds,
+    spec_bytes,
+    spec_operations,
+    spec_prompt_tokens,
+    spec_types,
+)
+from sdkgenerator.tracing import current_span, span, trace
+from sdkgenerator.typegen import compile_types, types_dependency_order
+from sdkgenerator.types import Language, MinifiedApi, Operation, Step, StepBudget
+from sdkgenerator.utils import language_to_extension
+from sdkgenerator.config import BATCH, PIPELINE
 from sdkgenerator.constants import (
     GENERATED_SDK_DIR,
 )
@@ -20,11 +53,183 @@ from sdkgenerator.generators import (
     generate_initial_code_without_types,
     feedback_on_generated_code_without_types,
     generate_final_code_without_types,
+    generate_auth_methods,
+    generate_method_names,
 )
 
 load_dotenv()
 
 
+def split_types_json(types_json: dict, *, max_tokens: int) -> list[dict]:
+    """
+    Split the types into chunks of about `max_tokens` tokens, generated in parallel.
+
+    The types are chunked in dependency order, so the types a chunk references are
+    defined in the same chunk or in an earlier one.
+
+    :param types_json: The types of the minified spec.
+    :param max_tokens: The tokens of a chunk, 0 to keep the types in one chunk.
+    :return: The chunks, a single one when the types are short enough.
+    """
+    if not max_tokens or count_tokens(str(types_json), step="types") <= max_tokens:
+        return [types_json]
+
+    chunks: list[dict] = []
+    chunk, chunk_tokens = {}, 0
+    for name in types_dependency_order(types_json):
+        tokens = count_tokens(str({name: types_json[name]}), step="types")
+        if chunk and chunk_tokens + tokens > max_tokens:
+            chunks.append(chunk)
+            chunk, chunk_tokens = {}, 0
+        chunk[name] = types_json[name]
+        chunk_tokens += tokens
+
+    chunks.append(chunk)
+    return chunks
+
+
+def run_pipeline(nodes: list[PipelineNode], *, api_spec_name: str) -> dict:
+    """
+    Run the steps of an SDK and print their timings.
+    """
+    pipeline = Pipeline(nodes)
+    start = time.perf_counter()
+    values = pipeline.run({}, workers=PIPELINE["workers"])
+
+    print(
+        f"Pipeline of {api_spec_name} done in {time.perf_counter() - start:.2f}s\n"
+        + format_node_timings(pipeline.timings)
+    )
+    return values
+
+
+def check_node(
+    operations: dict[str, Operation], *, api_spec_name: str, with_types: bool
+) -> PipelineNode:
+    """
+    The node that checks the initial code statically (see `checker.check_code`)
+    and outputs its "defects", with PIPELINE.adaptive_feedback. Without defects,
+    the feedback and the final code are skipped.
+    """
+
+    def check(initial_code: str, types_code: str = None):
+        with span("check_code") as check_span:
+            defects = check_code(initial_code, operations, types_code=types_code)
+            if check_span is not None:
+                check_span.set(**{"check.defects": len(defects)})
+
+        decision = "feedback" if defects else "skip"
+        code_check_decisions.inc(decision=decision)
+        record_code_check(api_spec_name, defects, skipped=not defects)
+        print(
+            f"The initial code has {len(defects)} defects, asking for feedback on them"
+            if defects
+            else "The initial code passed the checks, skipping the feedback"
+        )
+
+        return {"defects": defects}
+
+    return PipelineNode(
+        "check",
+        check,
+        inputs=("initial_code", "types_code") if with_types else ("initial_code",),
+        outputs=("defects",),
+    )
+
+
+def repair_node(
+    minified: MinifiedApi,
+    *,
+    api_spec_name: str,
+    rules: str,
+    language: Language,
+    with_types: bool,
+) -> PipelineNode:
+    """
+    The node that regenerates the missing and broken methods of the "final_code"
+    (see `repair_sdk.repair_code`) and outputs the "code", with PIPELINE.repair.
+    """
+
+    def repair(final_code: str, types_code: str = None):
+        with span("repair_code"):
+            code = repair_code(
+                final_code,
+                minified,
+                types_code=types_code,
+                sdk_name=api_spec_name,
+                rules=rules,
+                language=language,
+            )
+
+        return {"code": code}
+
+    return PipelineNode(
+        "repair",
+        repair,
+        inputs=("final_code", "types_code") if with_types else ("final_code",),
+        outputs=("code",),
+    )
+
+
+def types_nodes(
+    types_json: dict, *, sdk_module: Path, language: Language
+) -> list[PipelineNode]:
+    """
+    The nodes that write the types file of an SDK, the last one outputs
+    "types_code" and "types_file".
+
+    With PIPELINE.types_backend "compiler", the types are compiled from their
+    schemas and only the ones the compiler doesn't support are left to the LLM.
+    Long types are generated in chunks, in parallel (PIPELINE.types_chunk_tokens).
+    """
+    compiled_types = ""
+    if PIPELINE["types_backend"] == "compiler" and language == "python":
+        with span("compile_types") as compile_span:
+            compiled_types, types_json = compile_types(types_json)
+            if compile_span is not None:
+                compile_span.set(**{"types.fallback": len(types_json)})
+        print(f"Compiled the types, {len(types_json)} left to the language model")
+
+    chunks = (
+        split_types_json(types_json, max_tokens=PIPELINE["types_chunk_tokens"])
+        if types_json
+        else []
+    )
+
+    def types_node(index: int, chunk: dict) -> PipelineNode:
+        def run():
+            return {f"types_{index}": generate_types(str(chunk), language=language)}
+
+        name = "types" if len(chunks) == 1 else f"types_{index}"
+        return PipelineNode(name, run, outputs=(f"types_{index}",))
+
+    def merge_types(**generated: tuple[str, str]):
+        results = [generated[f"types_{index}"] for index in range(len(chunks))]
+        codes = [code for code, _ in results]
+        if compiled_types:
+            # the compiled types come first, the LLM may define them again
+            codes.insert(0, compiled_types)
+        types_code = merge_modules(codes)
+
+        # create the types file
+        types_file = sdk_module / f"types{results[0][1] if results else '.py'}"
+        types_file.write_text(types_code)
+
+        return {"types_code": types_code, "types_file": types_file}
+
+    nodes = [types_node(index, chunk) for index, chunk in enumerate(chunks)]
+    nodes.append(
+        PipelineNode(
+            "merge_types",
+            merge_types,
+            inputs=tuple(f"types_{index}" for index in range(len(chunks))),
+            outputs=("types_code", "types_file"),
+        )
+    )
+
+    return nodes
+
+
 def pipeline_with_types(
     api_spec: str,
     types_json: dict,
@@ -33,46 +238,126 @@ def pipeline_with_types(
     sdk_module: Path,
     language: Language = "python",
     api_spec_name: str,
+    minified: MinifiedApi,
 ) -> tuple[str, str, Path]:
-    types_code, file_extension = generate_types(str(types_json), language=language)
-
-    # create the types file
-    types_file = sdk_module / f"types{file_extension}"
-    types_file.write_text(types_code)
-
+    """
+    Generate the types and the code of an SDK.
+
+    The types are written by the nodes of `types_nodes`. With
+    PIPELINE.speculative_initial_code, the code is written without waiting for
+    the types, so the types and the code steps run side by side. With
+    PIPELINE.adaptive_feedback, the feedback is on the defects of the initial
+    code found by `check_node`, and is skipped when there are none. With
+    PIPELINE.repair, the broken methods of the final code are regenerated by
+    `repair_node`. The histories of the steps are built by `HistoryBuilder`.
+    """
     rules = "#RULES\n:" + user_rules.strip() if user_rules.strip() else ""
-
-    initial_code, history = generate_initial_code(
-        api_spec,
-        types=types_code,
-        sdk_name=api_spec_name,
-        rules=rules,
-        language=language,
-    )
-
-    history = history[:-1]
-
-    feedback = feedback_on_generated_code(
-        initial_code, history, sdk_name=api_spec_name, rules=rules, language=language
-    )
-
-    final_code_prev_history = [
-        {"role": "user", "message": "Write me an sdk for my api"},
-        {
-            "role": "assistant",
-            "message": f"Here is the generated code for the sdk: '''{initial_code}'''",
-        },
+    speculative = PIPELINE["speculative_initial_code"]
+    histories = HistoryBuilder(minified)
+    adaptive = PIPELINE["adaptive_feedback"]
+    repair = PIPELINE["repair"]
+    # the final code is repaired into the code
+    final_output = "final_code" if repair else "code"
+
+    def initial_code(types_code: str = None):
+        if speculative:
+            code = generate_initial_code_without_types(
+                api_spec, sdk_name=api_spec_name, rules=rules, language=language
+            )
+            # the feedback builds the spec history, only if it is sent
+            return {"initial_code": code, "history": None}
+
+        code, history = generate_initial_code(
+            api_spec,
+            types=histories.types(types_code, step="initial_code"),
+            sdk_name=api_spec_name,
+            rules=rules,
+            language=language,
+        )
+        return {
+            "initial_code": code,
+            "history": None if histories.compact else history[:-1],
+        }
+
+    def feedback(initial_code: str, history: list | None, defects: list = None):
+        if adaptive and not defects:
+            return {"feedback": None}
+
+        if history is None:
+            history = histories.spec_history(step="feedback")
+
+        return {
+            "feedback": feedback_on_generated_code(
+                initial_code,
+                history,
+                sdk_name=api_spec_name,
+                rules=rules,
+                language=language,
+                defects=format_defects(defects) if adaptive else None,
+            )
+        }
+
+    def final_code(initial_code: str, feedback: str | None):
+        if feedback is None:
+            return {
+                final_output: initial_code,
+                "file_extension": language_to_extension[language],
+            }
+
+        code, file_extension = generate_final_code(
+            feedback,
+            histories.final_code_history(initial_code),
+            rules=rules,
+            sdk_name=api_spec_name,
+            language=language,
+        )
+        return {final_output: code, "file_extension": file_extension}
+
+    nodes = types_nodes(types_json, sdk_module=sdk_module, language=language)
+    nodes += [
+        PipelineNode(
+            "initial_code",
+            initial_code,
+            inputs=() if speculative else ("types_code",),
+            outputs=("initial_code", "history"),
+        ),
+    ]
+    if adaptive:
+        nodes.append(
+            check_node(
+                get_operations(minified["paths"]),
+                api_spec_name=api_spec_name,
+                with_types=True,
+            )
+        )
+    nodes += [
+        PipelineNode(
+            "feedback",
+            feedback,
+            inputs=("initial_code", "history") + (("defects",) if adaptive else ()),
+            outputs=("feedback",),
+        ),
+        PipelineNode(
+            "final_code",
+            final_code,
+            inputs=("initial_code", "feedback"),
+            outputs=(final_output, "file_extension"),
+        ),
     ]
+    if repair:
+        nodes.append(
+            repair_node(
+                minified,
+                api_spec_name=api_spec_name,
+                rules=rules,
+                language=language,
+                with_types=True,
+            )
+        )
 
-    code, file_extension = generate_final_code(
-        feedback,
-        final_code_prev_history,
-        rules=rules,
-        sdk_name=api_spec_name,
-        language=language,
-    )
+    values = run_pipeline(nodes, api_spec_name=api_spec_name)
 
-    return code, file_extension, types_file
+    return values["code"], values["file_extension"], values["types_file"]
 
 
 def pipeline_without_types(
@@ -81,50 +366,352 @@ def pipeline_without_types(
     api_spec_name: str,
     user_rules: str,
     language: Language = "python",
+    minified: MinifiedApi,
 ):
     rules = "#RULES\n:" + user_rules.strip() if user_rules.strip() else ""
+    adaptive = PIPELINE["adaptive_feedback"]
+    repair = PIPELINE["repair"]
+    # the final code is repaired into the code
+    final_output = "final_code" if repair else "code"
+    histories = HistoryBuilder(minified)
+
+    def initial_code():
+        return {
+            "initial_code": generate_initial_code_without_types(
+                api_spec, language=language, sdk_name=api_spec_name, rules=rules
+            )
+        }
+
+    def feedback(initial_code: str, defects: list = None):
+        if adaptive and not defects:
+            return {"feedback": None}
+
+        # we can add user rules here
+        return {
+            "feedback": feedback_on_generated_code_without_types(
+                initial_code,
+                histories.spec_history(step="feedback"),
+                language=language,
+                sdk_name=api_spec_name,
+                rules=rules,
+                defects=format_defects(defects) if adaptive else None,
+            )
+        }
+
+    def final_code(initial_code: str, feedback: str | None):
+        if feedback is None:
+            return {
+                final_output: initial_code,
+                "file_extension": language_to_extension[language],
+            }
+
+        code, file_extension = generate_final_code_without_types(
+            feedback,
+            histories.final_code_history(initial_code),
+            language=language,
+            sdk_name=api_spec_name,
+            rules=rules,
+        )
+        return {final_output: code, "file_extension": file_extension}
+
+    nodes = [PipelineNode("initial_code", initial_code, outputs=("initial_code",))]
+    if adaptive:
+        nodes.append(
+            check_node(
+                get_operations(minified["paths"]),
+                api_spec_name=api_spec_name,
+                with_types=False,
+            )
+        )
+    nodes += [
+        PipelineNode(
+            "feedback",
+            feedback,
+            inputs=("initial_code",) + (("defects",) if adaptive else ()),
+            outputs=("feedback",),
+        ),
+        PipelineNode(
+            "final_code",
+            final_code,
+            inputs=("initial_code", "feedback"),
+            outputs=(final_output, "file_extension"),
+        ),
+    ]
+    if repair:
+        nodes.append(
+            repair_node(
+                minified,
+                api_spec_name=api_spec_name,
+                rules=rules,
+                language=language,
+                with_types=False,
+            )
+        )
 
-    initial_code = generate_initial_code_without_types(
-        api_spec, language=language, sdk_name=api_spec_name, rules=rules
-    )
+    values = run_pipeline(nodes, api_spec_name=api_spec_name)
 
-    feedback_prev_history = [
-        {
-            "role": "user",
-            "message": f"I have this specification for an API spec: '''{api_spec}'''",
-        },
-        {
-            "role": "assistant",
-            "message": f"Okay, let me generate the code for the sdk",
-        },
-    ]
+    return values["code"], values["file_extension"]
 
-    # we can add user rules here
-    feedback = feedback_on_generated_code_without_types(
-        initial_code,
-        feedback_prev_history,
-        language=language,
-        sdk_name=api_spec_name,
-        rules=rules,
+
+def pipeline_rendered(
+    minified: MinifiedApi,
+    *,
+    user_rules: str,
+    sdk_module: Path,
+    language: Language = "python",
+    api_spec_name: str,
+) -> tuple[str, str, Path | None]:
+    """
+    Render the code of an SDK from its minified spec (PIPELINE.code_backend
+    "render" or "render_gaps"), next to the types written by `types_nodes`.
+
+    With "render_gaps", the LLM writes the authentication methods from the
+    security schemes, and the names and docstrings of the methods from a line per
+    method, in batches of PIPELINE.method_names_batch_size methods. Those requests
+    run in parallel with the types, and their prompts hold neither the spec nor
+    the code.
+    """
+    rules = "#RULES\n:" + user_rules.strip() if user_rules.strip() else ""
+    types_json = minified["types"]
+    class_name = client_class_name(api_spec_name)
+    operations = get_rendered_operations(minified)
+
+    gaps = PIPELINE["code_backend"] == "render_gaps"
+    batch_size = PIPELINE["method_names_batch_size"] or len(operations) or 1
+    batches = (
+        [
+            operations[index : index + batch_size]
+            for index in range(0, len(operations), batch_size)
+        ]
+        if gaps
+        else []
     )
+    # without security schemes there is no authentication to write
+    with_auth = gaps and bool(minified["security_schemes"])
+
+    def auth():
+        security = json.dumps(
+            {
+                "security_schemes": minified["security_schemes"],
+                "security_scopes": minified["api_security_scopes"],
+            }
+        )
+        try:
+            auth_code = generate_auth_methods(
+                security,
+                minified["server_url"],
+                class_name,
+                sdk_name=api_spec_name,
+                rules=rules,
+                language=language,
+            )
+        except ValueError as e:
+            print(f"Rendering the authentication methods from the spec: {e}")
+            auth_code = None
+
+        return {"auth_code": auth_code}
+
+    def method_names_node(index: int, batch: list) -> PipelineNode:
+        def run():
+            return {
+                f"method_names_{index}": generate_method_names(
+                    method_listing(batch),
+                    sdk_name=api_spec_name,
+                    rules=rules,
+                    language=language,
+                )
+            }
+
+        name = "method_names" if len(batches) == 1 else f"method_names_{index}"
+        return PipelineNode(name, run, outputs=(f"method_names_{index}",))
+
+    def render(auth_code: str = None, **method_names: str):
+        names = {}
+        for answer in method_names.values():
+            names.update(parse_method_names(answer))
+
+        code = render_sdk(
+            minified,
+            class_name=class_name,
+            with_types=bool(types_json),
+            operations=apply_method_names(operations, names) if gaps else operations,
+            auth_code=auth_code,
+        )
+        print(f"Rendered {len(operations)} methods of {class_name}")
 
-    final_code_prev_history = [
-        {"role": "user", "message": "Write me an sdk for my api"},
-        {
-            "role": "assistant",
-            "message": f"Here is the generated code for the sdk: '''{initial_code}'''",
-        },
-    ]
+        return {"code": code}
 
-    code, file_extension = generate_final_code_without_types(
-        feedback,
-        final_code_prev_history,
-        language=language,
-        sdk_name=api_spec_name,
-        rules=rules,
+    # the short requests first, so the render doesn't wait for all the types
+    nodes = [PipelineNode("auth", auth, outputs=("auth_code",))] if with_auth else []
+    nodes += [method_names_node(index, batch) for index, batch in enumerate(batches)]
+    if types_json:
+        nodes += types_nodes(types_json, sdk_module=sdk_module, language=language)
+    nodes.append(
+        PipelineNode(
+            "render",
+            render,
+            inputs=(("auth_code",) if with_auth else ())
+            + tuple(f"method_names_{index}" for index in range(len(batches))),
+            outputs=("code",),
+        )
     )
 
-    return code, file_extension
+    values = run_pipeline(nodes, api_spec_name=api_spec_name)
+
+    return values["code"], ".py", values.get("types_file")
+
+
+def save_snapshot(sdk_module: Path, minified: MinifiedApi):
+    """
+    Save the minified spec the SDK was generated from, used to regenerate it incrementally.
+    """
+    snapshot_file = sdk_module / "snapshot.json"
+    snapshot_file.write_text(json.dumps(minified, cls=DateTimeEncoder))
+
+
+def load_snapshot(sdk_module: Path) -> MinifiedApi | None:
+    """
+    Load the minified spec the SDK was last generated from, if any.
+    """
+    snapshot_file = sdk_module / "snapshot.json"
+    if not snapshot_file.is_file():
+        return None
+
+    return json.loads(snapshot_file.read_text())
+
+
+def write_aggregator_module(
+    sdk_module: Path, sub_sdk_files: dict[str, Path], *, api_spec_name: str
+) -> Path:
+    """
+    Write an __init__.py in the sdk module that imports every generated sub SDK.
+
+    The sub SDK modules are exposed in `sub_sdks` and the classes they define are
+    re-exported at the top level, except the ones defined by several sub SDKs
+    (e.g. `Client`), which are only in `sub_sdks[name]`.
+
+    :param sdk_module: The module of the split SDK.
+    :param sub_sdk_files: The generated SDK file of each sub spec.
+    :param api_spec_name: The name of the SDK.
+    :return: The path to the aggregator module.
+    """
+    modules = []
+    class_sub_sdks: dict[str, list[str]] = {}
+    for name, sub_sdk_file in sorted(sub_sdk_files.items()):
+        parts = sub_sdk_file.relative_to(sdk_module).with_suffix("").parts
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        modules.append(f'    "{name}": ".{".".join(parts)}",')
+
+        try:
+            tree = ast.parse(sub_sdk_file.read_text())
+        except SyntaxError as e:
+            print(f"Not re-exporting the classes of the sub SDK {name}: {e}")
+            continue
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                class_sub_sdks.setdefault(node.name, []).append(name)
+
+    classes = []
+    for class_name, names in class_sub_sdks.items():
+        if len(names) > 1:
+            print(
+                f"The class {class_name} is defined by the sub SDKs {', '.join(names)} "
+                f"of {api_spec_name}, use sub_sdks[name].{class_name}"
+            )
+        else:
+            classes.append(f'    "{class_name}": "{names[0]}",')
+
+    modules_str = "\n".join(modules)
+    classes_str = "\n".join(classes)
+    aggregator = f'''"""
+{api_spec_name} SDK, split into {len(modules)} sub SDKs.
+"""
+import importlib
+
+_modules = {{
+{modules_str}
+}}
+
+# the classes defined by a single sub SDK, the others are only in sub_sdks
+_classes = {{
+{classes_str}
+}}
+
+sub_sdks = {{
+    name: importlib.import_module(module, __name__) for name, module in _modules.items()
+}}
+
+globals().update(
+    {{key: getattr(sub_sdks[name], key) for key, name in _classes.items()}}
+)
+'''
+
+    aggregator_file = sdk_module / "__init__.py"
+    aggregator_file.write_text(aggregator)
+
+    return aggregator_file
+
+
+def generate_sub_sdks(
+    sub_docs_dir: Path,
+    *,
+    output_dir: Path,
+    language: Language,
+    user_rules: str,
+    workers: int = BATCH["sub_sdk_workers"],
+) -> dict[str, Path]:
+    """
+    Generate the SDK of every sub spec concurrently, reporting each one as it finishes.
+
+    :param sub_docs_dir: The directory containing the sub specs.
+    :param output_dir: The directory where the sub SDKs are generated.
+    :param language: The language of the generated code.
+    :param user_rules: The user rules for the SDK.
+    :param workers: The number of sub SDKs generated at the same time.
+    :return: The generated SDK file of each sub spec.
+    :raises Exception: If any sub SDK failed, after all the others are done.
+    """
+    sub_specs = sorted(sub_docs_dir.iterdir())
+    sub_sdk_files: dict[str, Path] = {}
+    failed: dict[str, Exception] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            # run in a copy of the current context so step timings keep being recorded
+            executor.submit(
+                copy_context().run,
+                generate_sdk,
+                sub_spec,
+                output_dir=output_dir,
+                user_rules=user_rules,
+                language=language,
+            ): sub_spec
+            for sub_spec in sub_specs
+        }
+
+        for future in as_completed(futures):
+            sub_spec = futures[future]
+            try:
+                _, sub_sdk_file, _ = future.result()
+            except Exception as e:
+                print(f"Failed to generate SDK for {sub_spec.stem}: {e}")
+                failed[sub_spec.stem] = e
+                continue
+
+            sub_sdk_files[sub_spec.stem] = sub_sdk_file
+            print(
+                f"Generated SDK for {sub_spec.stem} "
+                f"({len(sub_sdk_files) + len(failed)}/{len(sub_specs)})"
+            )
+
+    if failed:
+        raise Exception(
+            f"Failed to generate {len(failed)} of {len(sub_specs)} sub SDKs: "
+            + ", ".join(f"{name} ({e})" for name, e in failed.items())
+        )
+
+    return sub_sdk_files
 
 
 def generate_sdk(
@@ -137,8 +724,72 @@ def generate_sdk(
 ) -> tuple[Path, Path | None, Path | None]:
     """
     Generate full SDK for the API spec and return the path to the generated SDK file.
+
+    When the spec is too long for the prompts, it is split into sub specs whose SDKs
+    are generated concurrently, and the returned SDK file is the aggregator module.
+
+    Each generation is traced (see `tracing.trace`) and timed in the metrics.
     """
-    api_spec, types_json = get_api_data(file_path)
+    start = time.perf_counter()
+    outcome = "error"
+    with trace(
+        "generate_sdk", **{"sdk.name": file_path.stem, "sdk.language": language}
+    ):
+        try:
+            result = build_sdk(
+                file_path,
+                output_dir=output_dir,
+                language=language,
+                user_rules=user_rules,
+            )
+            outcome = "success"
+            return result
+        finally:
+            sdk_seconds.observe(time.perf_counter() - start, outcome=outcome)
+
+
+def record_spec_metrics(
+    file_path: Path, minified: MinifiedApi, budget_report: dict[Step, StepBudget]
+):
+    """
+    Record the size of a spec in the metrics and on the current span.
+    """
+    size = file_path.stat().st_size
+    operations = sum(len(path["endpoints"]) for path in minified["paths"].values())
+    types = len(minified["types"])
+
+    spec_bytes.observe(size)
+    spec_operations.observe(operations)
+    spec_types.observe(types)
+    for step, budget in budget_report.items():
+        spec_prompt_tokens.observe(budget["used"], step=step)
+
+    if (sdk_span := current_span.get()) is not None:
+        sdk_span.set(
+            **{
+                "spec.bytes": size,
+                "spec.operations": operations,
+                "spec.types": types,
+                "spec.prompt_tokens": sum(
+                    budget["used"] for budget in budget_report.values()
+                ),
+            }
+        )
+
+
+def build_sdk(
+    file_path: Path,
+    /,
+    *,
+    output_dir: Path,
+    language: Language,
+    user_rules: str,
+) -> tuple[Path, Path | None, Path | None]:
+    start = time.perf_counter()
+    with span("minify"):
+        minified = get_minified_api(file_path)
+    minify_seconds.observe(time.perf_counter() - start)
+    api_spec, types_json = minified["api_spec"], minified["types"]
 
     api_spec_name = file_path.stem
 
@@ -157,36 +808,64 @@ def generate_sdk(
         types_file = types_file / "types.json"
         types_file.write_text(json.dumps(types_json, indent=4))
 
-    if not is_all_steps_within_limit(
+    budget_report = step_budget_report(
         api_spec,
         types_json,
         user_rules=user_rules,
-        lang=language,
-    ):
+        language=language,
+    )
+    record_spec_metrics(file_path, minified, budget_report)
+    rendered = PIPELINE["code_backend"] != "llm"
+    # the rendered code is never in a prompt, nor the whole spec
+    if not rendered and not is_within_budget(budget_report):
         if os.environ.get("ENV") == "development":
             raise Exception("The api specs are too long, skipping in for training...")
         else:
-            print("The api specs are too long, splitting the sdk into submodules...")
+            print(
+                "The api specs are too long, splitting the sdk into submodules...\n"
+                + format_budget_report(budget_report)
+            )
             sub_docs_dir = sdk_module / "sub_docs"
             sub_docs_dir.mkdir(exist_ok=True)
-            split_openapi_spec(file_path, output_dir_path=sub_docs_dir)
+            split_openapi_spec(
+                file_path,
+                output_dir_path=sub_docs_dir,
+                user_rules=user_rules,
+                language=language,
+            )
 
             # sdks directory
             sub_sdks_dir = sdk_module / "sdks"
             sub_sdks_dir.mkdir(exist_ok=True)
 
-            for sub_spec in sub_docs_dir.iterdir():
-                print(f"Generating SDK for {sub_spec.stem}...")
-                generate_sdk(
-                    sub_spec,
-                    output_dir=sub_sdks_dir,
-                    user_rules=user_rules,
-                    language=language,
-                )
+            sub_sdk_files = generate_sub_sdks(
+                sub_docs_dir,
+                output_dir=sub_sdks_dir,
+                user_rules=user_rules,
+                language=language,
+            )
 
-            return sub_docs_dir, None, None
+            aggregator_file = write_aggregator_module(
+                sdk_module, sub_sdk_files, api_spec_name=api_spec_name
+            )
 
-    if types_json:
+            return sdk_module, aggregator_file, None
+
+    if rendered:
+        code, file_extension, types_file = pipeline_rendered(
+            minified,
+            sdk_module=sdk_module,
+            api_spec_name=api_spec_name,
+            user_rules=user_rules,
+            language=language,
+        )
+        # create the sdk file
+        sdk_output_file = sdk_module / f"{api_spec_name}{file_extension}"
+        sdk_output_file.write_text(code)
+        save_snapshot(sdk_module, minified)
+
+        return sdk_module, sdk_output_file, types_file
+    elif types_json:
         code, file_extension, types_file = pipeline_with_types(
             api_spec,
             types_json,
@@ -194,10 +873,12 @@ def generate_sdk(
             api_spec_name=api_spec_name,
             user_rules=user_rules,
             language=language,
+            minified=minified,
         )
         # create the sdk file
         sdk_output_file = sdk_module / f"{api_spec_name}{file_extension}"
         sdk_output_file.write_text(code)
+        save_snapshot(sdk_module, minified)
 
         return sdk_module, sdk_output_file, types_file
     else:
@@ -206,10 +887,12 @@ def generate_sdk(
             api_spec_name=api_spec_name,
             user_rules=user_rules,
             language=language,
+            minified=minified,
         )
 
         # create the sdk file
         sdk_output_file = sdk_module / f"{api_spec_name}{file_extension}"
         sdk_output_file.write_text(code)
+        save_snapshot(sdk_module, minified)
 
         return sdk_module, sdk_output_file, None
@@ -0,0 +1,258 @@
+import ast
+from pathlib import Path
+
+from sdkgenerator.codeedit import (
+    class_skeleton,
+    definition_names,
+    find_client_class,
+    find_method,
+    generated_method_edits,
+    get_definitions,
+    get_methods,
+    merge_imports,
+    node_lines,
+    splice,
+)
+from sdkgenerator.constants import GENERATED_SDK_DIR
+from sdkgenerator.generate.generate_sdk import (
+    generate_sdk,
+    load_snapshot,
+    save_snapshot,
+)
+from sdkgenerator.generators import generate_updated_methods, generate_updated_types
+from sdkgenerator.manifier import (
+    filter_paths,
+    format_information,
+    get_minified_api,
+    get_operations,
+)
+from sdkgenerator.types import (
+    Language,
+    MinifiedApi,
+    Operation,
+    OperationDiff,
+    TypesDiff,
+)
+from sdkgenerator.utils import language_to_extension
+
+
+def diff_operations(
+    old_operations: dict[str, Operation], new_operations: dict[str, Operation]
+) -> OperationDiff:
+    """
+    Compare the operations of two versions of a spec.
+
+    :param old_operations: The operations of the previous spec (see `get_operations`).
+    :param new_operations: The operations of the new spec.
+    :return: The keys of the added, changed and removed operations.
+    """
+    return {
+        "added": [key for key in new_operations if key not in old_operations],
+        "changed": [
+            key
+            for key, operation in new_operations.items()
+            if key in old_operations and old_operations[key] != operation
+        ],
+        "removed": [key for key in old_operations if key not in new_operations],
+    }
+
+
+def diff_types(old_types: dict, new_types: dict) -> TypesDiff:
+    """
+    Compare the types of two versions of a spec.
+
+    :param old_types: The types of the previous spec.
+    :param new_types: The types of the new spec.
+    :return: The names of the added, changed and removed types.
+    """
+    return {
+        "added": [name for name in new_types if name not in old_types],
+        "changed": [
+            name
+            for name, schema in new_types.items()
+            if name in old_types and old_types[name] != schema
+        ],
+        "removed": [name for name in old_types if name not in new_types],
+    }
+
+
+def update_types_file(
+    types_file: Path,
+    minified: MinifiedApi,
+    types_diff: TypesDiff,
+    *,
+    sdk_name: str,
+    language: Language,
+):
+    """
+    Regenerate the added and changed types and splice them into the types file.
+    """
+    source = types_file.read_text() if types_file.is_file() else ""
+    existing = get_definitions(source)
+
+    names = types_diff["added"] + types_diff["changed"]
+    new_definitions = {}
+    if names:
+        code, _ = generate_updated_types(
+            str({name: minified["types"][name] for name in names}),
+            [name for name in existing if name not in names],
+            sdk_name=sdk_name,
+            language=language,
+        )
+        new_definitions = get_definitions(code)
+        source = merge_imports(source, code)
+
+    edits = []
+    for node in ast.parse(source).body:
+        for name in definition_names(node):
+            if name in new_definitions:
+                edits.append((*node_lines(node), new_definitions.pop(name)))
+                break
+            if name in types_diff["removed"]:
+                edits.append((*node_lines(node), ""))
+                break
+
+    source = splice(source, edits) if source else ""
+    if new_definitions:
+        source = (
+            source.rstrip("\n")
+            + "\n\n\n"
+            + "\n\n\n".join(new_definitions.values())
+            + "\n"
+        )
+
+    ast.parse(source)
+    types_file.write_text(source)
+
+
+def update_sdk_file(
+    sdk_file: Path,
+    old_operations: dict[str, Operation],
+    minified: MinifiedApi,
+    operations_diff: OperationDiff,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language,
+):
+    """
+    Regenerate the methods of the added and changed operations, remove the methods of
+    the removed ones, and splice them into the SDK client class.
+    """
+    source = sdk_file.read_text()
+    class_node = find_client_class(ast.parse(source))
+    if class_node is None:
+        raise Exception(f"No client class found in {sdk_file}.")
+
+    methods = get_methods(class_node)
+    new_operations = get_operations(minified["paths"])
+    edits = []
+
+    for key in operations_diff["removed"]:
+        if name := find_method(methods, old_operations[key]):
+            edits.append((*node_lines(methods.pop(name)), ""))
+
+    keys = operations_diff["added"] + operations_diff["changed"]
+    if keys:
+        api_spec = format_information(
+            filter_paths(minified["paths"], keys),
+            minified["server_url"],
+            minified["api_security_scopes"],
+            minified["security_schemes"],
+        )
+        code = generate_updated_methods(
+            api_spec,
+            class_skeleton(source, class_node),
+            class_node.name,
+            sdk_name=sdk_name,
+            rules=rules,
+            language=language,
+        )
+
+        edits += generated_method_edits(
+            code,
+            class_node,
+            methods,
+            new_operations,
+            keys,
+            old_operations=old_operations,
+        )
+
+    source = splice(source, edits)
+    if keys:
+        source = merge_imports(source, code)
+
+    try:
+        ast.parse(source)
+    except SyntaxError as e:
+        raise Exception(f"The updated SDK is not valid {language}: {e}")
+
+    sdk_file.write_text(source)
+
+
+def regenerate_sdk(
+    file_path: Path,
+    /,
+    *,
+    output_dir: Path = GENERATED_SDK_DIR,
+    language: Language = "python",
+    user_rules: str,
+) -> tuple[Path, Path | None, Path | None]:
+    """
+    Update a previously generated SDK after its API spec changed.
+
+    The new spec is minified and compared, per operation and per type, against
+    the snapshot saved by the last generation. Only the added and changed
+    operations and types are sent to the language model, and the results are
+    spliced into the existing SDK and types files. Falls back to a full
+    generation when there is no previous SDK.
+    """
+    api_spec_name = file_path.stem
+    sdk_module = output_dir / api_spec_name
+    file_extension = language_to_extension[language]
+    sdk_file = sdk_module / f"{api_spec_name}{file_extension}"
+    types_file = sdk_module / f"types{file_extension}"
+
+    snapshot = load_snapshot(sdk_module)
+    if snapshot is None or not sdk_file.is_file():
+        print(f"No previous SDK found for {api_spec_name}, generating the full SDK...")
+        return generate_sdk(
+            file_path, output_dir=output_dir, language=language, user_rules=user_rules
+        )
+
+    minified = get_minified_api(file_path)
+    old_operations = get_operations(snapshot["paths"])
+    operations_diff = diff_operations(old_operations, get_operations(minified["paths"]))
+    types_diff = diff_types(snapshot["types"], minified["types"])
+
+    print(
+        f"{api_spec_name}: operations "
+        + ", ".join(f"{len(keys)} {kind}" for kind, keys in operations_diff.items())
+        + "; types "
+        + ", ".join(f"{len(names)} {kind}" for kind, names in types_diff.items())
+    )
+
+    if any(types_diff.values()):
+        update_types_file(
+            types_file,
+            minified,
+            types_diff,
+            sdk_name=api_spec_name,
+            language=language,
+        )
+
+    if any(operations_diff.values()):
+        rules = "#RULES\n:" + user_rules.strip() if user_rules.strip() else ""
+        update_sdk_file(
+            sdk_file,
+            old_operations,
+            minified,
+            operations_diff,
+            sdk_name=api_spec_name,
+            rules=rules,
+            language=language,
+        )
+
+    save_snapshot(sdk_module, minified)
+
+    return sdk_module, sdk_file, types_file if types_file.is_file() else None
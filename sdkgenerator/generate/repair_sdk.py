@@ -0,0 +1,254 @@
+import ast
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from sdkgenerator.checker import check_code, defect, format_defects
+from sdkgenerator.codeedit import (
+    class_skeleton,
+    find_client_class,
+    find_method,
+    generated_method_edits,
+    get_methods,
+    merge_imports,
+    splice,
+    to_snake_case,
+)
+from sdkgenerator.config import PIPELINE
+from sdkgenerator.generators import generate_repaired_methods
+from sdkgenerator.manifier import filter_paths, format_information, get_operations
+from sdkgenerator.metrics import repaired_operations
+from sdkgenerator.types import CodeDefect, Language, MinifiedApi, Operation
+
+def_pattern = re.compile(r"^( +)(?:async\s+)?def\s+(\w+)")
+
+
+def method_span(lines: list[str], index: int) -> tuple[int, int, str] | None:
+    """
+    Find the method of a class around a line of a module that doesn't parse, from
+    the indentation of the lines since the ast can't tell.
+
+    :param lines: The lines of the module.
+    :param index: The line (0-based).
+    :return: The [start, end) lines of the method, with its decorators, and its
+        name. None if the line isn't in a method.
+    """
+    indents = [len(match[1]) for line in lines if (match := def_pattern.match(line))]
+    if not indents:
+        return None
+    indent = min(indents)
+
+    start = index
+    while start >= 0:
+        line = lines[start]
+        match = def_pattern.match(line)
+        if match and len(match[1]) == indent:
+            break
+        if line.strip() and len(line) - len(line.lstrip()) < indent:
+            # the class or a top-level statement
+            return None
+        start -= 1
+    else:
+        return None
+
+    name = def_pattern.match(lines[start])[2]
+    while start > 0 and lines[start - 1].startswith(" " * indent + "@"):
+        start -= 1
+
+    end = index + 1 if index > start else start + 1
+    while end < len(lines):
+        line = lines[end]
+        stripped = line.lstrip()
+        if (
+            stripped
+            and len(line) - len(stripped) <= indent
+            and not stripped.startswith((")", "]", "}"))
+        ):
+            break
+        end += 1
+    while end > start + 1 and not lines[end - 1].strip():
+        end -= 1
+
+    return start, end, name
+
+
+def drop_unparsable_methods(code: str) -> tuple[str, list[CodeDefect]]:
+    """
+    Remove the methods with syntax errors until the code parses.
+
+    :param code: The generated code.
+    :return: The code, and a syntax defect per removed method. The code still
+        doesn't parse if an error is outside of the methods.
+    """
+    defects = []
+    while True:
+        try:
+            ast.parse(code)
+            return code, defects
+        except SyntaxError as e:
+            error = e
+
+        lines = code.splitlines()
+        index = min(max(error.lineno or len(lines), 1), len(lines)) - 1
+        span = method_span(lines, index)
+        if span is None:
+            return code, defects
+
+        start, end, name = span
+        defects.append(
+            defect(
+                "syntax",
+                f"The method {name} doesn't parse: {error.msg}",
+                method=name,
+            )
+        )
+        code = splice(code, [(start, end, "")])
+
+
+def defect_operation(
+    code_defect: CodeDefect,
+    methods: dict[str, ast.FunctionDef],
+    operations: dict[str, Operation],
+) -> str | None:
+    """
+    Find the operation of a defect: its own, or the one its method implements.
+    """
+    if code_defect["operation"] is not None:
+        return code_defect["operation"]
+
+    name = code_defect["method"]
+    if name is None:
+        return None
+
+    for key, operation in operations.items():
+        if name == to_snake_case(operation["operation_id"]) or (
+            name in methods and find_method({name: methods[name]}, operation)
+        ):
+            return key
+
+    return None
+
+
+def repair_code(
+    code: str,
+    minified: MinifiedApi,
+    *,
+    types_code: str | None = None,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Regenerate the missing and broken methods of the final code, and splice them
+    into the client class.
+
+    The methods that don't parse are removed, then the code is checked against
+    the operations of the spec (see `checker.check_code`). The operations with no
+    method, or whose method uses undefined names or types, are requested again in
+    batches of PIPELINE.repair_batch_size operations, in parallel. Each prompt only
+    has the minified spec of its operations, their defects and the constructor
+    and private helpers of the client.
+
+    :param code: The final code.
+    :param minified: The minified spec.
+    :param types_code: The types module, None if the SDK has no types.
+    :param sdk_name: The name of the SDK.
+    :param rules: The rules for the SDK.
+    :param language: The language of the generated code.
+    :return: The repaired code, the code unchanged if it can't be repaired.
+    """
+    operations = get_operations(minified["paths"])
+    repaired, defects = drop_unparsable_methods(code)
+    try:
+        tree = ast.parse(repaired)
+    except SyntaxError as e:
+        print(
+            f"Can't repair {sdk_name}, its code doesn't parse outside of the methods: {e}"
+        )
+        return code
+
+    class_node = find_client_class(tree)
+    if class_node is None:
+        print(f"Can't repair {sdk_name}, its code has no client class")
+        return code
+
+    methods = get_methods(class_node)
+    defects += check_code(repaired, operations, types_code=types_code)
+    broken: dict[str, list[CodeDefect]] = {}
+    for code_defect in defects:
+        key = defect_operation(code_defect, methods, operations)
+        if key is not None:
+            broken.setdefault(key, []).append(code_defect)
+
+    if not broken:
+        return repaired
+
+    keys = list(broken)
+    batch_size = PIPELINE["repair_batch_size"] or len(keys)
+    batches = [
+        keys[index : index + batch_size] for index in range(0, len(keys), batch_size)
+    ]
+    skeleton = class_skeleton(repaired, class_node, public_methods=False)
+    print(f"Repairing {len(keys)} operations of {sdk_name} in {len(batches)} requests")
+
+    def repair_batch(batch: list[str]) -> str:
+        api_spec = format_information(
+            filter_paths(minified["paths"], batch),
+            minified["server_url"],
+            minified["api_security_scopes"],
+            minified["security_schemes"],
+        )
+        return generate_repaired_methods(
+            api_spec,
+            skeleton,
+            class_node.name,
+            defects=format_defects([item for key in batch for item in broken[key]]),
+            sdk_name=sdk_name,
+            rules=rules,
+            language=language,
+        )
+
+    with ThreadPoolExecutor(max_workers=PIPELINE["workers"]) as executor:
+        # run in a copy of the current context so step timings keep being recorded
+        futures = [
+            executor.submit(copy_context().run, repair_batch, batch)
+            for batch in batches
+        ]
+
+    edits = []
+    codes = []
+    for batch, future in zip(batches, futures):
+        try:
+            batch_code = future.result()
+            edits += generated_method_edits(
+                batch_code, class_node, methods, operations, batch
+            )
+        except Exception as e:
+            print(f"Failed to repair {', '.join(batch)}: {e}")
+            continue
+
+        codes.append(batch_code)
+
+    spliced = splice(repaired, edits)
+    for batch_code in codes:
+        spliced = merge_imports(spliced, batch_code)
+
+    try:
+        spliced_tree = ast.parse(spliced)
+    except SyntaxError as e:
+        print(f"The repaired methods of {sdk_name} don't fit in the code: {e}")
+        return repaired
+
+    # an operation is repaired when its new method has none of the defects left
+    spliced_class = find_client_class(spliced_tree)
+    spliced_methods = get_methods(spliced_class) if spliced_class else {}
+    still_broken = {
+        defect_operation(code_defect, spliced_methods, operations)
+        for code_defect in check_code(spliced, operations, types_code=types_code)
+    }
+    fixed = sum(key not in still_broken for key in keys)
+    repaired_operations.inc(fixed, outcome="repaired")
+    repaired_operations.inc(len(keys) - fixed, outcome="failed")
+    print(f"Repaired {fixed} of {len(keys)} operations of {sdk_name}")
+
+    return spliced
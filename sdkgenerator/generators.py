@@ -1,6 +1,209 @@
 from sdkgenerator.types import Language
-from sdkgenerator.utils import get_code_from_model_response, generate_llm_response
-from sdkgenerator.templates import TEMPLATES, TEMPLATES_WITHOUT_TYPES
+from sdkgenerator.utils import (
+    get_code_from_model_response,
+    generate_llm_response,
+    agenerate_llm_response,
+)
+from sdkgenerator.templates import (
+    TEMPLATES,
+    TEMPLATES_WITHOUT_TYPES,
+    INCREMENTAL_TEMPLATES,
+    RENDER_TEMPLATES,
+)
+
+
+def types_payload(types_json: str, *, language: Language) -> dict:
+    """Build the payload of the types step."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES[language]["types"].format(types=types_json),
+        "chatbot_global_action": f"You are a {language} developer, and you are writing types for an API",
+        "previous_history": [],
+    }
+
+
+def initial_code_payload(
+    api_spec: str, types: str, *, rules: str, language: Language
+) -> dict:
+    """Build the payload of the initial code step."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES[language]["initial_code"].format(
+            api_spec=api_spec, rules=rules
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are writing a client sdk for an API",
+        "previous_history": [
+            {"role": "user", "message": "Generate types needed for the sdk"},
+            {
+                "role": "assistant",
+                "message": f"Here are the types needed for the sdk stored in a file called types.py : '''{types}'''",
+            },
+        ],
+    }
+
+
+def feedback_payload(
+    generated_code: str,
+    previous_history: list,
+    *,
+    rules: str,
+    language: Language,
+    defects: str | None = None,
+) -> dict:
+    """Build the payload of the feedback step, on the defects of the code if any."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES[language][
+            "feedback_defects" if defects else "feedback"
+        ].format(generated_code=generated_code, rules=rules, defects=defects),
+        "chatbot_global_action": f"You are a {language} developer reviewing code for an SDK",
+        "previous_history": previous_history,
+    }
+
+
+def final_code_payload(
+    feedback: str, previous_history: list, *, rules: str, language: Language
+) -> dict:
+    """Build the payload of the final code step."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES[language]["final_code"].format(
+            feedback=feedback, rules=rules
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are refining a generated code",
+        "previous_history": previous_history,
+    }
+
+
+def initial_code_without_types_payload(
+    api_spec: str, *, rules: str, language: Language
+) -> dict:
+    """Build the payload of the initial code (without types) step."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES_WITHOUT_TYPES[language]["initial_code"].format(
+            api_spec=api_spec,
+            rules=rules,
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are writing a client sdk for an API",
+        "previous_history": [],
+    }
+
+
+def feedback_without_types_payload(
+    generated_code: str,
+    previous_history: list,
+    *,
+    rules: str,
+    language: Language,
+    defects: str | None = None,
+) -> dict:
+    """Build the payload of the feedback (without types) step, on the defects of the code if any."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES_WITHOUT_TYPES[language][
+            "feedback_defects" if defects else "feedback"
+        ].format(
+            generated_code=generated_code,
+            rules=rules,
+            defects=defects,
+        ),
+        "chatbot_global_action": f"You are a {language} developer reviewing code for an SDK",
+        "previous_history": previous_history,
+    }
+
+
+def final_code_without_types_payload(
+    feedback: str, previous_history: list, *, rules: str, language: Language
+) -> dict:
+    """Build the payload of the final code (without types) step."""
+    return {
+        "providers": "openai",
+        "text": TEMPLATES_WITHOUT_TYPES[language]["final_code"].format(
+            feedback=feedback,
+            rules=rules,
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are refining a generated code",
+        "previous_history": previous_history,
+    }
+
+
+def update_types_payload(
+    types_json: str, existing_types: list[str], *, language: Language
+) -> dict:
+    """Build the payload of the types step for an incremental update."""
+    return {
+        "providers": "openai",
+        "text": INCREMENTAL_TEMPLATES[language]["update_types"].format(
+            types=types_json, existing_types=", ".join(existing_types)
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are writing types for an API",
+        "previous_history": [],
+    }
+
+
+def update_code_payload(
+    api_spec: str, skeleton: str, class_name: str, *, rules: str, language: Language
+) -> dict:
+    """Build the payload of the initial code step for an incremental update."""
+    return {
+        "providers": "openai",
+        "text": INCREMENTAL_TEMPLATES[language]["update_code"].format(
+            api_spec=api_spec, skeleton=skeleton, class_name=class_name, rules=rules
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are updating a client sdk for an API",
+        "previous_history": [],
+    }
+
+
+def repair_code_payload(
+    api_spec: str,
+    skeleton: str,
+    class_name: str,
+    *,
+    defects: str,
+    rules: str,
+    language: Language,
+) -> dict:
+    """Build the payload of the repair of the broken or missing methods."""
+    return {
+        "providers": "openai",
+        "text": INCREMENTAL_TEMPLATES[language]["repair_code"].format(
+            api_spec=api_spec,
+            skeleton=skeleton,
+            class_name=class_name,
+            defects=defects,
+            rules=rules,
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are fixing a client sdk for an API",
+        "previous_history": [],
+    }
+
+
+def auth_payload(
+    security: str, base_url: str, class_name: str, *, rules: str, language: Language
+) -> dict:
+    """Build the payload of the authentication methods of a rendered sdk."""
+    return {
+        "providers": "openai",
+        "text": RENDER_TEMPLATES[language]["auth"].format(
+            security=security, base_url=base_url, class_name=class_name, rules=rules
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are writing a client sdk for an API",
+        "previous_history": [],
+    }
+
+
+def method_names_payload(methods: str, *, rules: str, language: Language) -> dict:
+    """Build the payload of the method names of a rendered sdk."""
+    return {
+        "providers": "openai",
+        "text": RENDER_TEMPLATES[language]["method_names"].format(
+            methods=methods, rules=rules
+        ),
+        "chatbot_global_action": f"You are a {language} developer, and you are naming the methods of a client sdk for an API",
+        "previous_history": [],
+    }
 
 
 def generate_types(
@@ -19,12 +222,7 @@ def generate_types(
 
     print("Generating types")
     message, _ = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES[language]["types"].format(types=types_json),
-            "chatbot_global_action": f"You are a {language} developer, and you are writing types for an API",
-            "previous_history": [],
-        },
+        payload=types_payload(types_json, language=language),
         step="types",
         sdk_name="types",
     )
@@ -50,20 +248,7 @@ def generate_initial_code(
 
     print("Generating initial code")
     message, history = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES[language]["initial_code"].format(
-                api_spec=api_spec, rules=rules
-            ),
-            "chatbot_global_action": f"You are a {language} developer, and you are writing a client sdk for an API",
-            "previous_history": [
-                {"role": "user", "message": "Generate types needed for the sdk"},
-                {
-                    "role": "assistant",
-                    "message": f"Here are the types needed for the sdk stored in a file called types.py : '''{types}'''",
-                },
-            ],
-        },
+        payload=initial_code_payload(api_spec, types, rules=rules, language=language),
         step="initial_code",
         sdk_name=sdk_name,
     )
@@ -83,6 +268,7 @@ def feedback_on_generated_code(
     sdk_name: str,
     rules: str,
     language: Language = "python",
+    defects: str | None = None,
 ) -> str:
     """
     Generate Feedback on the generated code for the API spec and return it as a string.
@@ -93,6 +279,7 @@ def feedback_on_generated_code(
     language: The language of the generated code. Default is "python".
     sdk_name: The name of the SDK.
     rules: The rules for the SDK.
+    defects: The defects found by the static check, the feedback is only on them.
 
     Returns:
     str: The feedback on the generated code.
@@ -100,14 +287,13 @@ def feedback_on_generated_code(
 
     print("Generating feedback")
     message, _ = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES[language]["feedback"].format(
-                generated_code=generated_code, rules=rules
-            ),
-            "chatbot_global_action": f"You are a {language} developer reviewing code for an SDK",
-            "previous_history": previous_history,
-        },
+        payload=feedback_payload(
+            generated_code,
+            previous_history,
+            rules=rules,
+            language=language,
+            defects=defects,
+        ),
         step="feedback",
         sdk_name=sdk_name,
     )
@@ -140,14 +326,9 @@ def generate_final_code(
     print("Generating final code")
 
     message, _ = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES[language]["final_code"].format(
-                feedback=feedback, rules=rules
-            ),
-            "chatbot_global_action": f"You are a {language} developer, and you are refining a generated code",
-            "previous_history": previous_history,
-        },
+        payload=final_code_payload(
+            feedback, previous_history, rules=rules, language=language
+        ),
         step="final_code",
         sdk_name=sdk_name,
     )
@@ -174,15 +355,9 @@ def generate_initial_code_without_types(
 
     print("Generating initial code")
     message, _ = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES_WITHOUT_TYPES[language]["initial_code"].format(
-                api_spec=api_spec,
-                rules=rules,
-            ),
-            "chatbot_global_action": f"You are a {language} developer, and you are writing a client sdk for an API",
-            "previous_history": [],
-        },
+        payload=initial_code_without_types_payload(
+            api_spec, rules=rules, language=language
+        ),
         step="initial_code",
         sdk_name=sdk_name,
     )
@@ -202,6 +377,7 @@ def feedback_on_generated_code_without_types(
     sdk_name: str,
     rules: str,
     language: Language = "python",
+    defects: str | None = None,
 ) -> str:
     """
     Generate Feedback on the generated code for the API spec and return it as a string.
@@ -212,20 +388,19 @@ def feedback_on_generated_code_without_types(
         :arg sdk_name: The name of the SDK.
         :arg rules: The rules for the SDK.
         :arg language: The language of the generated code. Default is "python".
+        :arg defects: The defects found by the static check, the feedback is only on them.
     Returns: str: The feedback on the generated code.
     """
 
     print("Generating feedback")
     message, _ = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES_WITHOUT_TYPES[language]["feedback"].format(
-                generated_code=generated_code,
-                rules=rules,
-            ),
-            "chatbot_global_action": f"You are a {language} developer reviewing code for an SDK",
-            "previous_history": previous_history,
-        },
+        payload=feedback_without_types_payload(
+            generated_code,
+            previous_history,
+            rules=rules,
+            language=language,
+            defects=defects,
+        ),
         step="feedback",
         sdk_name=sdk_name,
     )
@@ -258,17 +433,496 @@ def generate_final_code_without_types(
     print("Generating final code")
 
     message, _ = generate_llm_response(
-        payload={
-            "providers": "openai",
-            "text": TEMPLATES_WITHOUT_TYPES[language]["final_code"].format(
-                feedback=feedback,
-                rules=rules,
-            ),
-            "chatbot_global_action": f"You are a {language} developer, and you are refining a generated code",
-            "previous_history": previous_history,
-        },
+        payload=final_code_without_types_payload(
+            feedback, previous_history, rules=rules, language=language
+        ),
+        step="final_code",
+        sdk_name=sdk_name,
+    )
+
+    return get_code_from_model_response(message)
+
+
+def generate_updated_types(
+    types_json: str,
+    existing_types: list[str],
+    *,
+    sdk_name: str,
+    language: Language = "python",
+) -> tuple[str, str]:
+    """
+    Generate the types that were added or changed in the API spec.
+
+    Args:
+        :arg types_json: The added and changed types.
+        :arg existing_types: The names of the types already defined in the types file.
+        :arg sdk_name: The name of the SDK.
+        :arg language: The language of the generated code. Default is "python".
+
+    Returns:
+        tuple[str, str]: The generated types, and the file extension.
+    """
+
+    print("Generating updated types")
+    message, _ = generate_llm_response(
+        payload=update_types_payload(types_json, existing_types, language=language),
+        step="types",
+        sdk_name=sdk_name,
+    )
+
+    return get_code_from_model_response(message)
+
+
+def generate_updated_methods(
+    api_spec: str,
+    skeleton: str,
+    class_name: str,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Generate the methods of the endpoints that were added or changed in the API spec.
+
+    Args:
+        :arg api_spec: The minified spec of the added and changed endpoints.
+        :arg skeleton: The existing sdk with the method bodies omitted.
+        :arg class_name: The name of the client class.
+        :arg sdk_name: The name of the SDK.
+        :arg rules: The rules for the SDK.
+        :arg language: The language of the generated code. Default is "python".
+
+    Returns:
+        str: The generated methods.
+    """
+
+    print("Generating updated methods")
+    message, _ = generate_llm_response(
+        payload=update_code_payload(
+            api_spec, skeleton, class_name, rules=rules, language=language
+        ),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    if not code:
+        raise Exception("The generated methods are empty.")
+
+    return code
+
+
+def generate_repaired_methods(
+    api_spec: str,
+    skeleton: str,
+    class_name: str,
+    *,
+    defects: str,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Generate the methods of the endpoints whose methods are missing or broken in the final code.
+
+    Args:
+        :arg api_spec: The minified spec of the endpoints.
+        :arg skeleton: The existing sdk without its public methods.
+        :arg class_name: The name of the client class.
+        :arg defects: The defects of the methods.
+        :arg sdk_name: The name of the SDK.
+        :arg rules: The rules for the SDK.
+        :arg language: The language of the generated code. Default is "python".
+
+    Returns:
+        str: The generated methods.
+    """
+
+    print("Generating repaired methods")
+    message, _ = generate_llm_response(
+        payload=repair_code_payload(
+            api_spec,
+            skeleton,
+            class_name,
+            defects=defects,
+            rules=rules,
+            language=language,
+        ),
+        step="final_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    if not code:
+        raise Exception("The repaired methods are empty.")
+
+    return code
+
+
+def generate_auth_methods(
+    security: str,
+    base_url: str,
+    class_name: str,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Generate the authentication methods of a rendered SDK.
+
+    Args:
+        :arg security: The security schemes and scopes of the minified spec.
+        :arg base_url: The base url of the API.
+        :arg class_name: The name of the client class.
+        :arg sdk_name: The name of the SDK.
+        :arg rules: The rules for the SDK.
+        :arg language: The language of the generated code. Default is "python".
+
+    Returns:
+        str: The `__init__` and `_make_authenticated_request` methods.
+    """
+
+    print("Generating authentication methods")
+    message, _ = generate_llm_response(
+        payload=auth_payload(
+            security, base_url, class_name, rules=rules, language=language
+        ),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    return code
+
+
+def generate_method_names(
+    methods: str, *, sdk_name: str, rules: str, language: Language = "python"
+) -> str:
+    """
+    Generate the names and the docstrings of the methods of a rendered SDK.
+
+    Args:
+        :arg methods: The methods, a line per method: name | METHOD path | summary.
+        :arg sdk_name: The name of the SDK.
+        :arg rules: The rules for the SDK.
+        :arg language: The language of the generated code. Default is "python".
+
+    Returns:
+        str: The answer, a line per method: `name: new_name: docstring`.
+    """
+
+    print("Generating method names")
+    message, _ = generate_llm_response(
+        payload=method_names_payload(methods, rules=rules, language=language),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    return message
+
+
+async def agenerate_types(
+    types_json: str, *, language: Language = "python"
+) -> tuple[str, str]:
+    """
+    Async version of `generate_types`.
+    """
+
+    print("Generating types")
+    message, _ = await agenerate_llm_response(
+        payload=types_payload(types_json, language=language),
+        step="types",
+        sdk_name="types",
+    )
+
+    return get_code_from_model_response(message)
+
+
+async def agenerate_initial_code(
+    api_spec: str, types: str, sdk_name: str, rules: str, language: Language = "python"
+) -> tuple[str, list]:
+    """
+    Async version of `generate_initial_code`.
+    """
+
+    print("Generating initial code")
+    message, history = await agenerate_llm_response(
+        payload=initial_code_payload(api_spec, types, rules=rules, language=language),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    if not code:
+        raise Exception("The generated initial code is empty.")
+
+    return code, history
+
+
+async def afeedback_on_generated_code(
+    generated_code: str,
+    previous_history: list,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+    defects: str | None = None,
+) -> str:
+    """
+    Async version of `feedback_on_generated_code`.
+    """
+
+    print("Generating feedback")
+    message, _ = await agenerate_llm_response(
+        payload=feedback_payload(
+            generated_code,
+            previous_history,
+            rules=rules,
+            language=language,
+            defects=defects,
+        ),
+        step="feedback",
+        sdk_name=sdk_name,
+    )
+
+    return message
+
+
+async def agenerate_final_code(
+    feedback: str,
+    previous_history: list,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> tuple[str, str]:
+    """
+    Async version of `generate_final_code`.
+    """
+
+    print("Generating final code")
+
+    message, _ = await agenerate_llm_response(
+        payload=final_code_payload(
+            feedback, previous_history, rules=rules, language=language
+        ),
+        step="final_code",
+        sdk_name=sdk_name,
+    )
+
+    return get_code_from_model_response(message)
+
+
+async def agenerate_initial_code_without_types(
+    api_spec: str, sdk_name: str, rules: str, language: Language = "python"
+) -> str:
+    """
+    Async version of `generate_initial_code_without_types`.
+    """
+
+    print("Generating initial code")
+    message, _ = await agenerate_llm_response(
+        payload=initial_code_without_types_payload(
+            api_spec, rules=rules, language=language
+        ),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    if not code:
+        raise Exception("The generated initial code is empty.")
+
+    return code
+
+
+async def afeedback_on_generated_code_without_types(
+    generated_code: str,
+    previous_history: list,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+    defects: str | None = None,
+) -> str:
+    """
+    Async version of `feedback_on_generated_code_without_types`.
+    """
+
+    print("Generating feedback")
+    message, _ = await agenerate_llm_response(
+        payload=feedback_without_types_payload(
+            generated_code,
+            previous_history,
+            rules=rules,
+            language=language,
+            defects=defects,
+        ),
+        step="feedback",
+        sdk_name=sdk_name,
+    )
+
+    return message
+
+
+async def agenerate_final_code_without_types(
+    feedback: str,
+    previous_history: list,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> tuple[str, str]:
+    """
+    Async version of `generate_final_code_without_types`.
+    """
+
+    print("Generating final code")
+
+    message, _ = await agenerate_llm_response(
+        payload=final_code_without_types_payload(
+            feedback, previous_history, rules=rules, language=language
+        ),
         step="final_code",
         sdk_name=sdk_name,
     )
 
     return get_code_from_model_response(message)
+
+
+async def agenerate_updated_types(
+    types_json: str,
+    existing_types: list[str],
+    *,
+    sdk_name: str,
+    language: Language = "python",
+) -> tuple[str, str]:
+    """
+    Async version of `generate_updated_types`.
+    """
+
+    print("Generating updated types")
+    message, _ = await agenerate_llm_response(
+        payload=update_types_payload(types_json, existing_types, language=language),
+        step="types",
+        sdk_name=sdk_name,
+    )
+
+    return get_code_from_model_response(message)
+
+
+async def agenerate_updated_methods(
+    api_spec: str,
+    skeleton: str,
+    class_name: str,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Async version of `generate_updated_methods`.
+    """
+
+    print("Generating updated methods")
+    message, _ = await agenerate_llm_response(
+        payload=update_code_payload(
+            api_spec, skeleton, class_name, rules=rules, language=language
+        ),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    if not code:
+        raise Exception("The generated methods are empty.")
+
+    return code
+
+
+async def agenerate_auth_methods(
+    security: str,
+    base_url: str,
+    class_name: str,
+    *,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Async version of `generate_auth_methods`.
+    """
+
+    print("Generating authentication methods")
+    message, _ = await agenerate_llm_response(
+        payload=auth_payload(
+            security, base_url, class_name, rules=rules, language=language
+        ),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    return code
+
+
+async def agenerate_method_names(
+    methods: str, *, sdk_name: str, rules: str, language: Language = "python"
+) -> str:
+    """
+    Async version of `generate_method_names`.
+    """
+
+    print("Generating method names")
+    message, _ = await agenerate_llm_response(
+        payload=method_names_payload(methods, rules=rules, language=language),
+        step="initial_code",
+        sdk_name=sdk_name,
+    )
+
+    return message
+
+
+async def agenerate_repaired_methods(
+    api_spec: str,
+    skeleton: str,
+    class_name: str,
+    *,
+    defects: str,
+    sdk_name: str,
+    rules: str,
+    language: Language = "python",
+) -> str:
+    """
+    Async version of `generate_repaired_methods`.
+    """
+
+    print("Generating repaired methods")
+    message, _ = await agenerate_llm_response(
+        payload=repair_code_payload(
+            api_spec,
+            skeleton,
+            class_name,
+            defects=defects,
+            rules=rules,
+            language=language,
+        ),
+        step="final_code",
+        sdk_name=sdk_name,
+    )
+
+    code, _ = get_code_from_model_response(message)
+
+    if not code:
+        raise Exception("The repaired methods are empty.")
+
+    return code
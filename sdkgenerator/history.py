@@ -0,0 +1,221 @@
+import ast
+from contextvars import ContextVar
+from typing import Callable, Literal
+
+from sdkgenerator.config import PIPELINE
+from sdkgenerator.manifier import format_header
+from sdkgenerator.metrics import history_tokens_saved
+from sdkgenerator.renderer import AnnotationCompiler
+from sdkgenerator.tokens import count_tokens
+from sdkgenerator.types import HistoryArtifact, HistorySaving, MinifiedApi, Step
+
+# The tokens saved by the compact histories in the current context, set by the batch
+history_savings: ContextVar[list[HistorySaving] | None] = ContextVar(
+    "history_savings", default=None
+)
+
+# The artifacts of the earlier steps in the history of each step, in full or as an
+# outline. The initial code only annotates with the types, the feedback has the code
+# in its prompt and checks its methods against the endpoints, their parameters and
+# body types, and the final code rewrites the initial code, so it needs all of it.
+step_artifacts: dict[Step, dict[HistoryArtifact, Literal["full", "outline"]]] = {
+    "initial_code": {"types": "outline"},
+    "feedback": {"api_spec": "outline"},
+    "final_code": {"initial_code": "full"},
+}
+
+# The longest statement of the types kept as is in their outline
+outline_line_length = 100
+
+
+def types_outline(types_code: str) -> str:
+    """
+    Outline a types module: a line per type, with the fields of the classes
+    instead of their annotations.
+
+    :param types_code: The types module.
+    :return: The outline, the module itself if it doesn't parse.
+    """
+    try:
+        tree = ast.parse(types_code)
+    except SyntaxError:
+        return types_code
+
+    lines = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            # the keywords too, `total=False` tells which fields are optional
+            bases = ", ".join(
+                [ast.unparse(base) for base in node.bases]
+                + [ast.unparse(keyword) for keyword in node.keywords]
+            )
+            fields = [
+                item.target.id
+                for item in node.body
+                if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name)
+            ]
+            line = f"class {node.name}({bases}): ..."
+            lines.append(line + (f"  # {', '.join(fields)}" if fields else ""))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            statement = ast.unparse(node)
+            if len(statement) > outline_line_length:
+                # e.g. a Literal of many values, or a functional TypedDict
+                target = (
+                    node.targets[0] if isinstance(node, ast.Assign) else node.target
+                )
+                value = node.value
+                if isinstance(value, ast.Subscript):
+                    short = f"{ast.unparse(value.value)}[...]"
+                elif isinstance(value, ast.Call):
+                    short = f"{ast.unparse(value.func)}(...)"
+                else:
+                    short = "..."
+                statement = f"{ast.unparse(target)} = {short}"
+            lines.append(statement)
+
+    return "\n".join(lines)
+
+
+def endpoint_outline(path: str, metadata: dict, annotations: AnnotationCompiler) -> str:
+    """
+    Outline an endpoint of a minified spec: its method, path and operationId, and
+    its parameters and body with their types, `?` after the optional ones.
+    """
+    arguments = []
+    body = metadata["request_body"]
+    for parameter in metadata["parameters"]:
+        if parameter.get("in") == "body":
+            body = parameter
+            continue
+        optional = "" if parameter.get("required") else "?"
+        annotation = annotations.annotation(parameter.get("schema", {}))
+        arguments.append(f"{parameter['name']}{optional}: {annotation}")
+
+    if body:
+        optional = "" if body.get("required") else "?"
+        arguments.append(f"body{optional}: {annotations.annotation(body['schema'])}")
+
+    line = f"{metadata['method'].upper()} {path} (opid: {metadata['operation_id']})"
+    return line + (f" {', '.join(arguments)}" if arguments else "")
+
+
+def api_spec_outline(minified: MinifiedApi) -> str:
+    """
+    Outline a minified spec: its header (base url and security) and a line per
+    endpoint with its parameters and body (see `endpoint_outline`).
+    """
+    header = format_header(
+        minified["server_url"],
+        minified["api_security_scopes"],
+        minified["security_schemes"],
+    )
+    annotations = AnnotationCompiler(minified["types"])
+    endpoints = [
+        endpoint_outline(path, endpoint["metadata"], annotations)
+        for path, path_data in minified["paths"].items()
+        for endpoint in path_data["endpoints"]
+    ]
+
+    return header + "\n".join(endpoints) + "\n"
+
+
+def record_history_saving(
+    artifact: HistoryArtifact, *, step: Step, tokens: int, sent_tokens: int
+):
+    """
+    Record the tokens an outline saved in the savings of the current context, if any.
+    """
+    history_tokens_saved.inc(tokens - sent_tokens, step=step)
+    savings = history_savings.get()
+    if savings is not None:
+        savings.append(
+            {
+                "step": step,
+                "artifact": artifact,
+                "tokens": tokens,
+                "sent_tokens": sent_tokens,
+            }
+        )
+
+
+class HistoryBuilder:
+    """
+    Build the conversation histories of the steps of an SDK from its artifacts:
+    the spec, the types and the initial code.
+
+    Each step gets the artifacts it needs (see `step_artifacts`). With
+    PIPELINE.compact_history, the ones it only refers to are sent as an outline
+    instead of in full, and the tokens saved are recorded per step.
+    """
+
+    def __init__(self, minified: MinifiedApi, *, compact: bool | None = None):
+        self.minified = minified
+        self.compact = PIPELINE["compact_history"] if compact is None else compact
+
+    def artifact(
+        self,
+        artifact: HistoryArtifact,
+        content: str,
+        outline: Callable[[], str],
+        *,
+        step: Step,
+    ) -> str:
+        """
+        Get an artifact as the step needs it: in full, or its outline when shorter.
+        The saving is recorded here, so call it only for a prompt that is sent.
+        """
+        if not self.compact or step_artifacts[step].get(artifact) != "outline":
+            return content
+
+        short = outline()
+        tokens = count_tokens(content, step=step)
+        sent_tokens = count_tokens(short, step=step)
+        if sent_tokens >= tokens:
+            return content
+
+        record_history_saving(
+            artifact, step=step, tokens=tokens, sent_tokens=sent_tokens
+        )
+        return short
+
+    def types(self, types_code: str, *, step: Step) -> str:
+        """
+        The types module, as it is sent in the history of a step.
+        """
+        return self.artifact(
+            "types", types_code, lambda: types_outline(types_code), step=step
+        )
+
+    def spec_history(self, *, step: Step) -> list[dict]:
+        """
+        The conversation given to a step about the spec the code was written from.
+        """
+        api_spec = self.artifact(
+            "api_spec",
+            self.minified["api_spec"],
+            lambda: api_spec_outline(self.minified),
+            step=step,
+        )
+        return [
+            {
+                "role": "user",
+                "message": f"I have this specification for an API spec: '''{api_spec}'''",
+            },
+            {
+                "role": "assistant",
+                "message": f"Okay, let me generate the code for the sdk",
+            },
+        ]
+
+    def final_code_history(self, initial_code: str) -> list[dict]:
+        """
+        The conversation given to the final code step, which rewrites the initial
+        code, so it is always sent in full.
+        """
+        return [
+            {"role": "user", "message": "Write me an sdk for my api"},
+            {
+                "role": "assistant",
+                "message": f"Here is the generated code for the sdk: '''{initial_code}'''",
+            },
+        ]
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+
+import yaml
+
+from sdkgenerator.config import CACHE
+from sdkgenerator.constants import CACHE_DIR
+
+try:
+    # libyaml bindings, about 10x faster than the pure-Python loader
+    from yaml import CSafeLoader as SpecLoader
+except ImportError:
+    from yaml import SafeLoader as SpecLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SPEC_CACHE_DIR = CACHE_DIR / "specs"
+
+json_extensions = {".json"}
+yaml_extensions = {".yaml", ".yml"}
+
+# Bump when the parsing changes, so the specs cached by older versions are ignored
+spec_cache_version = 1
+
+
+def parse_spec(data: bytes, suffix: str) -> dict:
+    """
+    Parse the content of a JSON or YAML OpenAPI spec.
+
+    :param data: The raw content of the file.
+    :param suffix: The file extension, which selects the parser.
+    :return: The parsed spec.
+    """
+    if suffix in json_extensions:
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # orjson rejects NaN and integers wider than 64 bits, which json accepts
+                pass
+        return json.loads(data)
+
+    if suffix in yaml_extensions:
+        return yaml.load(data, Loader=SpecLoader)
+
+    raise ValueError(f"Unsupported file format for {suffix}")
+
+
+def spec_cache_enabled() -> bool:
+    return CACHE["enabled"] and CACHE["specs"] and not os.getenv("SDKGEN_NO_CACHE")
+
+
+def load_spec(file_path: Path | str, *, use_cache: bool | None = None) -> dict:
+    """
+    Load a JSON or YAML OpenAPI spec.
+
+    The parsed spec is pickled in the cache directory, keyed on the hash of the
+    file content, so loading the same spec again skips the parsing. Each call
+    returns a new dict, so callers may modify it.
+
+    :param file_path: The path to the spec.
+    :param use_cache: Read and write the parsed spec cache. Defaults to CACHE.specs,
+        unless SDKGEN_NO_CACHE is set.
+    :return: The parsed spec.
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix not in json_extensions | yaml_extensions:
+        raise ValueError(f"Unsupported file format for {file_path}")
+
+    if use_cache is None:
+        use_cache = spec_cache_enabled()
+
+    data = file_path.read_bytes()
+    if not use_cache:
+        return parse_spec(data, suffix)
+
+    digest = hashlib.sha256(data).hexdigest()
+    cache_file = SPEC_CACHE_DIR / f"{digest}-{spec_cache_version}{suffix}.pickle"
+    try:
+        return pickle.loads(cache_file.read_bytes())
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, ValueError):
+        print(f"Ignoring the corrupted cached spec {cache_file.name}")
+
+    spec = parse_spec(data, suffix)
+
+    SPEC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # write then rename so concurrent loads never read a partial file
+    temp_file = cache_file.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    temp_file.write_bytes(pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(temp_file, cache_file)
+
+    return spec
@@ -1,15 +1,210 @@
-from sdkgenerator.db import db
-from sdkgenerator.constants import API_CALLS_DIR
-from sdkgenerator.types import Step
-from sdkgenerator.config import AGENT
-import json
+import atexit
+import queue
+import threading
+import time
+
+from sdkgenerator.db import get_db
+from sdkgenerator.calllog import CallLogWriter
+from sdkgenerator.constants import CALL_LOGS_DIR
+from sdkgenerator.types import LlmCallLog, LogSinkName, Step
+from sdkgenerator.config import AGENT, LOGGING
+
+
+class LogSink:
+    """
+    A destination of the LLM call logs, written in batches by the background logger.
+    """
+
+    def write(self, records: list[LlmCallLog]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MongoSink(LogSink):
+    """
+    Insert the logs in a MongoDB collection, connecting on the first batch.
+
+    The sink disables itself if the database is not configured or can't be reached.
+    """
+
+    def __init__(self, collection: str = "responses"):
+        self.collection = collection
+        self.enabled = True
+
+    def write(self, records: list[LlmCallLog]):
+        if not self.enabled:
+            return
+
+        try:
+            db = get_db()
+        except Exception as e:
+            print(f"Disabling the MongoDB log sink: {e}")
+            self.enabled = False
+            return
+
+        # insert_many adds an _id to the documents, so don't let it touch the records
+        db[self.collection].insert_many(
+            [dict(record) for record in records], ordered=False
+        )
+
+
+class JsonlSink(LogSink):
+    """
+    Append the logs to the rotating JSONL call log (see `CallLogWriter`).
+    """
+
+    def __init__(self, writer: CallLogWriter):
+        self.writer = writer
+
+    def write(self, records: list[LlmCallLog]):
+        self.writer.write(records)
+
+    def close(self):
+        self.writer.close()
+
+
+def create_sink(name: LogSinkName) -> LogSink:
+    if name == "mongodb":
+        return MongoSink()
+    if name == "jsonl":
+        return JsonlSink(
+            CallLogWriter(
+                CALL_LOGS_DIR,
+                max_mb=LOGGING["jsonl"]["max_mb"],
+                max_age=LOGGING["jsonl"]["max_age"],
+                compression=LOGGING["jsonl"]["compression"],
+            )
+        )
+
+    raise ValueError(f"Unknown log sink: {name}")
+
+
+class BackgroundLogger:
+    """
+    Write the logs to the sinks from a background thread, in batches.
+
+    Logging only puts the record in a bounded queue. When the queue is full, the
+    caller waits up to `put_timeout` seconds for room, then the record is dropped
+    (and counted) so a slow sink can't stall the generation.
+    """
+
+    def __init__(
+        self,
+        sinks: list[LogSink],
+        *,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        put_timeout: float,
+    ):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.dropped = 0
+        self._queue: queue.Queue[LlmCallLog | None] = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="llm-call-logger", daemon=True
+        )
+        self._thread.start()
+
+    def log(self, record: LlmCallLog):
+        if self._closed:
+            return
+
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                print("The log queue is full, dropping LLM call logs.")
+
+    def flush(self):
+        """
+        Wait until every queued log is written.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Write the queued logs, then stop the background thread.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+        if self.dropped:
+            print(f"Dropped {self.dropped} LLM call logs.")
+
+    def _run(self):
+        while True:
+            # wait for a first log, then gather the batch for up to flush_interval
+            item = self._queue.get()
+            batch = [] if item is None else [item]
+            deadline = time.monotonic() + self.flush_interval
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (item is None)):
+                self._queue.task_done()
+
+            if item is None:
+                return
+
+    def _write(self, batch: list[LlmCallLog]):
+        for sink in self.sinks:
+            try:
+                sink.write(batch)
+            except Exception as e:
+                print(f"Error logging response: {e}")
+
+
+_llm_logger: BackgroundLogger | None = None
+_llm_logger_lock = threading.Lock()
+
+
+def get_llm_logger() -> BackgroundLogger:
+    """
+    Get the logger of the LLM calls, started on first use with the sinks of the
+    LOGGING config, and flushed when the process exits.
+    """
+    global _llm_logger
+
+    with _llm_logger_lock:
+        if _llm_logger is None:
+            _llm_logger = BackgroundLogger(
+                [create_sink(name) for name in LOGGING["sinks"]],
+                queue_size=LOGGING["queue_size"],
+                batch_size=LOGGING["batch_size"],
+                flush_interval=LOGGING["flush_interval"],
+                put_timeout=LOGGING["put_timeout"],
+            )
+            atexit.register(_llm_logger.close)
+
+    return _llm_logger
 
 
 def log_llm_response(
     payload: dict, response: dict, *, step: Step, sdk_name: str = None
 ):
     """
-    Log the response from the language model to logs file.
+    Log the response from the language model to the configured sinks (the
+    database and the JSONL call log by default), without waiting for the writes.
 
     :param sdk_name: The name of the SDK.
     :type sdk_name: str
@@ -21,23 +216,13 @@ def log_llm_response(
     :type response: dict
     :return: None
     """
-
-    # save the response to the database
-    try:
-        db["responses"].insert_one(
-            {
-                "step": step,
-                "sdk_name": sdk_name,
-                "payload": payload,
-                "response": response,
-                "custom": AGENT[step]["custom"],
-            }
-        )
-
-        # save the response to the logs file
-        with open(API_CALLS_DIR / "logs.txt", "a+", encoding="utf-8") as file:
-            file.write(f"Step: {step}\n")
-            file.write(f"Payload: {json.dumps(payload, indent=2)}\n")
-            file.write(f"Response: {json.dumps(response, indent=2)}\n-----------\n")
-    except Exception as e:
-        print(f"Error logging response: {e}")
+    get_llm_logger().log(
+        {
+            "created_at": time.time(),
+            "step": step,
+            "sdk_name": sdk_name,
+            "payload": payload,
+            "response": response,
+            "custom": AGENT[step]["custom"],
+        }
+    )
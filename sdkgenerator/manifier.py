@@ -3,9 +3,10 @@ from datetime import datetime, date
 import re
 import string
 from pathlib import Path
-import yaml
 
+from sdkgenerator.loader import load_spec
 from sdkgenerator.utils import validate_openapi_spec
+from sdkgenerator.types import MinifiedApi, Operation
 
 
 class DateTimeEncoder(json.JSONEncoder):
@@ -161,6 +162,89 @@ def resolve_refs_types(
         return ref
 
 
+class SchemaIndex:
+    """
+    The schemas referenced by a spec, resolved once per spec.
+
+    Every `$ref` target is looked up in the spec once, and every schema is
+    resolved, cleaned and abbreviated once, so the cost of minifying a spec grows
+    linearly with its number of endpoints. The output is the same as resolving
+    with `resolve_refs_types` and abbreviating all the types after each endpoint.
+    """
+
+    def __init__(self, openapi_spec: dict, keys_to_remove=None):
+        self.openapi_spec = openapi_spec
+        self.keys_to_remove = (
+            types_keys_to_remove if keys_to_remove is None else keys_to_remove
+        )
+        # The abbreviated types, and the ones resolved since the last abbreviation
+        self.types = {}
+        self.pending = {}
+        self._targets = {}
+        self._resolving = set()
+
+    def lookup(self, ref: str):
+        """
+        Get the object a `$ref` points to, walking the spec only the first time.
+        """
+        if ref not in self._targets:
+            ref_object = self.openapi_spec
+            for p in ref.split("/")[1:]:
+                ref_object = ref_object.get(p, {})
+            self._targets[ref] = ref_object
+
+        return self._targets[ref]
+
+    def resolve(self, ref):
+        """
+        Replace the `$ref` objects of a node by the name of the type they point to,
+        registering the referenced types (and theirs, recursively) as pending.
+        """
+        if isinstance(ref, dict):
+            new_ref = {}
+            for key, value in ref.items():
+                if key == "$ref":
+                    ref_name = value.split("/")[-1]
+                    # Already resolved, or currently being resolved (a cycle)
+                    if (
+                        ref_name in self.types
+                        or ref_name in self.pending
+                        or ref_name in self._resolving
+                    ):
+                        return ref_name
+
+                    self._resolving.add(ref_name)
+                    self.pending[ref_name] = self.resolve(self.lookup(value))
+                    self._resolving.remove(ref_name)
+
+                    return ref_name
+
+                elif key not in self.keys_to_remove:
+                    new_ref[key] = self.resolve(value)
+
+            return new_ref
+
+        elif isinstance(ref, list):
+            return [self.resolve(item) for item in ref]
+
+        else:
+            return ref
+
+    def abbreviate_pending(self):
+        """
+        Abbreviate the types resolved since the last call and add them to the types.
+        """
+        if self.pending:
+            self.types.update(abbreviate(self.pending, types_key_abbreviations))
+            self.pending = {}
+
+    def get_types(self) -> dict:
+        """
+        Get all the resolved types, the pending ones not abbreviated yet.
+        """
+        return {**self.types, **self.pending}
+
+
 def resolve_refs_request_body(openapi_spec, ref) -> dict:
     ref_path = ref.split("/")[1:]
     ref_object = openapi_spec
@@ -334,70 +418,62 @@ def abbreviate(data, abbreviations):
         return data
 
 
-def write_dict_to_text(data):
-    def remove_html_tags_and_punctuation(input_str):
-        # Strip HTML tags
-        no_html_str = re.sub("<.*?>", "", input_str)
-        # Define the characters that should be considered as punctuation
-        modified_punctuation = set(string.punctuation) - {
-            "/",
-            "#",
-            "_",
-            "-",
-            "|",
-            ".",
-            ",",
-            "{",
-            "}",
-        }
-        # Remove punctuation characters
-        return "".join(
-            ch for ch in no_html_str if ch not in modified_punctuation
-        ).strip()
+html_tag_pattern = re.compile("<.*?>")
+
+# The punctuation stripped from the text, all but the characters of paths, refs and lists
+punctuation_table = str.maketrans(
+    "", "", "".join(sorted(set(string.punctuation) - set("/#_-|.,{}")))
+)
 
-    # List to accumulate the formatted text parts
-    formatted_text_parts = []
 
-    # Check if data is a dictionary
+def clean_text(text: str) -> str:
+    """
+    Remove the HTML tags, the punctuation and the surrounding whitespace of a text.
+    """
+    return html_tag_pattern.sub("", text).translate(punctuation_table).strip()
+
+
+def write_dict_to_text(data) -> str:
+    """
+    Write a minified node as text: a line per key and value, the keys of the
+    nested nodes on their own line followed by their content. Empty lines are left out.
+    """
+    lines = []
+    write_text_lines(data, lines)
+
+    return "\n".join(lines)
+
+
+def write_text_lines(data, lines: list[str]):
+    """
+    Append the lines of `write_dict_to_text` to `lines`, one buffer for the whole tree.
+    """
     if isinstance(data, dict):
-        # Iterate over items in the dictionary
         for key, value in data.items():
-            # Remove HTML tags and punctuation from key
-            key = remove_html_tags_and_punctuation(key)
-
-            # Depending on the data type, write the content
+            key = clean_text(key)
             if isinstance(value, (dict, list)):
-                # Append the key followed by its sub-elements
-                formatted_text_parts.append(key)
-                formatted_text_parts.append(write_dict_to_text(value))
+                if key:
+                    lines.append(key)
+                write_text_lines(value, lines)
+            elif key == "ref":
+                lines.append(f"{key}: #{clean_text(str(value)).split('/')[-1]}")
             else:
-                # Remove HTML tags and punctuation from value
-                value = remove_html_tags_and_punctuation(str(value))
-                # Append the key-value pair
-                if key == "ref":
-                    formatted_text_parts.append(f"{key}: #{value.split('/')[-1]}")
-                else:
-                    formatted_text_parts.append(f"{key}: {value}")
-    # Check if data is a list
+                lines.append(f"{key}: {clean_text(str(value))}")
     elif isinstance(data, list):
-        # Append each element in the list
         for item in data:
-            formatted_text_parts.append(write_dict_to_text(item))
-    # If data is a string or other type
-    else:
-        # Remove HTML tags and punctuation from data
-        data = remove_html_tags_and_punctuation(str(data))
-        # Append the data directly
-        formatted_text_parts.append(data)
+            write_text_lines(item, lines)
+    elif text := clean_text(str(data)):
+        lines.append(text)
 
-    # Join the formatted text parts with a single newline character
-    # but filter out any empty strings before joining
-    return "\n".join(filter(lambda x: x.strip(), formatted_text_parts))
 
+def minify_security(spec) -> tuple[dict, dict]:
+    """
+    Minify the security schemes of the spec and collect its global security scopes.
 
-def minify(spec):
-    server_url = spec["servers"][0]["url"]
-    types = {}
+    :arg spec: The OpenAPI spec.
+
+    :return tuple: The minified security schemes, and the scopes by scheme.
+    """
     defined_security_schemes = spec.get("components", {}).get("securitySchemes", {})
     security_schemes = {}
     security: list[dict[str, list]] = spec.get("security", [])
@@ -420,120 +496,327 @@ def minify(spec):
             for scheme, scopes in item.items():
                 api_security_scopes[scheme] = scopes
 
-    paths_with_metadata = {}
-    for path, methods in spec["paths"].items():
-        paths_with_metadata[path] = {"parameters": [], "endpoints": []}
-        if "parameters" in methods:
-            parameters = methods["parameters"]
-            for parameter in parameters:
-                if isinstance(parameter, dict):
-                    if "$ref" not in parameter:
-                        parameter = remove_empty_keys(parameter)
-                        parameter = remove_unnecessary_keys(parameter)
-                        if "required" in parameter:
-                            parameter["required"] = str(parameter["required"])
-                        else:
-                            parameter["required"] = "False"
-                        parameter = abbreviate(parameter, key_abbreviations)
-                        parameter = write_dict_to_text(parameter)
-                        paths_with_metadata[path]["parameters"].append(parameter)
+    return security_schemes, api_security_scopes
+
+
+def schema_outline(schema):
+    """
+    Get the schema of a parameter or a request body as the types are written: the
+    `$ref` objects replaced by the name of their type (without registering it),
+    cleaned and abbreviated.
+    """
+
+    def names(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return node["$ref"].split("/")[-1]
+            return {
+                key: names(value)
+                for key, value in node.items()
+                if key not in types_keys_to_remove
+            }
+        if isinstance(node, list):
+            return [names(item) for item in node]
+        return node
+
+    return abbreviate(names(schema), types_key_abbreviations)
+
+
+def operation_parameters(parameters, schema_index: SchemaIndex) -> list[dict]:
+    """
+    Get the name, location, requirement and schema of the parameters of an operation.
+
+    :arg parameters: The parameters of the operation or of its path, `$ref` ones included.
+    :arg schema_index: The schema index of the spec, to look up the `$ref` parameters.
+
+    :return list: The parameters, the ones without a name or a location left out.
+    """
+    operation_params = []
+    for parameter in parameters or []:
+        if not isinstance(parameter, dict):
+            continue
+        if "$ref" in parameter:
+            parameter = schema_index.lookup(parameter["$ref"])
+        if "name" not in parameter or "in" not in parameter:
+            continue
+
+        # the swagger 2 parameters have their type inline
+        schema = parameter.get("schema") or {
+            key: parameter[key]
+            for key in ("type", "format", "items", "enum")
+            if key in parameter
+        }
+        operation_params.append(
+            {
+                "name": parameter["name"],
+                "in": parameter["in"],
+                # populate_keys writes the requirement as text
+                "required": parameter.get("required") in (True, "True"),
+                "schema": schema_outline(schema),
+            }
+        )
+
+    return operation_params
+
+
+def operation_request_body(endpoint, openapi_spec) -> dict | None:
+    """
+    Get the JSON schema of the request body of an operation and whether it is required.
+    """
+    request_body = endpoint.get("requestBody")
+    if not isinstance(request_body, dict):
+        return None
+    if "$ref" in request_body:
+        request_body = resolve_refs_request_body(openapi_spec, request_body["$ref"])
+
+    content = (request_body.get("content") or {}).get("application/json")
+    if not content or "schema" not in content:
+        return None
+
+    return {
+        "schema": schema_outline(content["schema"]),
+        "required": request_body.get("required") is True,
+    }
+
+
+def minify_path(path, methods, spec, schema_index: SchemaIndex) -> dict:
+    """
+    Minify the parameters and the endpoints of a path, resolving their types into the schema index.
+
+    :arg path: The path template.
+    :arg methods: The path item of the spec.
+    :arg spec: The OpenAPI spec.
+    :arg schema_index: The schema index of the spec.
+
+    :return dict: The minified parameters and endpoints of the path.
+    """
+    path_data = {"parameters": [], "endpoints": []}
+    path_parameters = operation_parameters(methods.get("parameters"), schema_index)
+    if "parameters" in methods:
+        parameters = methods["parameters"]
+        for parameter in parameters:
+            if isinstance(parameter, dict):
+                if "$ref" not in parameter:
+                    parameter = remove_empty_keys(parameter)
+                    parameter = remove_unnecessary_keys(parameter)
+                    if "required" in parameter:
+                        parameter["required"] = str(parameter["required"])
                     else:
-                        resolve_refs_types(spec, parameter, types)
-                        ref_name = f"#{parameter['$ref'].split('/')[-1]}"
-                        paths_with_metadata[path]["parameters"].append(
-                            f"ref: {ref_name}"
-                        )
+                        parameter["required"] = "False"
+                    parameter = abbreviate(parameter, key_abbreviations)
+                    parameter = write_dict_to_text(parameter)
+                    path_data["parameters"].append(parameter)
+                else:
+                    schema_index.resolve(parameter)
+                    ref_name = f"#{parameter['$ref'].split('/')[-1]}"
+                    path_data["parameters"].append(f"ref: {ref_name}")
+
+    for method, endpoint in methods.items():
+        if method not in methods_to_handle or (
+            endpoint.get("deprecated", False)
+            and not keys_to_keep_or_remove["deprecated"]
+        ):
+            continue
+
+        # The structured parameters and body, before populate_keys rewrites them,
+        # the ones of the operation override the ones of the path
+        endpoint_parameters = {
+            (parameter["name"], parameter["in"]): parameter
+            for parameter in path_parameters
+            + operation_parameters(endpoint.get("parameters"), schema_index)
+        }
+        endpoint_body = operation_request_body(endpoint, spec)
 
-        for method, endpoint in methods.items():
-            if method not in methods_to_handle or (
-                endpoint.get("deprecated", False)
-                and not keys_to_keep_or_remove["deprecated"]
-            ):
-                continue
+        # Populate output list with desired keys
+        extracted_endpoint_data = populate_keys(endpoint, spec)
 
-            # Populate output list with desired keys
-            extracted_endpoint_data = populate_keys(endpoint, spec)
+        # Get types from schemas
+        if keys_to_keep_or_remove["schemas"]:
+            if request_body := extracted_endpoint_data.get("requestBody"):
+                schema_index.resolve(request_body)
 
-            # Get types from schemas
-            if keys_to_keep_or_remove["schemas"]:
-                if request_body := extracted_endpoint_data.get("requestBody"):
-                    resolve_refs_types(spec, request_body, types)
+            if parameters := extracted_endpoint_data.get("parameters"):
+                schema_index.resolve(parameters)
 
-                if parameters := extracted_endpoint_data.get("parameters"):
-                    resolve_refs_types(spec, parameters, types)
+            schema_index.abbreviate_pending()
 
-                if types:
-                    types = abbreviate(types, types_key_abbreviations)
+        # If key == None or key == ''
+        extracted_endpoint_data = remove_empty_keys(extracted_endpoint_data)
 
-            # If key == None or key == ''
-            extracted_endpoint_data = remove_empty_keys(extracted_endpoint_data)
+        # Remove unwanted keys
+        extracted_endpoint_data = remove_unnecessary_keys(extracted_endpoint_data)
 
-            # Remove unwanted keys
-            extracted_endpoint_data = remove_unnecessary_keys(extracted_endpoint_data)
+        # Flattens to remove nested objects where the dict has only one key
+        extracted_endpoint_data = flatten(extracted_endpoint_data)
 
-            # Flattens to remove nested objects where the dict has only one key
-            extracted_endpoint_data = flatten(extracted_endpoint_data)
+        # Abbreviate keys
+        extracted_endpoint_data = abbreviate(extracted_endpoint_data, key_abbreviations)
 
-            # Abbreviate keys
-            extracted_endpoint_data = abbreviate(
-                extracted_endpoint_data, key_abbreviations
-            )
+        tags = endpoint.get("tags")
+        if tags is None:
+            tags = ["default"]
+        else:
+            tags = [tag for tag in tags]
+
+        operation_id = endpoint.get("operationId", "")
+
+        # For each tag, add the finalized endpoint to the corresponding list in the dictionary
+        # for tag in tags:
+        #     endpoints_by_tag[tag].append(extracted_endpoint_data)
+        #
+        #     operation_id = endpoint.get("operationId", "")
+        #
+        #     content_string = write_dict_to_text(extracted_endpoint_data)
+        #
+        #     metadata = {
+        #         "tag": tag,
+        #         "operation_id": operation_id,
+        #         "server_url": f"{server_url}{path}",
+        #     }
+        #     endpoint_dict = {"metadata": metadata, "content": content_string}
+        #
+        #     endpoints_by_tag_metadata[tag].append(endpoint_dict)
+
+        content_string = write_dict_to_text(extracted_endpoint_data)
+
+        metadata = {
+            "security": endpoint.get("security"),
+            "method": method,
+            "tags": tags,
+            "operation_id": operation_id,
+            "summary": endpoint.get("summary"),
+            "parameters": list(endpoint_parameters.values()),
+            "request_body": endpoint_body,
+        }
+        endpoint_dict = {"metadata": metadata, "content": content_string}
 
-            tags = endpoint.get("tags")
-            if tags is None:
-                tags = ["default"]
-            else:
-                tags = [tag for tag in tags]
-
-            operation_id = endpoint.get("operationId", "")
-
-            # For each tag, add the finalized endpoint to the corresponding list in the dictionary
-            # for tag in tags:
-            #     endpoints_by_tag[tag].append(extracted_endpoint_data)
-            #
-            #     operation_id = endpoint.get("operationId", "")
-            #
-            #     content_string = write_dict_to_text(extracted_endpoint_data)
-            #
-            #     metadata = {
-            #         "tag": tag,
-            #         "operation_id": operation_id,
-            #         "server_url": f"{server_url}{path}",
-            #     }
-            #     endpoint_dict = {"metadata": metadata, "content": content_string}
-            #
-            #     endpoints_by_tag_metadata[tag].append(endpoint_dict)
-
-            content_string = write_dict_to_text(extracted_endpoint_data)
-
-            metadata = {
-                "security": endpoint.get("security"),
-                "method": method,
-                "tags": tags,
-                "operation_id": operation_id,
-            }
-            endpoint_dict = {"metadata": metadata, "content": content_string}
+        path_data["endpoints"].append(endpoint_dict)
+
+    return path_data
+
+
+def iter_minified_paths(spec, schema_index: SchemaIndex):
+    """
+    Minify the paths of the spec one at a time.
 
-            paths_with_metadata[path]["endpoints"].append(endpoint_dict)
+    :arg spec: The OpenAPI spec.
+    :arg schema_index: The schema index of the spec, it holds all the types once the paths are exhausted.
+
+    :return Iterator[tuple[str, dict]]: The path templates with their minified data.
+    """
+    for path, methods in spec["paths"].items():
+        yield path, minify_path(path, methods, spec, schema_index)
+
+
+def minify(spec):
+    server_url = spec["servers"][0]["url"]
+    schema_index = SchemaIndex(spec)
+    security_schemes, api_security_scopes = minify_security(spec)
+    paths_with_metadata = dict(iter_minified_paths(spec, schema_index))
 
     return (
         paths_with_metadata,
         server_url,
-        types,
+        schema_index.get_types(),
         api_security_scopes,
         security_schemes,
     )
 
 
+def iter_information(spec, schema_index: SchemaIndex | None = None):
+    """
+    Minify the spec into text one path at a time, so only the current path is held in memory.
+
+    Joined together, the chunks are the text returned by `extract_information`.
+
+    :arg spec: The OpenAPI spec.
+    :arg schema_index: The schema index collecting the types, read them once the chunks are exhausted.
+
+    :return Iterator[str]: The header (base url and security), then the text of each path.
+    """
+    if schema_index is None:
+        schema_index = SchemaIndex(spec)
+    security_schemes, api_security_scopes = minify_security(spec)
+
+    yield format_header(
+        spec["servers"][0]["url"], api_security_scopes, security_schemes
+    )
+    for path, path_data in iter_minified_paths(spec, schema_index):
+        yield format_path(path, path_data)
+
+
+def write_information(spec, file) -> dict:
+    """
+    Write the minified spec to a text file while it is produced.
+
+    :arg spec: The OpenAPI spec.
+    :arg file: The text file object to write to.
+
+    :return dict: The types.
+    """
+    schema_index = SchemaIndex(spec)
+    for chunk in iter_information(spec, schema_index):
+        file.write(chunk)
+
+    return schema_index.get_types()
+
+
 def extract_information(spec):
-    (
-        paths_with_metadata,
-        server_url,
-        types,
-        api_security_scopes,
-        security_schemes,
-    ) = minify(spec)
-    output_string = f"###IMPORTANT: base_url:{server_url}\n---\n"
+    schema_index = SchemaIndex(spec)
+    output_string = "".join(iter_information(spec, schema_index))
+
+    return output_string, schema_index.get_types()
+
+
+def format_header(server_url, api_security_scopes, security_schemes) -> str:
+    parts = [f"###IMPORTANT: base_url:{server_url}\n---\n"]
+
+    if security_schemes:
+        parts.append("###SECURITY SCHEMES\n")
+        for scheme_name, schema_object in security_schemes.items():
+            parts.append(f"-{scheme_name}\n")
+            for key, value in schema_object.items():
+                parts.append(f"{key}: {value}\n")
+
+    if api_security_scopes:
+        parts.append("---\n###SECURITY SCOPES\n")
+        for scheme, scopes in api_security_scopes.items():
+            parts.append(f"{scheme}: {scopes}\n")
+
+    parts.append("---\n###ENDPOINTS\n")
+
+    return "".join(parts)
+
+
+def format_path(path, path_data) -> str:
+    parts = [f"##path: {path}\n"]
+
+    if path_data["parameters"]:
+        parts.append("#parameters\n")
+        for parameter in path_data["parameters"]:
+            parts.append(f"{parameter}\n")
+
+    for endpoint in path_data["endpoints"]:
+        metadata = endpoint.get("metadata")
+        content = endpoint.get("content")
+
+        parts.append(f"#method:{metadata.get('method')}\n")
+        security = metadata.get("security")
+        if security:
+            parts.append("-security\n")
+            for schema in security:
+                for name, scopes in schema.items():
+                    parts.append(f"{name}: {scopes}\n")
+            parts.append("-\n")
+        parts.append(f"{content}\n")
+    parts.append("---\n")
+
+    return "".join(parts)
+
+
+def format_information(
+    paths_with_metadata, server_url, api_security_scopes, security_schemes
+) -> str:
     # for tag, endpoints_with_tag in endpoints_by_tag_metadata.items():
     #     # If we're adding tag descriptions, and they exist they're added here.
     #     tag_description = tag_summary_dict_output.get(tag)
@@ -553,66 +836,63 @@ def extract_information(spec):
     #
     #     output_string += f"{tag_string}\n"
 
-    if security_schemes:
-        output_string += f"###SECURITY SCHEMES\n"
-        for scheme_name, schema_object in security_schemes.items():
-            output_string += f"-{scheme_name}\n"
-            for key, value in schema_object.items():
-                output_string += f"{key}: {value}\n"
+    return format_header(server_url, api_security_scopes, security_schemes) + "".join(
+        format_path(path, path_data) for path, path_data in paths_with_metadata.items()
+    )
 
-    if api_security_scopes:
-        output_string += f"---\n###SECURITY SCOPES\n"
-        for scheme, scopes in api_security_scopes.items():
-            output_string += f"{scheme}: {scopes}\n"
 
-    output_string += f"---\n###ENDPOINTS\n"
-    for path, path_data in paths_with_metadata.items():
-        output_string += f"##path: {path}\n"
+def get_operations(paths_with_metadata) -> dict[str, Operation]:
+    """
+    List the operations of the minified paths.
 
-        if path_data["parameters"]:
-            output_string += f"#parameters\n"
-            for parameter in path_data["parameters"]:
-                output_string += f"{parameter}\n"
+    :arg paths_with_metadata: The minified paths (see `minify`).
 
+    :return dict: The operations keyed by "METHOD path".
+    """
+    operations = {}
+    for path, path_data in paths_with_metadata.items():
         for endpoint in path_data["endpoints"]:
-            metadata = endpoint.get("metadata")
-            content = endpoint.get("content")
-
-            output_string += f"#method:{metadata.get('method')}\n"
-            security = metadata.get("security")
-            if security:
-                output_string += f"-security\n"
-                for schema in security:
-                    for name, scopes in schema.items():
-                        output_string += f"{name}: {scopes}\n"
-                output_string += "-\n"
-            output_string += f"{content}\n"
-        output_string += "---\n"
-
-    # for endpoint in endpoints_with_metadata:
-    #     metadata = endpoint.get("metadata")
-    #     content = endpoint.get("content")
-    #
-    #     output_string += f"-method:{metadata.get('method')}\n"
-    #     security = metadata.get("security")
-    #     if security:
-    #         output_string += f"-security\n"
-    #         for schema in security:
-    #             for name, scopes in schema.items():
-    #                 output_string += f"{name}: {scopes}\n"
-    #     output_string += f"{content}\n---\n"
+            metadata = endpoint["metadata"]
+            key = f"{metadata['method'].upper()} {path}"
+            operations[key] = {
+                "path": path,
+                "method": metadata["method"],
+                "operation_id": metadata["operation_id"],
+                "content": endpoint["content"],
+                "security": metadata["security"],
+                "path_parameters": path_data["parameters"],
+            }
+
+    return operations
+
+
+def filter_paths(paths_with_metadata: dict, keys: list[str]) -> dict:
+    """
+    Keep only the given operations of the minified paths.
+
+    :param paths_with_metadata: The minified paths (see `minify`).
+    :param keys: The "METHOD path" keys of the operations to keep.
+    :return: The minified paths of the operations.
+    """
+    keys = set(keys)
+    filtered = {}
+    for path, path_data in paths_with_metadata.items():
+        endpoints = [
+            endpoint
+            for endpoint in path_data["endpoints"]
+            if f"{endpoint['metadata']['method'].upper()} {path}" in keys
+        ]
+        if endpoints:
+            filtered[path] = {
+                "parameters": path_data["parameters"],
+                "endpoints": endpoints,
+            }
 
-    return output_string, types
+    return filtered
 
 
 def load_file(file_path: Path | str) -> dict:
-    with open(file_path, "r", encoding="utf-8") as file:
-        if file_path.suffix == ".json":
-            return json.load(file)
-        elif file_path.suffix in {".yaml", ".yml"}:
-            return yaml.safe_load(file)
-        else:
-            raise ValueError(f"Unsupported file format for {file_path}")
+    return load_spec(file_path)
 
 
 def process_file(spec: dict) -> tuple[str, dict]:
@@ -626,6 +906,38 @@ def process_file(spec: dict) -> tuple[str, dict]:
     return extract_information(spec)
 
 
+def get_minified_api(file_path: Path) -> MinifiedApi:
+    """
+    Load, validate and minify the OpenAPI spec file, keeping the per-path data.
+
+    Args:
+    file_path: The file path to the OpenAPI spec.
+
+    Returns:
+        MinifiedApi: The OpenAPI spec as a string, the types, and the minified paths.
+    """
+    file = load_file(file_path)
+    validate_openapi_spec(file)
+    (
+        paths_with_metadata,
+        server_url,
+        types,
+        api_security_scopes,
+        security_schemes,
+    ) = minify(file)
+
+    return {
+        "api_spec": format_information(
+            paths_with_metadata, server_url, api_security_scopes, security_schemes
+        ),
+        "types": types,
+        "paths": paths_with_metadata,
+        "server_url": server_url,
+        "api_security_scopes": api_security_scopes,
+        "security_schemes": security_schemes,
+    }
+
+
 def get_api_data(file_path: Path) -> tuple[str, dict]:
     """
     Load, validate and process the OpenAPI spec file.
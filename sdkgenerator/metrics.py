@@ -0,0 +1,310 @@
+import atexit
+import math
+import threading
+from pathlib import Path
+
+from sdkgenerator.config import PRICING, TELEMETRY
+from sdkgenerator.constants import METRICS_FILE
+from sdkgenerator.scheduler import get_scheduler
+from sdkgenerator.types import Step
+
+# Seconds, from a cached response to a long completion
+latency_buckets = (0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+size_buckets = tuple(4**exponent for exponent in range(12))
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple, **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{name}="{escape_label(v)}"' for name, v in pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
+
+
+class Metric:
+    """
+    A metric with labels, rendered in the Prometheus text format.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def label_values(self, labels: dict) -> tuple:
+        if labels.keys() != set(self.labels):
+            raise ValueError(f"{self.name} takes the labels {self.labels}")
+
+        return tuple(labels[name] for name in self.labels)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join(
+            [
+                f"# HELP {self.name} {self.documentation}",
+                f"# TYPE {self.name} {self.kind}",
+                *self.samples(),
+            ]
+        )
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.label_values(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{format_labels(self.labels, key)} {format_value(value)}"
+                for key, value in sorted(self.values.items())
+            ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = latency_buckets,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # per label values: the count of each bucket (not cumulative), the sum and the count
+        self.values: dict[tuple, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self.label_values(labels)
+        with self._lock:
+            counts, total, count = self.values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            counts[
+                next(i for i, bound in enumerate(self.buckets) if value <= bound)
+            ] += 1
+            self.values[key] = counts, total + value, count + 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = format_labels(self.labels, key, le=format_value(bound))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+
+        return lines
+
+
+llm_requests = Counter(
+    "sdkgen_llm_requests_total",
+    "LLM calls by step, model and outcome (success, cached or error).",
+    ("step", "model", "outcome"),
+)
+llm_request_seconds = Histogram(
+    "sdkgen_llm_request_seconds",
+    "Latency of the LLM calls, including the queueing and the retries.",
+    ("step", "model"),
+)
+llm_tokens = Counter(
+    "sdkgen_llm_tokens_total",
+    "Tokens of the LLM calls, by kind (prompt or completion).",
+    ("step", "model", "kind"),
+)
+llm_cost = Counter(
+    "sdkgen_llm_cost_usd_total",
+    "Estimated cost of the LLM calls in USD, from the PRICING config.",
+    ("step", "model"),
+)
+node_seconds = Histogram(
+    "sdkgen_pipeline_node_seconds",
+    "Duration of the pipeline nodes.",
+    ("node",),
+)
+sdk_seconds = Histogram(
+    "sdkgen_sdk_seconds",
+    "Duration of the generation of an SDK, by outcome (success or error).",
+    ("outcome",),
+)
+minify_seconds = Histogram(
+    "sdkgen_minify_seconds",
+    "Duration of the loading and the minification of a spec.",
+)
+spec_bytes = Histogram(
+    "sdkgen_spec_bytes",
+    "Size of the spec files.",
+    buckets=tuple(1024 * size for size in size_buckets),
+)
+spec_operations = Histogram(
+    "sdkgen_spec_operations",
+    "Operations of the specs.",
+    buckets=size_buckets,
+)
+spec_types = Histogram(
+    "sdkgen_spec_types",
+    "Types of the minified specs.",
+    buckets=size_buckets,
+)
+spec_prompt_tokens = Histogram(
+    "sdkgen_spec_prompt_tokens",
+    "Prompt tokens of each step for a spec, from the budget report.",
+    ("step",),
+    buckets=tuple(256 * size for size in size_buckets[:8]),
+)
+code_check_decisions = Counter(
+    "sdkgen_code_checks_total",
+    "Static checks of the initial code, by decision (skip or feedback on the defects).",
+    ("decision",),
+)
+repaired_operations = Counter(
+    "sdkgen_repaired_operations_total",
+    "Operations whose method was regenerated after the final code, by outcome (repaired or failed).",
+    ("outcome",),
+)
+history_tokens_saved = Counter(
+    "sdkgen_history_tokens_saved_total",
+    "Prompt tokens saved by sending outlines of the spec and the types in the histories.",
+    ("step",),
+)
+
+registry: list[Metric] = [
+    llm_requests,
+    llm_request_seconds,
+    llm_tokens,
+    llm_cost,
+    node_seconds,
+    sdk_seconds,
+    minify_seconds,
+    spec_bytes,
+    spec_operations,
+    spec_types,
+    spec_prompt_tokens,
+    code_check_decisions,
+    repaired_operations,
+    history_tokens_saved,
+]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimate the cost of a call in USD from the prices per million tokens of PRICING.
+    """
+    price = PRICING.get(model) or PRICING.get("default")
+    if not price:
+        return 0.0
+
+    return (
+        prompt_tokens * price["prompt"] + completion_tokens * price["completion"]
+    ) / 1_000_000
+
+
+def record_llm_call(
+    step: Step,
+    model: str,
+    *,
+    outcome: str,
+    seconds: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> float:
+    """
+    Record an LLM call in the metrics.
+
+    :return: The estimated cost of the call.
+    """
+    llm_requests.inc(step=step, model=model, outcome=outcome)
+    llm_request_seconds.observe(seconds, step=step, model=model)
+    if outcome != "success":
+        return 0.0
+
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+    llm_tokens.inc(prompt_tokens, step=step, model=model, kind="prompt")
+    llm_tokens.inc(completion_tokens, step=step, model=model, kind="completion")
+    llm_cost.inc(cost, step=step, model=model)
+
+    return cost
+
+
+def scheduler_samples() -> list[str]:
+    # rendered from the scheduler stats, which already count everything
+    stats = get_scheduler().stats()
+    lines = []
+    for key, kind, documentation in [
+        ("throttled", "counter", "LLM calls that waited for the rate limits."),
+        ("throttle_seconds", "counter", "Time spent waiting for the rate limits."),
+        ("rate_limited", "counter", "LLM calls answered with a 429."),
+        ("retries", "counter", "Retried LLM calls."),
+        ("queue_depth", "gauge", "LLM calls waiting for the rate limits."),
+    ]:
+        name = f"sdkgen_scheduler_{key}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        lines += [
+            f"{name}{format_labels(('model',), (model,))} {format_value(values[key])}"
+            for model, values in sorted(stats.items())
+        ]
+
+    return lines
+
+
+def render_metrics() -> str:
+    """
+    Render all the metrics in the Prometheus text exposition format.
+    """
+    parts = [metric.render() for metric in registry]
+    parts.append("\n".join(scheduler_samples()))
+
+    return "\n".join(parts) + "\n"
+
+
+def write_metrics(path: Path = METRICS_FILE) -> Path:
+    """
+    Write the metrics to a file, e.g. for the textfile collector of the node exporter.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(render_metrics())
+    tmp_path.replace(path)
+
+    return path
+
+
+def write_metrics_at_exit():
+    if any(metric.values for metric in registry):
+        write_metrics()
+
+
+if TELEMETRY["metrics"]:
+    atexit.register(write_metrics_at_exit)
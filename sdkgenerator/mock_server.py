@@ -0,0 +1,620 @@
+import argparse
+import ast
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
+
+from sdkgenerator.cache import cache_key, request_conversation
+from sdkgenerator.calllog import iter_call_logs, open_segment
+from sdkgenerator.config import MOCK_SERVER
+from sdkgenerator.constants import EDEN_AI_API, OPENAI_API
+from sdkgenerator.types import LatencyConfig, LlmCallLog, MockServerConfig, Provider
+from sdkgenerator.utils import code_block_pattern
+
+# The mock serves the same paths as the providers, see utils.get_llm_endpoint
+routes: dict[str, Provider] = {
+    urlsplit(OPENAI_API).path: "openai",
+    urlsplit(EDEN_AI_API).path: "edenai",
+    urlsplit(EDEN_AI_API).path + "/stream": "edenai",
+}
+
+# Characters sent in each event of a streamed response
+stream_chunk_chars = 16
+
+
+def sample_latency(config: LatencyConfig, rng: random.Random) -> float:
+    """
+    Draw the latency of a response, in seconds, before the per token delay.
+    """
+    distribution = config["distribution"]
+    mean, stddev = config["mean"], config["stddev"]
+
+    if distribution == "fixed":
+        return mean
+    if distribution == "uniform":
+        # same mean and standard deviation as the other distributions
+        half_width = stddev * math.sqrt(3)
+        return max(rng.uniform(mean - half_width, mean + half_width), 0)
+    if distribution == "normal":
+        return max(rng.gauss(mean, stddev), 0)
+    if distribution == "lognormal":
+        if mean <= 0:
+            return 0
+        sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+        return rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+    if distribution == "exponential":
+        return rng.expovariate(1 / mean) if mean > 0 else 0
+
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+
+def estimate_tokens(text: str) -> int:
+    # the server must not depend on the tokenizers, ~4 characters per token is enough
+    return max(len(text) // 4, 1)
+
+
+def snake_case(name: str) -> str:
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name)
+    return re.sub(r"\W+", "_", name).strip("_").lower() or "call"
+
+
+def canned_client(prompt: str) -> str | None:
+    """
+    Write a client with one method per operation of the minified spec in the prompt.
+    """
+    methods = []
+    path = method = None
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line.startswith("##path: "):
+            path = line.removeprefix("##path: ")
+        elif line.startswith("#method:"):
+            method = line.removeprefix("#method:")
+        elif line.startswith("opid: ") and path and method:
+            operation_id = line.removeprefix("opid: ")
+            arguments = "".join(
+                f", {snake_case(name)}" for name in re.findall(r"\{(\w+)\}", path)
+            )
+            url = re.sub(r"\{(\w+)\}", lambda m: "{" + snake_case(m[1]) + "}", path)
+            methods.append(
+                f"    def {snake_case(operation_id)}(self{arguments}, data=None):\n"
+                f'        """Call {operation_id}."""\n'
+                f'        url = f"{{self.base_url}}{url}"\n'
+                f'        return self._make_authenticated_request("{method.upper()}", url, json=data)\n'
+            )
+
+    if not methods:
+        return None
+
+    return (
+        "import requests\n"
+        "from types import *\n\n\n"
+        "class Client:\n"
+        "    def __init__(self, api_key, base_url=None):\n"
+        "        self.api_key = api_key\n"
+        '        self.base_url = base_url or ""\n\n'
+        "    def _make_authenticated_request(self, method, url, **kwargs):\n"
+        '        """Send a request with the api key."""\n'
+        '        headers = {"Authorization": f"Bearer {self.api_key}"}\n'
+        "        return requests.request(method, url, headers=headers, **kwargs)\n\n"
+        + "\n".join(methods)
+    )
+
+
+def canned_method_names(prompt: str) -> str | None:
+    """
+    Name the methods listed in the prompt (`name | METHOD path | summary`) after
+    their summary, with the summary as their docstring.
+    """
+    if not prompt.lstrip().startswith("Name the methods"):
+        return None
+
+    lines = []
+    for line in prompt.splitlines():
+        parts = [part.strip().strip('"') for part in line.split("|")]
+        if len(parts) == 3 and parts[0].isidentifier():
+            name, _, summary = parts
+            lines.append(f"{name}: {snake_case(summary) or name}: {summary}")
+
+    return "\n".join(lines)
+
+
+def canned_auth(prompt: str) -> str | None:
+    """
+    Write the authentication methods of a client, with a bearer token.
+    """
+    if not prompt.lstrip().startswith("Write the authentication"):
+        return None
+
+    base_url = re.search(r"base_url: (\S*)", prompt)
+    return (
+        "import requests\n\n\n"
+        "class Client:\n"
+        f'    def __init__(self, token: str, base_url: str = "{base_url[1] if base_url else ""}"):\n'
+        "        self.base_url = base_url\n"
+        "        self.token = token\n\n"
+        "    def _make_authenticated_request(self, method, endpoint, **kwargs):\n"
+        '        headers = {**kwargs.pop("headers", {}), "Authorization": f"Bearer {self.token}"}\n'
+        '        return requests.request(method, f"{self.base_url}{endpoint}", headers=headers, **kwargs)\n'
+    )
+
+
+def canned_types(prompt: str) -> str | None:
+    """
+    Write a TypedDict per type of the types dict in the prompt.
+    """
+    match = re.search(r'"""([\s\S]*?)"""', prompt)
+    if match is None:
+        return None
+
+    try:
+        types = ast.literal_eval(match[1].strip())
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    if not isinstance(types, dict) or not types:
+        return None
+
+    classes = []
+    for name, schema in types.items():
+        # the minified types name the properties "props"
+        properties = (
+            schema.get("props", schema.get("properties"))
+            if isinstance(schema, dict)
+            else None
+        )
+        fields = [
+            f"    {snake_case(field)}: Any\n" for field in (properties or {})
+        ] or ["    pass\n"]
+        class_name = re.sub(r"\W", "_", name)
+        classes.append(f"class {class_name}(TypedDict):\n" + "".join(fields))
+
+    return "from typing import Any, TypedDict\n\n\n" + "\n\n".join(classes)
+
+
+def conversation_code(messages: list[dict]) -> str | None:
+    """
+    Find the last code written by the assistant in the conversation, fenced or in
+    the triple quotes of the history sent to the final step.
+    """
+    for message in reversed(messages):
+        if message["role"] != "assistant":
+            continue
+
+        if blocks := code_block_pattern.findall(message["content"]):
+            return blocks[-1][1].strip()
+        if match := re.search(r"'''([\s\S]+?)'''", message["content"]):
+            return match[1].strip()
+
+    return None
+
+
+def canned_message(messages: list[dict]) -> str:
+    """
+    Answer a prompt of the pipeline with a plausible, deterministic message: a
+    client for the code steps, the types for the types step, a review for the
+    feedback step, the code of the conversation for the final step, and the
+    method names and the authentication methods of a rendered SDK.
+    """
+    prompt = messages[-1]["content"]
+
+    if prompt.lstrip().lower().startswith("write feedback"):
+        return (
+            "The code looks correct. Add a oneline docstring to every method and "
+            "make sure every endpoint of the API is implemented."
+        )
+
+    if (names := canned_method_names(prompt)) is not None:
+        return names
+
+    if (code := canned_auth(prompt)) is not None:
+        return f"```python\n{code}```"
+
+    if (code := canned_client(prompt)) is not None:
+        return f"```python\n{code}```"
+
+    if (code := conversation_code(messages[:-1])) is not None:
+        return f"```python\n{code}\n```"
+
+    if (code := canned_types(prompt)) is not None:
+        return f"```python\n{code}```"
+
+    return "```python\npass\n```"
+
+
+def format_response(provider: Provider, body: dict, message: str) -> dict:
+    """
+    Wrap a message in the response format of the provider.
+    """
+    _, messages = request_conversation(body)
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+    completion_tokens = estimate_tokens(message)
+
+    if provider == "openai":
+        return {
+            "id": "chatcmpl-mock-"
+            + hashlib.sha1(message.encode("utf-8")).hexdigest()[:24],
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": message},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    return {
+        "openai": {
+            "status": "success",
+            "generated_text": message,
+            "message": [
+                {"role": "user", "message": body["text"]},
+                {"role": "assistant", "message": message},
+            ],
+            "cost": 0,
+        }
+    }
+
+
+def response_message(provider: Provider, data: dict) -> str:
+    """
+    Get the message of a response of the provider.
+    """
+    if provider == "openai":
+        return data["choices"][0]["message"]["content"]
+
+    return data["openai"].get("generated_text") or ""
+
+
+def stream_events(
+    provider: Provider, message: str, usage: dict | None = None
+) -> Iterator[tuple[str, dict]]:
+    """
+    Split a message into the stream events of the provider.
+
+    :return: The pieces of the message and their events.
+    """
+    for start in range(0, len(message), stream_chunk_chars):
+        piece = message[start : start + stream_chunk_chars]
+        if provider == "openai":
+            event = {
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {"index": 0, "delta": {"content": piece}, "finish_reason": None}
+                ],
+            }
+        else:
+            event = {"text": piece}
+        yield piece, event
+
+    if provider == "openai":
+        yield "", {
+            "object": "chat.completion.chunk",
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        if usage:
+            yield "", {"object": "chat.completion.chunk", "choices": [], "usage": usage}
+
+
+def provider_of(payload: dict) -> Provider:
+    return "openai" if "messages" in payload else "edenai"
+
+
+def replay_key(provider: Provider, body: dict) -> str | None:
+    """
+    Key a request on its provider and its content (not on the url it was sent to).
+    """
+    try:
+        return cache_key(provider, body)
+    except (KeyError, TypeError):
+        return None
+
+
+def iter_replay_records(source: str | Path) -> Iterable[LlmCallLog]:
+    """
+    Read the logged LLM calls to replay: a call log directory, a JSONL file
+    (e.g. a mongoexport of the responses collection) or "mongodb".
+    """
+    if source == "mongodb":
+        from sdkgenerator.db import get_db
+
+        yield from get_db()["responses"].find({}, {"_id": 0})
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        yield from iter_call_logs(path)
+        return
+
+    with open_segment(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_replays(source: str | Path) -> dict[str, dict]:
+    """
+    Index the logged responses on their request, the last one winning.
+    """
+    replays = {}
+    for record in iter_replay_records(source):
+        payload, response = record.get("payload"), record.get("response")
+        if not payload or not response:
+            continue
+
+        key = replay_key(provider_of(payload), payload)
+        if key is not None:
+            replays[key] = response
+
+    print(f"Loaded {len(replays)} responses to replay from {source}.")
+    return replays
+
+
+class MockLlmServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the OpenAI chat completions and Eden AI /v2/text/chat
+    endpoints, to run the pipeline offline.
+
+    Every request waits for a latency drawn from the configured distribution and
+    may be answered with an injected 500 or 429. The draws only depend on the seed,
+    the request body and how many times that body was received, so a load test
+    replays the same way whatever the interleaving of the requests.
+
+    The responses are replayed from the logged LLM calls when `replay` is set,
+    and canned otherwise (see `canned_message`). Streaming requests get the
+    message as server-sent events.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, config: MockServerConfig, replays: dict[str, dict] = None):
+        self.config = config
+        self.replays = replays or {}
+        self.stats: Counter[str] = Counter()
+        self._seen: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        super().__init__((config["host"], config["port"]), MockLlmHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def request_rng(self, raw_body: bytes) -> random.Random:
+        digest = hashlib.sha256(raw_body).hexdigest()
+        with self._lock:
+            self._seen[digest] += 1
+            occurrence = self._seen[digest]
+
+        return random.Random(f"{self.config['seed']}:{digest}:{occurrence}")
+
+    def count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class MockLlmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockLlmServer
+
+    def do_GET(self):
+        if self.path != "/stats":
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        with self.server._lock:
+            stats = dict(self.server.stats)
+        self.send_json(200, stats)
+
+    def do_POST(self):
+        raw_body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        provider = routes.get(self.path)
+        if provider is None:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        config = self.server.config
+        self.server.count("requests")
+        rng = self.server.request_rng(raw_body)
+        latency = sample_latency(config["latency"], rng)
+
+        # draw both to keep the sequence of draws independent of the outcome
+        error_draw, rate_limit_draw = rng.random(), rng.random()
+        if rate_limit_draw < config["rate_limit_rate"]:
+            self.server.count("rate_limited")
+            self.send_json(
+                429,
+                {"error": {"message": "Rate limit reached.", "type": "requests"}},
+                headers={"Retry-After": str(math.ceil(config["retry_after"]))},
+            )
+            return
+
+        time.sleep(latency)
+        if error_draw < config["error_rate"]:
+            self.server.count("errors")
+            self.send_json(500, {"error": {"message": "Injected server error."}})
+            return
+
+        try:
+            body = json.loads(raw_body)
+            _, messages = request_conversation(body)
+        except (ValueError, KeyError, TypeError) as e:
+            self.server.count("bad_requests")
+            self.send_json(400, {"error": {"message": f"Invalid request: {e}"}})
+            return
+
+        key = replay_key(provider, body)
+        data = self.server.replays.get(key) if key is not None else None
+        if data is not None:
+            self.server.count("replayed")
+            message = response_message(provider, data)
+        elif self.server.replays and config["on_miss"] == "error":
+            self.server.count("replay_misses")
+            self.send_json(404, {"error": {"message": "No response to replay."}})
+            return
+        else:
+            self.server.count("canned")
+            message = canned_message(messages)
+            data = format_response(provider, body, message)
+
+        if body.get("stream") or self.path.endswith("/stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage")
+            self.send_stream(
+                stream_events(
+                    provider, message, data.get("usage") if include_usage else None
+                )
+            )
+            return
+
+        time.sleep(config["latency"]["per_token"] * estimate_tokens(message))
+        self.send_json(200, data)
+
+    def send_stream(self, events: Iterable[tuple[str, dict]]):
+        """
+        Send server-sent events, each after the per token latency of its piece.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        per_token = self.server.config["latency"]["per_token"]
+        try:
+            for piece, event in events:
+                if piece:
+                    time.sleep(per_token * estimate_tokens(piece))
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # the client aborted the stream
+            self.server.count("aborted")
+
+    def send_json(self, status: int, data: dict, headers: dict = None):
+        content = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def create_mock_server(**overrides) -> MockLlmServer:
+    """
+    Create the mock server from the MOCK_SERVER config.
+
+    :param overrides: Config keys to override, e.g. port=0 for a free port.
+    :return: The server, not serving yet.
+    """
+    config: MockServerConfig = {**MOCK_SERVER, **overrides}
+    if "latency" in overrides:
+        config["latency"] = {**MOCK_SERVER["latency"], **overrides["latency"]}
+
+    replays = load_replays(config["replay"]) if config["replay"] else None
+    return MockLlmServer(config, replays)
+
+
+def start_mock_server(**overrides) -> MockLlmServer:
+    """
+    Start the mock server in a background thread (see `create_mock_server`).
+
+    :return: The running server, stopped with `shutdown()`.
+    """
+    server = create_mock_server(**overrides)
+    threading.Thread(
+        target=server.serve_forever, name="mock-llm-server", daemon=True
+    ).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the LLM providers."
+    )
+    parser.add_argument("--host", default=MOCK_SERVER["host"])
+    parser.add_argument("--port", type=int, default=MOCK_SERVER["port"])
+    parser.add_argument("--seed", type=int, default=MOCK_SERVER["seed"])
+    parser.add_argument(
+        "--distribution",
+        default=MOCK_SERVER["latency"]["distribution"],
+        choices=["fixed", "uniform", "normal", "lognormal", "exponential"],
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=MOCK_SERVER["latency"]["mean"],
+        help="Mean latency in seconds.",
+    )
+    parser.add_argument(
+        "--stddev", type=float, default=MOCK_SERVER["latency"]["stddev"]
+    )
+    parser.add_argument(
+        "--per-token", type=float, default=MOCK_SERVER["latency"]["per_token"]
+    )
+    parser.add_argument("--error-rate", type=float, default=MOCK_SERVER["error_rate"])
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=MOCK_SERVER["rate_limit_rate"]
+    )
+    parser.add_argument("--retry-after", type=float, default=MOCK_SERVER["retry_after"])
+    parser.add_argument(
+        "--replay",
+        default=MOCK_SERVER["replay"],
+        help='A call log directory, a JSONL file of responses or "mongodb".',
+    )
+    parser.add_argument(
+        "--on-miss", default=MOCK_SERVER["on_miss"], choices=["canned", "error"]
+    )
+    args = parser.parse_args()
+
+    server = create_mock_server(
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        latency={
+            "distribution": args.distribution,
+            "mean": args.latency,
+            "stddev": args.stddev,
+            "per_token": args.per_token,
+        },
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        replay=args.replay,
+        on_miss=args.on_miss,
+    )
+    print(f"Mock LLM server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
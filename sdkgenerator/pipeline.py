@@ -0,0 +1,158 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable
+
+from sdkgenerator.metrics import node_seconds
+from sdkgenerator.tracing import span
+from sdkgenerator.types import NodeTiming
+
+# When set, every pipeline run appends the timing of its nodes to this list (used by batch runs)
+node_timings: ContextVar[list[NodeTiming] | None] = ContextVar(
+    "node_timings", default=None
+)
+
+
+class PipelineNode:
+    """
+    A step of a pipeline. `run` is called with the values of the inputs as keyword
+    arguments and returns a dict with the values of the outputs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[..., dict[str, Any]],
+        *,
+        inputs: tuple[str, ...] = (),
+        outputs: tuple[str, ...],
+    ):
+        self.name = name
+        self.run = run
+        self.inputs = inputs
+        self.outputs = outputs
+
+    def __repr__(self):
+        return (
+            f"PipelineNode({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+        )
+
+
+class Pipeline:
+    """
+    A DAG of steps connected by the names of their inputs and outputs.
+
+    A node starts as soon as all its inputs are available, so the nodes that
+    don't depend on each other run concurrently.
+    """
+
+    def __init__(self, nodes: list[PipelineNode]):
+        names = [node.name for node in nodes]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate pipeline nodes: {names}")
+
+        produced: dict[str, str] = {}
+        for node in nodes:
+            for output in node.outputs:
+                if output in produced:
+                    raise ValueError(
+                        f"{output} is produced by both {produced[output]} and {node.name}"
+                    )
+                produced[output] = node.name
+
+        self.nodes = nodes
+        self.timings: list[NodeTiming] = []
+
+    def run(self, values: dict[str, Any], *, workers: int) -> dict[str, Any]:
+        """
+        Run the pipeline.
+
+        The timings of the nodes are kept in `timings`, and appended to
+        `node_timings` if set.
+
+        :param values: The inputs of the pipeline.
+        :param workers: The number of nodes run at the same time.
+        :raises ValueError: If some inputs are never produced (or the nodes form a cycle).
+        :raises Exception: The first error of a node, once the running nodes are done.
+        :return: The inputs and the outputs of every node.
+        """
+        values = dict(values)
+        pending = list(self.nodes)
+        running: dict[Future, PipelineNode] = {}
+        timings: list[NodeTiming] = []
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                ready = [
+                    node
+                    for node in pending
+                    if all(name in values for name in node.inputs)
+                ]
+                for node in ready:
+                    pending.remove(node)
+                    arguments = {name: values[name] for name in node.inputs}
+                    # run in a copy of the current context so step timings keep being recorded
+                    future = executor.submit(
+                        copy_context().run, timed_run, node, arguments
+                    )
+                    running[future] = node
+
+                if not running:
+                    raise ValueError(
+                        "The inputs of "
+                        + ", ".join(node.name for node in pending)
+                        + " are never produced."
+                    )
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    outputs, node_start, seconds = future.result()
+
+                    missing = set(node.outputs) - outputs.keys()
+                    if missing:
+                        raise ValueError(f"{node.name} did not produce {missing}")
+
+                    values.update(outputs)
+                    timings.append(
+                        {
+                            "node": node.name,
+                            "start": node_start - start,
+                            "seconds": seconds,
+                        }
+                    )
+
+        self.timings = timings
+        collected = node_timings.get()
+        if collected is not None:
+            collected.extend(timings)
+
+        return values
+
+
+def timed_run(
+    node: PipelineNode, arguments: dict[str, Any]
+) -> tuple[dict[str, Any], float, float]:
+    start = time.perf_counter()
+    with span(node.name):
+        outputs = node.run(**arguments)
+    seconds = time.perf_counter() - start
+    node_seconds.observe(seconds, node=node.name)
+
+    return outputs, start, seconds
+
+
+def format_node_timings(timings: list[NodeTiming]) -> str:
+    """
+    Format the timings of a pipeline run as one line per node, in start order.
+    """
+    lines = []
+    for timing in sorted(timings, key=lambda timing: timing["start"]):
+        end = timing["start"] + timing["seconds"]
+        lines.append(
+            f"{timing['node']:<16}{timing['start']:>8.2f}s -> {end:>7.2f}s"
+            f"{timing['seconds']:>9.2f}s"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,478 @@
+import ast
+import json
+import keyword
+import re
+import textwrap
+
+from sdkgenerator.codeedit import get_functions, merge_imports, to_snake_case
+from sdkgenerator.manifier import html_tag_pattern
+from sdkgenerator.typegen import (
+    TypesCompiler,
+    UnsupportedSchema,
+    is_identifier,
+    pascal_case,
+)
+from sdkgenerator.types import MinifiedApi, RenderedOperation
+
+# The names used in the bodies of the methods, which the arguments can't shadow
+method_locals = {
+    "self",
+    "endpoint",
+    "params",
+    "headers",
+    "cookies",
+    "data",
+    "requests",
+}
+
+# The methods of the client class that aren't endpoints
+client_methods = {"__init__", "_make_authenticated_request"}
+
+# Where the request arguments of each parameter location go
+parameter_kwargs = {
+    "query": "params",
+    "header": "headers",
+    "cookie": "cookies",
+    "formData": "data",
+}
+
+line_length = 88
+
+path_param_pattern = re.compile(r"\{([^}]*)\}")
+
+# A line of the method names answer: `current_name: new_name: docstring`
+method_name_pattern = re.compile(
+    r"^[\s\-*`]*([A-Za-z_]\w*)`?\s*:\s*`?([A-Za-z_]\w*)`?\s*:\s*(.+?)[\s`]*$"
+)
+
+
+class AnnotationCompiler(TypesCompiler):
+    """
+    Write the annotations of the method arguments: the types of the types module
+    by their name, the inline objects as dicts, and Any for the schemas the types
+    don't define.
+    """
+
+    def reference(self, name: str) -> str:
+        # the SDK imports the whole types module, the annotations aren't evaluated
+        return super().reference(name).strip('"')
+
+    def inline_class(self, schema: dict, hint: str, blocks: list[str]) -> str:
+        return f"{self.use('Dict')}[str, {self.use('Any')}]"
+
+    def annotation(self, schema) -> str:
+        try:
+            return self.expression(schema, "", [])
+        except (UnsupportedSchema, RecursionError):
+            return self.use("Any")
+
+
+def client_class_name(api_spec_name: str) -> str:
+    class_name = pascal_case(api_spec_name) + "Client"
+    return class_name if is_identifier(class_name) else "Api" + class_name
+
+
+def unique(name: str, taken: set[str]) -> str:
+    if keyword.iskeyword(name):
+        name += "_"
+    elif not name.isidentifier():
+        name = f"param_{name}".rstrip("_")
+    while name in taken:
+        name += "_"
+    taken.add(name)
+
+    return name
+
+
+def method_docstring(summary: str | None, method: str, path: str) -> str:
+    text = " ".join(html_tag_pattern.sub("", summary or "").split())
+    if not text:
+        text = f"{method.upper()} {path}"
+    text = text.replace("\\", "\\\\").replace('"""', '\\"\\"\\"')
+
+    return text if text.endswith((".", "!", "?")) else text + "."
+
+
+def get_rendered_operations(minified: MinifiedApi) -> list[RenderedOperation]:
+    """
+    List the operations of the minified spec with the default name and docstring
+    of their method: the operationId in snake case (the method and the path
+    without one) and the summary.
+    """
+    operations: list[RenderedOperation] = []
+    taken = set(client_methods)
+    for path, path_data in minified["paths"].items():
+        for endpoint in path_data["endpoints"]:
+            metadata = endpoint["metadata"]
+            method = metadata["method"]
+            name = to_snake_case(metadata.get("operation_id") or "")
+            if not name or name[0].isdigit():
+                name = to_snake_case(f"{method} {path}") or method
+            operations.append(
+                {
+                    "key": f"{method.upper()} {path}",
+                    "path": path,
+                    "method": method,
+                    "name": unique(name, taken),
+                    "docstring": method_docstring(
+                        metadata.get("summary"), method, path
+                    ),
+                    "parameters": metadata.get("parameters", []),
+                    "request_body": metadata.get("request_body"),
+                }
+            )
+
+    return operations
+
+
+def format_brackets(
+    head: str,
+    items: list[str],
+    tail: str,
+    *,
+    indent: str,
+    brackets: str = "()",
+) -> list[str]:
+    """
+    Format `head(items)tail` as black does: on one line if it fits, else with the
+    items on their own line (not for the dicts), else with one item per line.
+    """
+    opening, closing = brackets
+    line = f"{indent}{head}{opening}{', '.join(items)}{closing}{tail}"
+    if len(line) <= line_length or not items:
+        return [line]
+
+    inner = f"{indent}    {', '.join(items)}"
+    if brackets == "()" and len(inner) <= line_length:
+        return [f"{indent}{head}{opening}", inner, f"{indent}{closing}{tail}"]
+
+    return (
+        [f"{indent}{head}{opening}"]
+        + [f"{indent}    {item}," for item in items]
+        + [f"{indent}{closing}{tail}"]
+    )
+
+
+def format_assignment(name: str, value: str, *, indent: str) -> list[str]:
+    """
+    Format `name = value` as black does: in parentheses when only that makes it fit.
+    """
+    line = f"{indent}{name} = {value}"
+    if len(line) <= line_length or len(indent) + 4 + len(value) > line_length:
+        return [line]
+
+    return [f"{indent}{name} = (", f"{indent}    {value}", f"{indent})"]
+
+
+def render_method(
+    operation: RenderedOperation, annotations: AnnotationCompiler
+) -> list[str]:
+    """
+    Render the method of an operation: the path parameters in the endpoint, the
+    query, header, cookie and form parameters in the request arguments, and the
+    JSON body (or the body parameter of a swagger 2 spec) as `json`.
+    """
+    taken = set(method_locals)
+    required: list[str] = []
+    optional: list[str] = []
+    path_arguments: dict[str, str] = {}
+    kwargs_entries: dict[str, list[tuple[str, str, bool]]] = {}
+    body = None
+
+    def add_argument(name: str, schema, is_required: bool) -> str:
+        argument = unique(to_snake_case(name), taken)
+        annotation = annotations.annotation(schema)
+        if is_required:
+            required.append(f"{argument}: {annotation}")
+        else:
+            if annotation != "Any" and not annotation.startswith("Optional["):
+                annotation = f"{annotations.use('Optional')}[{annotation}]"
+            optional.append(f"{argument}: {annotation} = None")
+
+        return argument
+
+    parameters = operation["parameters"]
+    declared = {p["name"] for p in parameters if p["in"] == "path"}
+    # the path parameters first, in the order of the path
+    for name in path_param_pattern.findall(operation["path"]):
+        if name in path_arguments:
+            continue
+        parameter = next(
+            (p for p in parameters if p["in"] == "path" and p["name"] == name),
+            {"schema": {"type": "str"}},
+        )
+        path_arguments[name] = add_argument(name, parameter["schema"], True)
+
+    request_body = operation["request_body"]
+    for parameter in parameters:
+        if parameter["in"] == "path" and parameter["name"] in declared:
+            continue
+        if parameter["in"] == "body":
+            request_body = {
+                "schema": parameter["schema"],
+                "required": parameter["required"],
+            }
+            continue
+        if parameter["in"] not in parameter_kwargs:
+            continue
+
+        argument = add_argument(
+            parameter["name"], parameter["schema"], parameter["required"]
+        )
+        kwargs_entries.setdefault(parameter_kwargs[parameter["in"]], []).append(
+            (parameter["name"], argument, parameter["required"])
+        )
+
+    if request_body:
+        schema = request_body["schema"]
+        # named after its type, like the generated SDKs, unless the name is too long
+        name = to_snake_case(schema) if isinstance(schema, str) else ""
+        if not name or len(name) > 30:
+            name = "body"
+        body = add_argument(name, schema, request_body["required"])
+
+    indent = " " * 8
+    lines = format_brackets(
+        f"def {operation['name']}",
+        ["self"] + required + optional,
+        " -> requests.Response:",
+        indent=" " * 4,
+    )
+    lines.append(f'{indent}"""{operation["docstring"]}"""')
+
+    endpoint = path_param_pattern.sub(
+        lambda match: "{" + path_arguments[match.group(1)] + "}", operation["path"]
+    )
+    prefix = "f" if path_arguments else ""
+    lines += format_assignment(
+        "endpoint", f"{prefix}{json.dumps(endpoint)}", indent=indent
+    )
+
+    arguments = [json.dumps(operation["method"].upper()), "endpoint"]
+    for kwarg, entries in kwargs_entries.items():
+        items = [f"{json.dumps(name)}: {argument}" for name, argument, _ in entries]
+        lines += format_brackets(f"{kwarg} = ", items, "", indent=indent, brackets="{}")
+        if kwarg in ("cookies", "data") and not all(entry[2] for entry in entries):
+            # unlike the params and the headers, requests sends the None values
+            lines.append(
+                f"{indent}{kwarg} = {{k: v for k, v in {kwarg}.items() if v is not None}}"
+            )
+        arguments.append(f"{kwarg}={kwarg}")
+    if body:
+        arguments.append(f"json={body}")
+
+    lines += format_brackets(
+        "return self._make_authenticated_request", arguments, "", indent=indent
+    )
+
+    return lines
+
+
+def auth_scheme(minified: MinifiedApi) -> dict | None:
+    """
+    Pick the security scheme the client authenticates with: the first one the
+    API requires, else the first one it defines.
+    """
+    schemes = minified["security_schemes"]
+    for name in minified["api_security_scopes"]:
+        if name in schemes:
+            return schemes[name]
+
+    return next(iter(schemes.values()), None)
+
+
+def render_auth(minified: MinifiedApi) -> list[str]:
+    """
+    Render the `__init__` and `_make_authenticated_request` methods of the client
+    for the security scheme of the API (see `auth_scheme`).
+    """
+    scheme = auth_scheme(minified) or {}
+    credentials = ["api_key"]
+    entry = None
+    if scheme.get("type") == "http" and str(scheme.get("scheme")).lower() == "basic":
+        credentials = ["username", "password"]
+        entry = ("auth", "(self.username, self.password)")
+    elif scheme.get("type") == "apiKey" and scheme.get("name"):
+        kwarg = {"query": "params", "cookie": "cookies"}.get(
+            scheme.get("in"), "headers"
+        )
+        entry = (kwarg, f"{json.dumps(scheme['name'])}: self.api_key")
+    elif scheme:
+        entry = ("headers", '"Authorization": f"Bearer {self.api_key}"')
+    else:
+        credentials = []
+
+    base_url = json.dumps(minified["server_url"])
+    lines = format_brackets(
+        "def __init__",
+        ["self"]
+        + [f"{name}: str" for name in credentials]
+        + [f"base_url: str = {base_url}"],
+        ":",
+        indent=" " * 4,
+    )
+    lines.append("        self.base_url = base_url")
+    lines += [f"        self.{name} = {name}" for name in credentials]
+    lines.append("")
+    lines += format_brackets(
+        "def _make_authenticated_request",
+        ["self", "method: str", "endpoint: str", "**kwargs"],
+        " -> requests.Response:",
+        indent=" " * 4,
+    )
+    lines.append('        url = f"{self.base_url}{endpoint}"')
+
+    arguments = ["method", "url"]
+    if entry and entry[0] == "auth":
+        arguments.append(f"auth={entry[1]}")
+    elif entry:
+        kwarg, item = entry
+        lines += format_brackets(
+            f"{kwarg} = ",
+            [f'**kwargs.pop("{kwarg}", {{}})', item],
+            "",
+            indent=" " * 8,
+            brackets="{}",
+        )
+        arguments.append(f"{kwarg}={kwarg}")
+    lines += format_brackets(
+        "return requests.request", arguments + ["**kwargs"], "", indent=" " * 8
+    )
+
+    return lines
+
+
+def llm_auth_methods(auth_code: str) -> list[str] | None:
+    """
+    Get the `__init__` and `_make_authenticated_request` methods written by the
+    language model, indented for the client class, None if any is missing.
+    """
+    try:
+        functions = get_functions(auth_code)
+    except SyntaxError:
+        return None
+    if not client_methods <= functions.keys():
+        return None
+
+    return textwrap.indent(
+        "\n\n".join(
+            functions[name] for name in ("__init__", "_make_authenticated_request")
+        ),
+        " " * 4,
+    ).splitlines()
+
+
+def parse_method_names(message: str) -> dict[str, tuple[str, str]]:
+    """
+    Parse the answer of the method names request.
+
+    :param message: The answer, a line per method: `current_name: new_name: docstring`.
+    :return: The new name and the docstring of each method, by current name.
+    """
+    names = {}
+    for line in message.splitlines():
+        match = method_name_pattern.match(line)
+        if match:
+            current, new, docstring = match.groups()
+            names[current] = (new, docstring.strip().strip('"'))
+
+    return names
+
+
+def apply_method_names(
+    operations: list[RenderedOperation], names: dict[str, tuple[str, str]]
+) -> list[RenderedOperation]:
+    """
+    Rename the methods and replace their docstring, keeping the default of the
+    methods the answer misses or gives an invalid or a duplicate name.
+    """
+    renamed: list[RenderedOperation] = []
+    taken = set(client_methods)
+    for operation in operations:
+        new_name, docstring = names.get(operation["name"], (operation["name"], ""))
+        new_name = to_snake_case(new_name)
+        if not is_identifier(new_name) or new_name in taken:
+            new_name = operation["name"]
+
+        renamed.append(
+            {
+                **operation,
+                "name": unique(new_name, taken),
+                "docstring": (
+                    method_docstring(docstring, operation["method"], operation["path"])
+                    if docstring
+                    else operation["docstring"]
+                ),
+            }
+        )
+
+    return renamed
+
+
+def method_listing(operations: list[RenderedOperation]) -> str:
+    """
+    List the methods for the method names prompt, a line per method:
+    `name | METHOD path | summary`.
+    """
+    return "\n".join(
+        f"{operation['name']} | {operation['key']} | {operation['docstring']}"
+        for operation in operations
+    )
+
+
+def render_sdk(
+    minified: MinifiedApi,
+    *,
+    class_name: str,
+    with_types: bool,
+    operations: list[RenderedOperation] | None = None,
+    auth_code: str | None = None,
+) -> str:
+    """
+    Render the SDK of a minified spec without the language model: the client class
+    and a method per operation, which builds the endpoint from the path parameters
+    and sends the other parameters and the body with `_make_authenticated_request`.
+
+    :param minified: The minified spec.
+    :param class_name: The name of the client class.
+    :param with_types: Annotate the arguments with the types of the types module.
+    :param operations: The operations, with the names and the docstrings of their
+        methods (see `get_rendered_operations`).
+    :param auth_code: The `__init__` and `_make_authenticated_request` methods
+        written by the language model, rendered from the security schemes without it.
+    :return: The module of the SDK.
+    """
+    if operations is None:
+        operations = get_rendered_operations(minified)
+
+    annotations = AnnotationCompiler(minified["types"] if with_types else {})
+    auth_lines = llm_auth_methods(auth_code) if auth_code else None
+    if auth_code and auth_lines is None:
+        print("The authentication methods are invalid, rendering them from the spec")
+
+    lines = [f"class {class_name}:"]
+    lines += auth_lines or render_auth(minified)
+    for operation in operations:
+        lines.append("")
+        lines += render_method(operation, annotations)
+
+    header = ["from __future__ import annotations", ""]
+    if annotations.typing:
+        header += [f"from typing import {', '.join(sorted(annotations.typing))}", ""]
+    header.append("import requests")
+    if with_types:
+        header.append("from types import *")
+
+    module = "\n".join(header + ["", ""] + lines) + "\n"
+    if auth_lines:
+        # the imports of the authentication methods, e.g. base64
+        imports = [
+            ast.unparse(node)
+            for node in ast.parse(auth_code).body
+            if isinstance(node, (ast.Import, ast.ImportFrom))
+            and not ast.unparse(node).startswith("from types import")
+        ]
+        if imports:
+            module = merge_imports(module, "\n".join(imports))
+
+    return module
@@ -0,0 +1,217 @@
+import asyncio
+import random
+import threading
+import time
+
+from sdkgenerator.config import RATE_LIMITS, RETRY
+from sdkgenerator.types import RateLimit, RetryConfig, SchedulerStats
+
+
+class TokenBucket:
+    """
+    A bucket refilled at `per_minute` units a minute, holding at most a minute of units.
+
+    A reservation always succeeds and may leave the bucket in debt: it returns how
+    long the caller has to wait before sending. Later reservations wait behind the
+    debt, so the requests are admitted in the order they arrived.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.level = min(
+                self.capacity, self.level + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # a request larger than the bucket only waits for a full bucket
+            self.level -= min(amount, self.capacity)
+
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class ModelLimiter:
+    """
+    The requests per minute and tokens per minute buckets of a model, paused for
+    every request when the provider answers with a 429.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.requests = TokenBucket(limit["rpm"]) if limit.get("rpm") else None
+        self.tokens = TokenBucket(limit["tpm"]) if limit.get("tpm") else None
+        self.paused_until = 0.0
+        self.stats: SchedulerStats = {
+            "requests": 0,
+            "throttled": 0,
+            "throttle_seconds": 0.0,
+            "rate_limited": 0,
+            "retries": 0,
+            "failed": 0,
+            "queue_depth": 0,
+            "max_queue_depth": 0,
+        }
+
+    def reserve(self, tokens: int) -> float:
+        wait = max(self.paused_until - time.monotonic(), 0.0)
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens))
+
+        return wait
+
+
+class RequestScheduler:
+    """
+    Admission control and retries of the LLM requests.
+
+    Each request reserves one request and its tokens (the prompt and `max_tokens`,
+    as the providers count them) from the buckets of its model and waits until
+    they are available. Failed requests are retried with a jittered exponential
+    backoff, or after the Retry-After of a 429, which also pauses every other
+    request to the same model.
+    """
+
+    def __init__(self, rate_limits: dict[str, RateLimit], retry: RetryConfig):
+        self.rate_limits = rate_limits
+        self.retry = retry
+        self._limiters: dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, model: str) -> ModelLimiter:
+        with self._lock:
+            if model not in self._limiters:
+                limit = self.rate_limits.get(model) or self.rate_limits["default"]
+                self._limiters[model] = ModelLimiter(limit)
+
+            return self._limiters[model]
+
+    def _enter(self, model: str, tokens: int) -> tuple[ModelLimiter, float]:
+        limiter = self.limiter(model)
+        wait = limiter.reserve(tokens)
+        with self._lock:
+            stats = limiter.stats
+            stats["requests"] += 1
+            if wait > 0:
+                stats["throttled"] += 1
+                stats["throttle_seconds"] += wait
+                stats["queue_depth"] += 1
+                stats["max_queue_depth"] = max(
+                    stats["max_queue_depth"], stats["queue_depth"]
+                )
+
+        return limiter, wait
+
+    def _leave(self, limiter: ModelLimiter):
+        with self._lock:
+            limiter.stats["queue_depth"] -= 1
+
+    def acquire(self, model: str, tokens: int):
+        """
+        Wait until a request of `tokens` tokens to the model can be sent.
+        """
+        limiter, wait = self._enter(model, tokens)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._leave(limiter)
+
+    async def aacquire(self, model: str, tokens: int):
+        """
+        Async version of `acquire`.
+        """
+        limiter, wait = self._enter(model, tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._leave(limiter)
+
+    def retry_delay(
+        self,
+        model: str,
+        attempt: int,
+        *,
+        status: int | None = None,
+        retry_after: str | None = None,
+    ) -> float | None:
+        """
+        Decide whether a request is retried, and after how long.
+
+        :param model: The model of the request.
+        :param attempt: The number of retries already made.
+        :param status: The status of the response, None if the request failed to connect or timed out.
+        :param retry_after: The Retry-After header of the response.
+        :return: The seconds to wait before retrying, None if the request must not be retried.
+        """
+        if status is not None and status not in self.retry["statuses"]:
+            return None
+
+        limiter = self.limiter(model)
+        if attempt >= self.retry["max_retries"]:
+            with self._lock:
+                limiter.stats["failed"] += 1
+            return None
+
+        # full jitter: spread the retries of concurrent requests over the backoff window
+        delay = random.uniform(
+            0, min(self.retry["backoff_max"], self.retry["backoff_base"] * 2**attempt)
+        )
+        if status == 429:
+            delay = max(delay, parse_retry_after(retry_after) or 0.0)
+
+        with self._lock:
+            limiter.stats["retries"] += 1
+            if status == 429:
+                limiter.stats["rate_limited"] += 1
+                limiter.paused_until = max(
+                    limiter.paused_until, time.monotonic() + delay
+                )
+
+        return delay
+
+    def stats(self) -> dict[str, SchedulerStats]:
+        """
+        Get the admission and retry statistics per model.
+        """
+        with self._lock:
+            return {
+                model: dict(limiter.stats) for model, limiter in self._limiters.items()
+            }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header given in seconds (HTTP dates are not used by the providers).
+    """
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+_scheduler: RequestScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """
+    Get the scheduler shared by all the LLM calls, configured from RATE_LIMITS and RETRY.
+    """
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(RATE_LIMITS, RETRY)
+
+    return _scheduler
@@ -0,0 +1,242 @@
+import json
+import re
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Iterable, Iterator
+
+from sdkgenerator.config import STREAMING
+from sdkgenerator.types import Provider, Step
+
+# The steps whose response must be a code block
+code_steps: set[Step] = {"types", "initial_code", "final_code"}
+
+# When set, receives the code of the code steps (the text of the others) as it arrives
+stream_listener: ContextVar[Callable[[Step, str], None] | None] = ContextVar(
+    "stream_listener", default=None
+)
+
+word_pattern = re.compile(r"\w*")
+
+
+class StreamFormatError(ValueError):
+    """
+    The streamed response can't be the code the step expects, so it was aborted.
+    """
+
+
+class CodeFenceParser:
+    """
+    Split a message streamed in pieces into the prose and the code of its
+    ```lang code blocks, returning the code as soon as it arrives.
+
+    A fence or a language cut between two pieces is held back until the next one.
+    """
+
+    def __init__(self):
+        self.state = "prose"  # "prose", "language" or "code"
+        self.language = ""
+        self.blocks: list[str] = []
+        self.prose_chars = 0
+        self._pending = ""
+        self._code: list[str] = []
+
+    def feed(self, text: str) -> str:
+        """
+        Parse the next piece of the message.
+
+        :return: The code of the piece.
+        """
+        text = self._pending + text
+        self._pending = ""
+        code = []
+
+        while text:
+            if self.state == "language":
+                word = word_pattern.match(text)[0]
+                self.language += word
+                text = text[len(word) :]
+                if not text:
+                    break
+                self.state = "code"
+
+            fence = text.find("```")
+            if fence < 0:
+                # keep the backticks that may start a fence with the next piece
+                kept = len(text) - len(text.rstrip("`"))
+                kept = min(kept, 2)
+                self._pending = text[len(text) - kept :]
+                text = text[: len(text) - kept]
+                if self.state == "code":
+                    code.append(text)
+                    self._code.append(text)
+                else:
+                    self.prose_chars += len(text)
+                break
+
+            if self.state == "code":
+                code.append(text[:fence])
+                self._code.append(text[:fence])
+                self.blocks.append("".join(self._code))
+                self._code = []
+                self.state = "prose"
+            else:
+                self.prose_chars += fence
+                self.language = ""
+                self.state = "language"
+            text = text[fence + 3 :]
+
+        return "".join(code)
+
+
+def check_stream_format(parser: CodeFenceParser, *, step: Step):
+    """
+    Abort a code step whose response is still prose after STREAMING.max_prose_chars.
+
+    :raises StreamFormatError: If the response clearly is not a code block.
+    """
+    if (
+        step in code_steps
+        and parser.state == "prose"
+        and not parser.blocks
+        and parser.prose_chars > STREAMING["max_prose_chars"]
+    ):
+        raise StreamFormatError(
+            f"No code block in the first {parser.prose_chars} characters of the {step} response."
+        )
+
+
+def parse_stream_line(line: str) -> dict | None:
+    """
+    Parse a line of a server-sent events stream, or of a JSON lines stream.
+
+    :return: The event, None for the blank lines, the comments and the end of the stream.
+    """
+    line = line.strip()
+    if line.startswith("data:"):
+        line = line.removeprefix("data:").strip()
+    if not line or line.startswith(":") or line == "[DONE]" or line[0] != "{":
+        return None
+
+    return json.loads(line)
+
+
+def event_text(event: dict, provider: Provider) -> str:
+    """
+    Get the piece of the message carried by a stream event of the provider.
+    """
+    if "error" in event:
+        raise Exception(event["error"])
+
+    if provider == "openai":
+        choices = event.get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content") or ""
+
+    return event.get("text") or ""
+
+
+class StreamCollector:
+    """
+    Gather a streamed response, handing the pieces to the stream listener and
+    aborting the code steps that go off format.
+    """
+
+    def __init__(self, provider: Provider, *, step: Step):
+        self.provider = provider
+        self.step = step
+        self.parser = CodeFenceParser()
+        self.listener = stream_listener.get()
+        self.parts: list[str] = []
+        self.usage: dict | None = None
+
+    def add_line(self, line: str):
+        event = parse_stream_line(line)
+        if event is None:
+            return
+        if event.get("usage"):
+            self.usage = event["usage"]
+
+        text = event_text(event, self.provider)
+        if not text:
+            return
+
+        self.parts.append(text)
+        code = self.parser.feed(text)
+        check_stream_format(self.parser, step=self.step)
+
+        if self.listener is not None:
+            piece = code if self.step in code_steps else text
+            if piece:
+                self.listener(self.step, piece)
+
+    @property
+    def message(self) -> str:
+        return "".join(self.parts)
+
+
+def collect_stream(
+    lines: Iterable[str], provider: Provider, *, step: Step
+) -> tuple[str, dict | None]:
+    """
+    Read a streamed response to the end.
+
+    :param lines: The lines of the response body.
+    :param provider: The provider streaming the response.
+    :param step: The step in the process.
+    :raises StreamFormatError: If a code step streams prose instead of code.
+    :return: The message and the usage, if the provider sent it.
+    """
+    collector = StreamCollector(provider, step=step)
+    for line in lines:
+        collector.add_line(line)
+
+    return collector.message, collector.usage
+
+
+async def acollect_stream(
+    lines: AsyncIterator[str], provider: Provider, *, step: Step
+) -> tuple[str, dict | None]:
+    """
+    Async version of `collect_stream`.
+    """
+    collector = StreamCollector(provider, step=step)
+    async for line in lines:
+        collector.add_line(line)
+
+    return collector.message, collector.usage
+
+
+def iter_decoded_lines(lines: Iterable[bytes]) -> Iterator[str]:
+    # the events are utf-8 whatever the content type says
+    for line in lines:
+        yield line.decode("utf-8")
+
+
+def streamed_response_data(
+    message: str, usage: dict | None, payload: dict, provider: Provider
+) -> dict:
+    """
+    Build the response the provider would have sent without streaming, so the
+    streamed responses are parsed, cached and logged like the others.
+    """
+    if provider == "openai":
+        data = {
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": message},
+                }
+            ]
+        }
+        if usage:
+            data["usage"] = usage
+        return data
+
+    return {
+        "openai": {
+            "status": "success",
+            "generated_text": message,
+            "message": [
+                {"role": "user", "message": payload["text"]},
+                {"role": "assistant", "message": message},
+            ],
+        }
+    }
@@ -1,4 +1,10 @@
-from sdkgenerator.types import Language, Template, TemplateWithoutTypes
+from sdkgenerator.types import (
+    Language,
+    Template,
+    TemplateWithoutTypes,
+    IncrementalTemplate,
+    RenderTemplate,
+)
 
 TEMPLATES: dict[Language, Template] = {
     "python": {
@@ -48,6 +54,18 @@ TEMPLATES: dict[Language, Template] = {
             - I will use this feedback to improve the code.
             - Ensure all issues are addressed.
             - Ensure all suggestions are implemented.''',
+        "feedback_defects": '''Write feedback on the following generated code:
+            code: """{generated_code}"""
+            A static check of the code found these defects:
+            {defects}
+
+            {rules}
+
+            ##IMPORTANT:
+            - Explain how to fix each defect above, with the code of the fix.
+            - Only address these defects, the rest of the code is correct.
+            - The ref types are found in types.py file (from types import *).
+            - I will use this feedback to improve the code.''',
         "final_code": '''with the old initial code and the feedback, write the final code,
             feedback: """{feedback}"""
 
@@ -100,6 +118,17 @@ TEMPLATES_WITHOUT_TYPES: dict[Language, TemplateWithoutTypes] = {
             - I will use this feedback to improve the code.
             - Ensure all issues are addressed.
             - Ensure all suggestions are implemented.''',
+        "feedback_defects": '''Write feedback on the following generated code (inside triple quotes) context:
+            """{generated_code}"""
+            A static check of the code found these defects:
+            {defects}
+
+            {rules}
+
+            ##IMPORTANT:
+            - Explain how to fix each defect above, with the code of the fix.
+            - Only address these defects, the rest of the code is correct.
+            - I will use this feedback to improve the code.''',
         "final_code": '''with the old initial code and the feedback, write the final code, here's the feedback:
             """{feedback}"""
             
@@ -115,3 +144,84 @@ TEMPLATES_WITHOUT_TYPES: dict[Language, TemplateWithoutTypes] = {
             - No yapping just code!''',
     }
 }
+
+INCREMENTAL_TEMPLATES: dict[Language, IncrementalTemplate] = {
+    "python": {
+        "update_types": '''Write the types in python specified in the following openapi specification types (inside triple quotes):
+        """{types}"""
+        These types are added to an existing types.py file that already defines: {existing_types}
+        ##IMPORTANT:
+        - Use TypedDict for objects (not required fields should have NotRequired type).
+        - Use Literals for enums.
+        - Use other types as needed.
+        - Only write the types above, dont redefine the existing ones.
+        - the code must be in this format ```(lang)\n (code``` example: ```python\n def hello():\nprint('hello)```
+        - No yapping just code!''',
+        "update_code": '''Write the methods of an existing Python client sdk for the following new or changed endpoints (inside triple quotes):
+            """{api_spec}"""
+
+            The existing sdk (method bodies omitted):
+            """{skeleton}"""
+
+            {rules}
+
+            ##IMPORTANT:
+            - Only write the methods for the endpoints above, inside `class {class_name}:`.
+            - Use `self._make_authenticated_request` like the existing methods.
+            - Follow the naming style of the existing methods.
+            - I want docstrings for all methods (a small oneline docstring)
+            - The ref types are found in types.py file (from types import *).
+            - Dont give usage examples.
+            - the code must be in this format ```(lang)\n (code``` example: ```python\n def hello():\nprint('hello)```
+            - No yapping just code!''',
+        "repair_code": '''Write the methods of an existing Python client sdk for the following endpoints (inside triple quotes):
+            """{api_spec}"""
+
+            The methods of these endpoints are missing or broken:
+            {defects}
+
+            The existing sdk (public methods omitted):
+            """{skeleton}"""
+
+            {rules}
+
+            ##IMPORTANT:
+            - Only write the methods for the endpoints above, inside `class {class_name}:`.
+            - Use `self._make_authenticated_request` like the existing methods.
+            - I want docstrings for all methods (a small oneline docstring)
+            - The ref types are found in types.py file (from types import *).
+            - Dont give usage examples.
+            - the code must be in this format ```(lang)\n (code``` example: ```python\n def hello():\nprint('hello)```
+            - No yapping just code!''',
+    }
+}
+
+RENDER_TEMPLATES: dict[Language, RenderTemplate] = {
+    "python": {
+        "auth": '''Write the authentication of a Python client sdk `class {class_name}:` for an API with these security schemes (inside triple quotes):
+            """{security}"""
+            base_url: {base_url}
+
+            {rules}
+
+            ##IMPORTANT:
+            - Only write the `__init__` and `_make_authenticated_request(self, method: str, endpoint: str, **kwargs) -> requests.Response` methods, inside the class.
+            - `__init__` takes the credentials and a `base_url` argument defaulting to the base_url above.
+            - `_make_authenticated_request` sends the request to the base url followed by the endpoint with the requests library, authenticated with the security schemes.
+            - The endpoint methods pass their headers, params and cookies in kwargs, keep them.
+            - Dont give usage examples.
+            - the code must be in this format ```(lang)\n (code``` example: ```python\n def hello():\nprint('hello)```
+            - No yapping just code!''',
+        "method_names": '''Name the methods of a Python client sdk, a method per endpoint of the API (inside triple quotes, a line per method: name | http method and path | summary):
+            """{methods}"""
+
+            {rules}
+
+            ##IMPORTANT:
+            - Answer a line per method, in this format: `name: new_name: docstring`
+            - Choose method names in snake case that reflect the action or resource they interact with, keep the name when it does.
+            - The method names must be unique.
+            - Docstrings must be small and oneline.
+            - No yapping!''',
+    }
+}
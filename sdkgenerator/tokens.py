@@ -0,0 +1,106 @@
+from functools import lru_cache
+
+import tiktoken
+
+from sdkgenerator.config import AGENT, MAX_PROMPT_LENGTH, MAX_TOKENS
+from sdkgenerator.templates import TEMPLATES, TEMPLATES_WITHOUT_TYPES
+from sdkgenerator.types import Language, Step, StepBudget
+
+# The template field holding the variable part of the prompt of each step
+step_fields: dict[Step, str] = {
+    "types": "types",
+    "initial_code": "api_spec",
+    "feedback": "generated_code",
+    "final_code": "feedback",
+}
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """
+    Get the tokenizer of a model, loaded once per process.
+    """
+    return tiktoken.encoding_for_model(model)
+
+
+def count_tokens(text: str, *, step: Step) -> int:
+    """
+    Count the tokens of a text with the tokenizer of the model of a step.
+    """
+    return len(get_encoding(AGENT[step]["model"]).encode(text))
+
+
+def format_rules(user_rules: str) -> str:
+    return "#RULES:\n" + user_rules if user_rules else ""
+
+
+@lru_cache(maxsize=None)
+def template_tokens(
+    step: Step, *, language: Language, with_types: bool, rules: str
+) -> int:
+    """
+    Count the tokens of the static part of the prompt of a step (the template with
+    the rules), once per combination.
+    """
+    templates = TEMPLATES if with_types else TEMPLATES_WITHOUT_TYPES
+    prompt = templates[language][step].format(**{step_fields[step]: "", "rules": rules})
+    return count_tokens(prompt, step=step)
+
+
+def step_budget_report(
+    api_spec: str,
+    types_json: dict,
+    *,
+    user_rules: str,
+    language: Language = "python",
+) -> dict[Step, StepBudget]:
+    """
+    Account for the prompt tokens of every step of the pipeline.
+
+    The static part of each template is counted once per process, the api spec
+    and the types once per call. The code and the feedback sent to the last two
+    steps are not known yet, so they count as MAX_TOKENS of the step.
+
+    :param api_spec: The minified API spec.
+    :param types_json: The types, empty when the pipeline runs without types.
+    :param user_rules: The user rules.
+    :param language: The language of the generated code.
+    :return: The tokens used, the limit and the tokens remaining for each step.
+    """
+    rules = format_rules(user_rules)
+    with_types = bool(types_json)
+
+    variable_tokens: dict[Step, int] = {}
+    if with_types:
+        variable_tokens["types"] = count_tokens(str(types_json), step="types")
+    variable_tokens["initial_code"] = count_tokens(api_spec, step="initial_code")
+    variable_tokens["feedback"] = MAX_TOKENS["feedback"]
+    variable_tokens["final_code"] = MAX_TOKENS["final_code"]
+
+    report: dict[Step, StepBudget] = {}
+    for step, tokens in variable_tokens.items():
+        used = tokens + template_tokens(
+            step, language=language, with_types=with_types, rules=rules
+        )
+        report[step] = {
+            "used": used,
+            "limit": MAX_PROMPT_LENGTH[step],
+            "remaining": MAX_PROMPT_LENGTH[step] - used,
+        }
+
+    return report
+
+
+def is_within_budget(report: dict[Step, StepBudget]) -> bool:
+    return all(budget["remaining"] >= 0 for budget in report.values())
+
+
+def format_budget_report(report: dict[Step, StepBudget]) -> str:
+    """
+    Format the budget report as one line per step.
+    """
+    return "\n".join(
+        f"{step:<14}{budget['used']:>7} / {budget['limit']} tokens"
+        + (f" ({-budget['remaining']} over)" if budget["remaining"] < 0 else "")
+        for step, budget in report.items()
+    )
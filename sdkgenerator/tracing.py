@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+from sdkgenerator.config import TELEMETRY
+from sdkgenerator.constants import TRACES_DIR
+
+
+class Trace:
+    """
+    The spans of one traced operation, gathered from all the threads it runs in.
+    """
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: "Span"):
+        with self._lock:
+            self.spans.append(span)
+
+
+class Span:
+    def __init__(
+        self, name: str, trace: Trace, parent: "Span | None", attributes: dict
+    ):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.error: str | None = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def seconds(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | None]:
+    """
+    Record a span in the current trace, the child of the current span.
+
+    Outside of a trace (see `trace`), nothing is recorded and None is yielded.
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    with _record(Span(name, parent.trace, parent, attributes)) as child:
+        yield child
+
+
+@contextmanager
+def trace(name: str, **attributes) -> Iterator[Span | None]:
+    """
+    Start a trace, exported when it ends (see `export_trace`).
+
+    Inside a trace, this is a span of the current trace.
+    """
+    if not TELEMETRY["traces"]:
+        yield None
+        return
+
+    parent = current_span.get()
+    if parent is not None:
+        with _record(Span(name, parent.trace, parent, attributes)) as child:
+            yield child
+        return
+
+    root = Span(name, Trace(), None, attributes)
+    try:
+        with _record(root):
+            yield root
+    finally:
+        try:
+            export_trace(root.trace)
+        except OSError as e:
+            print(f"Error exporting the trace of {name}: {e}")
+
+
+@contextmanager
+def _record(span: Span) -> Iterator[Span]:
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        current_span.reset(token)
+        span.trace.add(span)
+
+
+def otel_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # int64 are strings in the OTLP JSON encoding
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [otel_value(item) for item in value]}}
+
+    return {"stringValue": str(value)}
+
+
+def otel_attributes(attributes: dict) -> list[dict]:
+    return [
+        {"key": key, "value": otel_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def otel_span(span: Span) -> dict:
+    data = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": otel_attributes(span.attributes),
+        # STATUS_CODE_ERROR or STATUS_CODE_OK
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id is not None:
+        data["parentSpanId"] = span.parent_id
+
+    return data
+
+
+def format_trace(trace: Trace) -> dict:
+    """
+    Encode a trace in the OpenTelemetry protocol JSON format (an ExportTraceServiceRequest).
+    """
+    spans = sorted(trace.spans, key=lambda span: span.start_ns)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": otel_attributes({"service.name": "sdkgenerator"})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "sdkgenerator"},
+                        "spans": [otel_span(span) for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def export_trace(trace: Trace, directory: Path = TRACES_DIR) -> Path:
+    """
+    Write a trace to its own file, named after its start time, its root span and its id.
+    """
+    root = min(trace.spans, key=lambda span: span.start_ns)
+    started = time.strftime("%Y%m%dT%H%M%S", time.gmtime(root.start_ns / 1e9))
+    name = root.attributes.get("sdk.name", root.name)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{started}-{name}-{trace.trace_id[:8]}.json"
+    path.write_text(json.dumps(format_trace(trace)))
+
+    return path
@@ -0,0 +1,410 @@
+import json
+import keyword
+import re
+from typing import Iterator
+
+# The minified primitive types (see manifier.types_key_abbreviations) and their Python types
+primitive_types = {
+    "str": "str",
+    "string": "str",
+    "int": "int",
+    "integer": "int",
+    "num": "float",
+    "number": "float",
+    "bool": "bool",
+    "boolean": "bool",
+    "null": "None",
+    "file": "bytes",
+}
+
+# The schema keys that change the type in ways TypedDicts can't express
+unsupported_keys = {
+    "not",
+    "patternProperties",
+    "prefixItems",
+    "if",
+    "then",
+    "else",
+    "dependentSchemas",
+}
+
+# The names the generated module imports or uses, which the types can't shadow
+reserved_names = {
+    "Any",
+    "Dict",
+    "List",
+    "Literal",
+    "NotRequired",
+    "Optional",
+    "TypeAlias",
+    "TypedDict",
+    "Union",
+    "str",
+    "int",
+    "float",
+    "bool",
+    "bytes",
+    "None",
+}
+
+word_pattern = re.compile(r"[A-Za-z0-9]+")
+
+
+class UnsupportedSchema(ValueError):
+    """
+    A schema the types compiler can't translate, left to the language model.
+    """
+
+
+def type_references(value, types_json: dict) -> Iterator[str]:
+    """
+    Find the types referenced in a minified type, where a reference is the name of the type.
+    """
+    if isinstance(value, str):
+        if value in types_json:
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from type_references(item, types_json)
+    elif isinstance(value, list):
+        for item in value:
+            yield from type_references(item, types_json)
+
+
+def types_dependency_order(types_json: dict) -> list[str]:
+    """
+    Order the types so each one comes after the types it references (except in cycles).
+    """
+    order: list[str] = []
+    visited: set[str] = set()
+
+    for root in types_json:
+        if root in visited:
+            continue
+        visited.add(root)
+
+        # depth first, without recursion: reference chains can be thousands of types long
+        stack = [(root, type_references(types_json[root], types_json))]
+        while stack:
+            name, references = stack[-1]
+            for reference in references:
+                if reference not in visited:
+                    visited.add(reference)
+                    stack.append(
+                        (reference, type_references(types_json[reference], types_json))
+                    )
+                    break
+            else:
+                stack.pop()
+                order.append(name)
+
+    return order
+
+
+def pascal_case(name: str) -> str:
+    return "".join(word[0].upper() + word[1:] for word in word_pattern.findall(name))
+
+
+def is_identifier(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+class TypesCompiler:
+    """
+    Translate the minified types of a spec into a Python module of TypedDicts.
+
+    Objects become TypedDicts (the optional fields are NotRequired), enums
+    Literals, arrays Lists, maps Dicts, allOf the union of the fields of its
+    parts and oneOf/anyOf Unions. The inline objects get a class named after
+    their parent and their field. A reference to a type defined later (a cycle)
+    is a forward reference.
+    """
+
+    def __init__(self, types_json: dict):
+        self.types_json = types_json
+        self.taken: set[str] = set(reserved_names)
+        self.names: dict[str, str] = {
+            name: self.unique_name(name) for name in types_json
+        }
+        # The types defined so far in the module, and the ones that are TypedDicts
+        self.defined: set[str] = set()
+        self.classes: set[str] = set()
+        self.typing: set[str] = set()
+
+    def unique_name(self, name: str) -> str:
+        python_name = name if is_identifier(name) else pascal_case(name)
+        if not python_name or python_name[0].isdigit():
+            python_name = "T" + python_name
+        if python_name in self.taken:
+            index = 2
+            while f"{python_name}{index}" in self.taken:
+                index += 1
+            python_name = f"{python_name}{index}"
+
+        self.taken.add(python_name)
+        return python_name
+
+    def compile(self) -> tuple[str, dict]:
+        """
+        Compile the types in dependency order.
+
+        :return: The module, and the types it doesn't define, by Python name.
+        """
+        blocks: list[str] = []
+        unsupported: dict[str, dict] = {}
+
+        for name in types_dependency_order(self.types_json):
+            python_name = self.names[name]
+            type_blocks: list[str] = []
+            try:
+                self.define(python_name, self.types_json[name], type_blocks)
+            except (UnsupportedSchema, RecursionError):
+                unsupported[python_name] = self.types_json[name]
+                continue
+
+            blocks += type_blocks
+
+        if not blocks:
+            return "", unsupported
+
+        # two blank lines around the classes, as black formats them
+        module = "from typing import " + ", ".join(sorted(self.typing)) + "\n"
+        previous = "import"
+        for block in blocks:
+            kind = "class" if "\n" in block else "alias"
+            module += "\n" + ("\n\n" if "class" in (kind, previous) else "") + block
+            previous = kind
+
+        return module + "\n", unsupported
+
+    def use(self, name: str) -> str:
+        self.typing.add(name)
+        return name
+
+    def reference(self, name: str) -> str:
+        if name not in self.types_json:
+            # a $ref path, e.g. #/components/schemas/Pet
+            name = name.split("/")[-1]
+            if name not in self.types_json:
+                raise UnsupportedSchema(f"Unknown type {name}")
+
+        python_name = self.names[name]
+        return python_name if python_name in self.defined else f'"{python_name}"'
+
+    def define(self, python_name: str, schema, blocks: list[str]):
+        """
+        Define a type, appending its definition and the ones of its inline objects to `blocks`.
+        """
+        if self.is_object(schema):
+            self.define_class(python_name, schema, blocks)
+            return
+
+        expression = self.expression(schema, python_name, blocks)
+        if expression.startswith('"'):
+            # an alias of a type defined later
+            blocks.append(f"{python_name}: {self.use('TypeAlias')} = {expression}")
+        else:
+            blocks.append(f"{python_name} = {expression}")
+        self.defined.add(python_name)
+
+    def is_object(self, schema) -> bool:
+        if not isinstance(schema, dict) or "enum" in schema:
+            return False
+        if "allOf" in schema:
+            return len(schema["allOf"]) > 1
+        if "oneOf" in schema or "anyOf" in schema:
+            return False
+
+        # the objects without properties are free-form, i.e. dicts
+        return "props" in schema
+
+    def check_keys(self, schema: dict):
+        keys = unsupported_keys & schema.keys()
+        if keys:
+            raise UnsupportedSchema(f"Unsupported keys {sorted(keys)}")
+
+    def expression(self, schema, hint: str, blocks: list[str]) -> str:
+        """
+        Get the Python type of a schema, defining a class for each of its inline objects.
+
+        :param hint: The name of the classes of the inline objects.
+        """
+        if isinstance(schema, str):
+            return self.reference(schema)
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"Unsupported schema {schema!r}")
+
+        self.check_keys(schema)
+        expression = self.base_expression(schema, hint, blocks)
+        if schema.get("nullable") is True and expression not in {"None", "Any"}:
+            expression = f"{self.use('Optional')}[{expression}]"
+
+        return expression
+
+    def base_expression(self, schema: dict, hint: str, blocks: list[str]) -> str:
+        if "$ref" in schema:
+            return self.reference(schema["$ref"])
+
+        # a parameter resolved as a type
+        if "in" in schema and "schema" in schema:
+            return self.expression(schema["schema"], hint, blocks)
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if values and all(
+                value is None or isinstance(value, (str, int, bool)) for value in values
+            ):
+                literals = [
+                    json.dumps(value) if isinstance(value, str) else repr(value)
+                    for value in dict.fromkeys(values)
+                ]
+                return f"{self.use('Literal')}[{', '.join(literals)}]"
+
+        for key in ("oneOf", "anyOf"):
+            if key in schema:
+                return self.union(
+                    [
+                        self.expression(member, f"{hint}Option{index}", blocks)
+                        for index, member in enumerate(schema[key], start=1)
+                    ]
+                )
+
+        if "allOf" in schema:
+            if len(schema["allOf"]) == 1:
+                return self.expression(schema["allOf"][0], hint, blocks)
+            return self.inline_class(schema, hint, blocks)
+
+        if self.is_object(schema):
+            return self.inline_class(schema, hint, blocks)
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            return self.union(
+                [
+                    self.base_expression({**schema, "type": item}, hint, blocks)
+                    for item in schema_type
+                ]
+            )
+
+        if schema_type == "array" or (schema_type is None and "items" in schema):
+            items = schema.get("items")
+            item = self.expression(items, f"{hint}Item", blocks) if items else None
+            return f"{self.use('List')}[{item or self.use('Any')}]"
+
+        if schema_type == "obj":
+            values = schema.get("additionalProperties")
+            value = (
+                self.expression(values, f"{hint}Value", blocks)
+                if isinstance(values, (dict, str)) and values
+                else self.use("Any")
+            )
+            return f"{self.use('Dict')}[str, {value}]"
+
+        if schema_type is None:
+            return self.use("Any")
+        if schema_type in primitive_types:
+            return primitive_types[schema_type]
+
+        raise UnsupportedSchema(f"Unsupported type {schema_type!r}")
+
+    def union(self, members: list[str]) -> str:
+        members = list(dict.fromkeys(members))
+        if len(members) == 1:
+            return members[0]
+        if "None" in members and len(members) == 2:
+            other = next(member for member in members if member != "None")
+            return f"{self.use('Optional')}[{other}]"
+
+        return f"{self.use('Union')}[{', '.join(members)}]"
+
+    def inline_class(self, schema: dict, hint: str, blocks: list[str]) -> str:
+        python_name = self.unique_name(hint)
+        self.define_class(python_name, schema, blocks)
+        return python_name
+
+    def object_parts(self, schema) -> Iterator[dict | str]:
+        """
+        Flatten the allOf of an object into its parts: the types it extends and the inline objects.
+        """
+        if isinstance(schema, dict) and "allOf" in schema:
+            self.check_keys(schema)
+            rest = {key: value for key, value in schema.items() if key != "allOf"}
+            for part in schema["allOf"]:
+                yield from self.object_parts(part)
+            if "props" in rest:
+                yield rest
+        elif isinstance(schema, dict) and "$ref" in schema:
+            yield schema["$ref"]
+        else:
+            yield schema
+
+    def define_class(self, python_name: str, schema: dict, blocks: list[str]):
+        bases: list[str] = []
+        fields: dict[str, tuple] = {}
+        required: set[str] = set()
+
+        for part in self.object_parts(schema):
+            if isinstance(part, str):
+                base = self.reference(part)
+                if base in self.classes:
+                    bases.append(base)
+                    continue
+                # a type defined later or not a TypedDict: copy its fields
+                name = part if part in self.types_json else part.split("/")[-1]
+                part = self.types_json[name]
+                if not self.is_object(part) or "allOf" in part:
+                    raise UnsupportedSchema(f"{name} can't be extended")
+
+            if not isinstance(part, dict):
+                raise UnsupportedSchema(f"Unsupported schema {part!r}")
+            self.check_keys(part)
+            if "oneOf" in part or "anyOf" in part:
+                raise UnsupportedSchema("oneOf and anyOf in allOf")
+
+            for field, field_schema in (part.get("props") or {}).items():
+                fields[field] = (field_schema, f"{python_name}{pascal_case(field)}")
+            required.update(part.get("req") or [])
+
+        annotations = {}
+        for field, (field_schema, hint) in fields.items():
+            annotation = self.expression(field_schema, hint, blocks)
+            if field not in required:
+                annotation = f"{self.use('NotRequired')}[{annotation}]"
+            annotations[field] = annotation
+
+        self.use("TypedDict")
+        if all(is_identifier(field) for field in annotations):
+            lines = [f"class {python_name}({', '.join(bases) or 'TypedDict'}):"]
+            lines += [
+                f"    {field}: {annotation}"
+                for field, annotation in annotations.items()
+            ]
+            if not annotations:
+                lines.append("    pass")
+            blocks.append("\n".join(lines))
+        elif not bases:
+            # fields that aren't identifiers need the functional syntax
+            items = "".join(
+                f"\n        {json.dumps(field)}: {annotation},"
+                for field, annotation in annotations.items()
+            )
+            blocks.append(
+                f'{python_name} = TypedDict(\n    "{python_name}",\n    {{{items}\n    }},\n)'
+            )
+        else:
+            raise UnsupportedSchema(f"{python_name} extends types with invalid fields")
+
+        self.defined.add(python_name)
+        self.classes.add(python_name)
+
+
+def compile_types(types_json: dict) -> tuple[str, dict]:
+    """
+    Translate the minified types of a spec into a Python module, without the language model.
+
+    :param types_json: The types of the minified spec.
+    :return: The module (empty if no type is supported), and the types it leaves
+        out because their schema isn't supported, keyed by the name they are
+        referenced with in the module.
+    """
+    return TypesCompiler(types_json).compile()
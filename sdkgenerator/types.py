@@ -5,20 +5,344 @@ class Template(TypedDict):
     types: str
     initial_code: str
     feedback: str
+    feedback_defects: str
     final_code: str
 
 
 class TemplateWithoutTypes(TypedDict):
     initial_code: str
     feedback: str
+    feedback_defects: str
     final_code: str
 
 
+class IncrementalTemplate(TypedDict):
+    update_types: str
+    update_code: str
+    repair_code: str
+
+
+class RenderTemplate(TypedDict):
+    auth: str
+    method_names: str
+
+
 Step = Literal["types", "initial_code", "feedback", "final_code"]
 
+HistoryArtifact = Literal["api_spec", "types", "initial_code"]
+
 Language = Literal["python"]
 
+Provider = Literal["openai", "edenai"]
+
 
 class Agent(TypedDict):
     model: str
     custom: bool
+
+
+class BatchConfig(TypedDict):
+    workers: int
+    sub_sdk_workers: int
+
+
+class PipelineConfig(TypedDict):
+    workers: int
+    types_chunk_tokens: int
+    speculative_initial_code: bool
+    types_backend: Literal["llm", "compiler"]
+    code_backend: Literal["llm", "render", "render_gaps"]
+    method_names_batch_size: int
+    adaptive_feedback: bool
+    repair: bool
+    repair_batch_size: int
+    compact_history: bool
+
+
+class CorpusConfig(TypedDict):
+    workers: int
+    chunk_size: int
+
+
+class HttpConfig(TypedDict):
+    connect_timeout: float
+    read_timeout: float
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+
+
+class CacheConfig(TypedDict):
+    enabled: bool
+    ttl: float
+    max_entries: int
+    max_size_mb: float
+    specs: bool
+
+
+class RateLimit(TypedDict):
+    rpm: int | None
+    tpm: int | None
+
+
+class RetryConfig(TypedDict):
+    max_retries: int
+    backoff_base: float
+    backoff_max: float
+    statuses: list[int]
+
+
+class SchedulerStats(TypedDict):
+    requests: int
+    throttled: int
+    throttle_seconds: float
+    rate_limited: int
+    retries: int
+    failed: int
+    queue_depth: int
+    max_queue_depth: int
+
+
+LogSinkName = Literal["mongodb", "jsonl"]
+
+LogCompression = Literal["gzip", "zstd"]
+
+
+class JsonlLogConfig(TypedDict):
+    max_mb: float
+    max_age: float
+    compression: LogCompression | None
+
+
+class LoggingConfig(TypedDict):
+    sinks: list[LogSinkName]
+    queue_size: int
+    batch_size: int
+    flush_interval: float
+    put_timeout: float
+    jsonl: JsonlLogConfig
+
+
+class TelemetryConfig(TypedDict):
+    metrics: bool
+    traces: bool
+
+
+class ModelPrice(TypedDict):
+    prompt: float
+    completion: float
+
+
+class StreamingConfig(TypedDict):
+    enabled: bool
+    max_prose_chars: int
+
+
+LatencyDistribution = Literal["fixed", "uniform", "normal", "lognormal", "exponential"]
+
+
+class LatencyConfig(TypedDict):
+    distribution: LatencyDistribution
+    mean: float
+    stddev: float
+    per_token: float
+
+
+class MockServerConfig(TypedDict):
+    enabled: bool
+    host: str
+    port: int
+    seed: int
+    latency: LatencyConfig
+    error_rate: float
+    rate_limit_rate: float
+    retry_after: float
+    replay: str | None
+    on_miss: Literal["canned", "error"]
+
+
+class LlmCallLog(TypedDict):
+    created_at: float
+    step: Step
+    sdk_name: str | None
+    payload: dict
+    response: dict
+    custom: bool
+
+
+class CacheStats(TypedDict):
+    enabled: bool
+    hits: int
+    misses: int
+    entries: int
+    size_mb: float
+
+
+class StepBudget(TypedDict):
+    used: int
+    limit: int
+    remaining: int
+
+
+class StepTiming(TypedDict):
+    step: Step
+    sdk_name: str
+    seconds: float
+
+
+class NodeTiming(TypedDict):
+    node: str
+    start: float
+    seconds: float
+
+
+class StepLatency(TypedDict):
+    count: int
+    total: float
+    mean: float
+    max: float
+
+
+DefectKind = Literal[
+    "syntax",
+    "no_client",
+    "missing_method",
+    "undefined_attribute",
+    "undefined_name",
+    "unknown_type",
+]
+
+
+class CodeDefect(TypedDict):
+    kind: DefectKind
+    message: str
+    # The "METHOD path" of the operation, and the method the defect is in
+    operation: str | None
+    method: str | None
+
+
+class CodeCheck(TypedDict):
+    sdk_name: str
+    defects: int
+    kinds: dict[str, int]
+    skipped_feedback: bool
+
+
+class FeedbackStats(TypedDict):
+    checked: int
+    skipped: int
+    skip_rate: float
+    defects: dict[str, int]
+
+
+class HistorySaving(TypedDict):
+    step: Step
+    artifact: HistoryArtifact
+    tokens: int
+    sent_tokens: int
+
+
+class SpecResult(TypedDict):
+    name: str
+    file: str
+    status: Literal["success", "failed"]
+    seconds: float
+    error: str | None
+    step_timings: list[StepTiming]
+    node_timings: list[NodeTiming]
+    code_checks: list[CodeCheck]
+    history_savings: list[HistorySaving]
+
+
+class BatchReport(TypedDict):
+    workers: int
+    wall_time: float
+    succeeded: int
+    failed: int
+    step_latency: dict[Step, StepLatency]
+    feedback: FeedbackStats
+    history_tokens_saved: dict[Step, int]
+    cache: CacheStats
+    scheduler: dict[str, SchedulerStats]
+    results: list[SpecResult]
+
+
+class CorpusFileResult(TypedDict):
+    name: str
+    file: str
+    digest: str
+    status: Literal["minified", "skipped", "failed"]
+    bytes: int
+    load_seconds: float
+    minify_seconds: float
+    write_seconds: float
+    error: str | None
+
+
+class CorpusReport(TypedDict):
+    workers: int
+    wall_time: float
+    minified: int
+    skipped: int
+    failed: int
+    results: list[CorpusFileResult]
+
+
+class MinifiedApi(TypedDict):
+    api_spec: str
+    types: dict
+    paths: dict[str, dict]
+    server_url: str
+    api_security_scopes: dict
+    security_schemes: dict
+
+
+class RenderedOperation(TypedDict):
+    key: str
+    path: str
+    method: str
+    name: str
+    docstring: str
+    parameters: list[dict]
+    request_body: dict | None
+
+
+class Operation(TypedDict):
+    path: str
+    method: str
+    operation_id: str
+    content: str
+    security: list | None
+    path_parameters: list[str]
+
+
+class OperationDiff(TypedDict):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+
+class TypesDiff(TypedDict):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+
+class OperationCost(TypedDict):
+    index: int
+    path: str
+    method: str
+    group: str
+    spec_tokens: int
+    types: set[str]
+    refs: set[str]
+
+
+class SpecChunk(TypedDict):
+    name: str
+    groups: list[str]
+    operations: list[OperationCost]
+    paths: set[str]
+    types: set[str]
+    spec_tokens: int
+    types_tokens: int
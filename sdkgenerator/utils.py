@@ -1,26 +1,74 @@
+import asyncio
+import itertools
 import re
 import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-import yaml
-import json
-from pathlib import Path
-import tiktoken
+from urllib.parse import urlsplit
 
 # from openapi_spec_validator import validate // TOO STRICT VALIDATION
 # from openapi_spec_validator.readers import read_from_filename
 
 from sdkgenerator.logger import log_llm_response
+from sdkgenerator.cache import cache_key, get_response_cache, request_conversation
 from sdkgenerator.constants import (
     EDEN_AI_API,
     OPENAI_API,
 )
-from sdkgenerator.templates import TEMPLATES, TEMPLATES_WITHOUT_TYPES
-from sdkgenerator.types import Language, Step
-from sdkgenerator.config import AGENT, MAX_TOKENS, TEMPERATURE, MAX_PROMPT_LENGTH
+from sdkgenerator.metrics import record_llm_call
+from sdkgenerator.scheduler import get_scheduler
+from sdkgenerator.streaming import (
+    acollect_stream,
+    collect_stream,
+    iter_decoded_lines,
+    streamed_response_data,
+)
+from sdkgenerator.tracing import span
+from sdkgenerator.tokens import count_tokens, is_within_budget, step_budget_report
+from sdkgenerator.types import Language, Step, StepTiming, Provider
+from sdkgenerator.config import (
+    AGENT,
+    MAX_TOKENS,
+    TEMPERATURE,
+    MAX_PROMPT_LENGTH,
+    CONCURRENCY,
+    HTTP,
+    MOCK_SERVER,
+    STREAMING,
+)
 
 load_dotenv()
 
+# Limits the number of in-flight requests per provider across all threads
+provider_semaphores: dict[Provider, threading.BoundedSemaphore] = {
+    provider: threading.BoundedSemaphore(limit)
+    for provider, limit in CONCURRENCY.items()
+}
+
+# Created lazily, shared by all the LLM calls (see get_session / get_async_client)
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+# The async client of each event loop, with the task that closes it when the loop shuts down
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, asyncio.Task]
+] = weakref.WeakKeyDictionary()
+_async_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[Provider, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+# When set, every LLM call appends its latency to this list (used by batch runs)
+step_timings: ContextVar[list[StepTiming] | None] = ContextVar(
+    "step_timings", default=None
+)
+
 code_block_pattern = re.compile(r"```(\w+)([\s\S]+?)```")
 
 language_to_extension = {
@@ -56,13 +104,275 @@ def get_code_from_model_response(response) -> tuple[str, str]:
     return code, file_extension
 
 
-def generate_llm_response(
-    payload: dict, *, step: Step, sdk_name: str
-) -> tuple[str, list]:
+def get_provider(step: Step) -> Provider:
     """
-    Generate code for the API spec via the language model.
+    Get the provider that serves the given step.
 
-    :return: The response from the language model.
+    :param step: The step in the process.
+    :type step: Step
+    :return: "openai" for custom (fine-tuned) models, "edenai" otherwise.
+    :rtype: Provider
+    """
+    return "openai" if AGENT[step]["custom"] else "edenai"
+
+
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all the LLM calls of the process.
+
+    The session keeps a pool of keep-alive connections per provider host.
+
+    :return: The shared session.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=len(CONCURRENCY),
+                pool_maxsize=HTTP["max_connections"],
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+
+    return _session
+
+
+async def close_with_loop(client: httpx.AsyncClient):
+    """
+    Wait until the event loop shuts down, asyncio.run cancels the pending tasks,
+    then close the client while its connections' loop still runs.
+    """
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await client.aclose()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the async HTTP client shared by all the LLM calls of the running event loop.
+
+    The client pools HTTP/1.1 keep-alive connections. Each event loop has its own,
+    closed by `aclose_async_client` or when the loop shuts down.
+
+    :return: The shared async client.
+    """
+    loop = asyncio.get_running_loop()
+    # the clients of the loops that shut down are closed already
+    for closed in [item for item in _async_clients if item.is_closed()]:
+        del _async_clients[closed]
+        _async_semaphores.pop(closed, None)
+
+    if loop not in _async_clients:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                HTTP["read_timeout"], connect=HTTP["connect_timeout"]
+            ),
+            limits=httpx.Limits(
+                max_connections=HTTP["max_connections"],
+                max_keepalive_connections=HTTP["max_keepalive_connections"],
+                keepalive_expiry=HTTP["keepalive_expiry"],
+            ),
+            http1=True,
+            http2=False,
+        )
+        _async_clients[loop] = client, loop.create_task(close_with_loop(client))
+
+    return _async_clients[loop][0]
+
+
+async def aclose_async_client():
+    """
+    Close the async client of the running event loop and its pooled connections.
+    """
+    entry = _async_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        client, closer = entry
+        closer.cancel()
+        await client.aclose()
+
+
+def record_step_timing(step: Step, sdk_name: str, seconds: float):
+    """
+    Record the latency of an LLM call if the current context collects step timings.
+    """
+    timings = step_timings.get()
+    if timings is not None:
+        timings.append(
+            {
+                "step": step,
+                "sdk_name": sdk_name,
+                "seconds": seconds,
+            }
+        )
+
+
+def request_tokens(body: dict, *, step: Step) -> int:
+    """
+    Count the tokens a request takes from the quota of its model: the whole
+    conversation and the max_tokens of the response.
+    """
+    _, messages = request_conversation(body)
+    prompt_tokens = sum(
+        count_tokens(message["content"], step=step) for message in messages
+    )
+    return prompt_tokens + body["max_tokens"]
+
+
+def post_llm_request(
+    url: str,
+    *,
+    headers: dict,
+    body: dict,
+    step: Step,
+    sdk_name: str,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    Send a request to the language model provider, once the scheduler admits it and
+    respecting the provider's concurrency limit.
+
+    Rate limited, failed and timed out requests are retried as the RETRY config says.
+
+    :param url: The provider endpoint.
+    :param headers: The request headers.
+    :param body: The JSON body.
+    :param step: The step in the process.
+    :param sdk_name: The name of the SDK.
+    :param stream: Return as soon as the headers arrive, the body is read by the caller.
+    :return: The HTTP response, the last one if the retries are exhausted.
+    """
+    scheduler = get_scheduler()
+    model = AGENT[step]["model"]
+    tokens = request_tokens(body, step=step)
+
+    for attempt in itertools.count():
+        scheduler.acquire(model, tokens)
+        with provider_semaphores[get_provider(step)]:
+            start = time.perf_counter()
+            try:
+                response = get_session().post(
+                    url,
+                    headers=headers,
+                    json=body,
+                    timeout=(HTTP["connect_timeout"], HTTP["read_timeout"]),
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, error = None, e
+            else:
+                error = None
+
+        if not stream:
+            record_step_timing(step, sdk_name, time.perf_counter() - start)
+
+        delay = scheduler.retry_delay(
+            model,
+            attempt,
+            status=None if response is None else response.status_code,
+            retry_after=(
+                None if response is None else response.headers.get("Retry-After")
+            ),
+        )
+        if delay is None:
+            if error is not None:
+                raise error
+            return response
+
+        if response is not None:
+            response.close()
+        reason = error or f"HTTP {response.status_code}"
+        print(f"Retrying the {step} request of {sdk_name} in {delay:.1f}s ({reason})")
+        time.sleep(delay)
+
+
+async def apost_llm_request(
+    url: str,
+    *,
+    headers: dict,
+    body: dict,
+    step: Step,
+    sdk_name: str,
+    stream: bool = False,
+) -> httpx.Response:
+    """
+    Async version of `post_llm_request`, sent through the shared async client.
+    """
+    client = get_async_client()
+    provider = get_provider(step)
+    semaphores = _async_semaphores.setdefault(asyncio.get_running_loop(), {})
+    if provider not in semaphores:
+        semaphores[provider] = asyncio.Semaphore(CONCURRENCY[provider])
+
+    scheduler = get_scheduler()
+    model = AGENT[step]["model"]
+    # the tokenizer blocks, count off the event loop
+    tokens = await asyncio.to_thread(request_tokens, body, step=step)
+
+    for attempt in itertools.count():
+        await scheduler.aacquire(model, tokens)
+        async with semaphores[provider]:
+            start = time.perf_counter()
+            try:
+                request = client.build_request("POST", url, headers=headers, json=body)
+                response = await client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                response, error = None, e
+            else:
+                error = None
+
+        if not stream:
+            record_step_timing(step, sdk_name, time.perf_counter() - start)
+
+        delay = scheduler.retry_delay(
+            model,
+            attempt,
+            status=None if response is None else response.status_code,
+            retry_after=(
+                None if response is None else response.headers.get("Retry-After")
+            ),
+        )
+        if delay is None:
+            if error is not None:
+                raise error
+            return response
+
+        if response is not None:
+            await response.aclose()
+        reason = error or f"HTTP {response.status_code}"
+        print(f"Retrying the {step} request of {sdk_name} in {delay:.1f}s ({reason})")
+        await asyncio.sleep(delay)
+
+
+def get_llm_endpoint(provider: Provider) -> str:
+    """
+    Get the endpoint of a provider, on the mock server when MOCK_SERVER is enabled
+    or on SDKGEN_LLM_BASE_URL when it is set.
+
+    :param provider: The provider.
+    :return: The url the requests of the provider are sent to.
+    """
+    url = OPENAI_API if provider == "openai" else EDEN_AI_API
+
+    base_url = os.getenv("SDKGEN_LLM_BASE_URL")
+    if not base_url and MOCK_SERVER["enabled"]:
+        base_url = f"http://{MOCK_SERVER['host']}:{MOCK_SERVER['port']}"
+
+    if base_url:
+        return base_url.rstrip("/") + urlsplit(url).path
+
+    return url
+
+
+def build_llm_request(payload: dict, *, step: Step) -> tuple[str, dict, dict]:
+    """
+    Build the request sent to the provider serving the step.
+
+    :param payload: The payload (Eden AI format) built by the generators.
+    :param step: The step in the process.
+    :return: The provider url, the headers and the JSON body.
     """
     if AGENT[step]["custom"]:
         headers = {
@@ -72,10 +382,10 @@ def generate_llm_response(
 
         prev_history = [
             {
-                "role": step["role"],
-                "content": step["message"],
+                "role": item["role"],
+                "content": item["message"],
             }
-            for step in payload["previous_history"]
+            for item in payload["previous_history"]
         ]
 
         body = {
@@ -98,16 +408,32 @@ def generate_llm_response(
             ],
         }
 
-        response = requests.post(
-            OPENAI_API,
-            headers=headers,
-            json=body,
-        )
-        response.raise_for_status()
-        log_llm_response(body, response.json(), step=step, sdk_name=sdk_name)
+        return get_llm_endpoint("openai"), headers, body
+
+    headers = {
+        "Authorization": f"Bearer {os.getenv('EDEN_AI_AUTH_TOKEN')}",
+        "Content-Type": "application/json",
+    }
 
-        data = response.json()
+    body = payload | {
+        "temperature": TEMPERATURE[step],
+        "max_tokens": MAX_TOKENS[step],
+        "settings": {"openai": AGENT[step]["model"]},
+    }
+
+    return get_llm_endpoint("edenai"), headers, body
+
+
+def parse_llm_response(data: dict, payload: dict, *, step: Step) -> tuple[str, list]:
+    """
+    Extract the message and the conversation history from the provider response.
 
+    :param data: The JSON response of the provider.
+    :param payload: The payload the request was built from.
+    :param step: The step in the process.
+    :return: The message and the history of the conversation.
+    """
+    if AGENT[step]["custom"]:
         message = data["choices"][0]["message"]["content"]
         history = [
             {
@@ -120,88 +446,230 @@ def generate_llm_response(
             },
         ]
 
-    else:
-        headers = {
-            "Authorization": f"Bearer {os.getenv('EDEN_AI_AUTH_TOKEN')}",
-            "Content-Type": "application/json",
-        }
+        return message, history
 
-        body = payload | {
-            "temperature": TEMPERATURE[step],
-            "max_tokens": MAX_TOKENS[step],
-            "settings": {"openai": AGENT[step]["model"]},
-        }
+    if "error" in data["openai"]:
+        raise Exception(data["openai"]["error"])
+
+    message = data["openai"]["generated_text"]
+    history = data["openai"]["message"]
+
+    return message, history
+
+
+def build_stream_request(url: str, body: dict, *, step: Step) -> tuple[str, dict]:
+    """
+    Turn a request built by `build_llm_request` into its streaming version.
+
+    :return: The streaming endpoint and the JSON body.
+    """
+    if AGENT[step]["custom"]:
+        return url, body | {"stream": True, "stream_options": {"include_usage": True}}
+
+    return url + "/stream", body
+
+
+def stream_llm_response(
+    url: str, *, headers: dict, body: dict, payload: dict, step: Step, sdk_name: str
+) -> dict:
+    """
+    Stream the response of the language model, see `streaming.collect_stream`.
+
+    :return: The response, in the format the provider uses without streaming.
+    """
+    url, body = build_stream_request(url, body, step=step)
+    start = time.perf_counter()
+    response = post_llm_request(
+        url, headers=headers, body=body, step=step, sdk_name=sdk_name, stream=True
+    )
 
-        response = requests.post(
-            EDEN_AI_API,
-            headers=headers,
-            json=body,
+    # closing the response on an abort stops the generation of the tokens
+    with response:
+        response.raise_for_status()
+        message, usage = collect_stream(
+            iter_decoded_lines(response.iter_lines()), get_provider(step), step=step
         )
 
+    record_step_timing(step, sdk_name, time.perf_counter() - start)
+
+    return streamed_response_data(message, usage, payload, get_provider(step))
+
+
+async def astream_llm_response(
+    url: str, *, headers: dict, body: dict, payload: dict, step: Step, sdk_name: str
+) -> dict:
+    """
+    Async version of `stream_llm_response`.
+    """
+    url, body = build_stream_request(url, body, step=step)
+    start = time.perf_counter()
+    response = await apost_llm_request(
+        url, headers=headers, body=body, step=step, sdk_name=sdk_name, stream=True
+    )
+
+    try:
         response.raise_for_status()
-        log_llm_response(body, response.json(), step=step, sdk_name=sdk_name)
+        message, usage = await acollect_stream(
+            response.aiter_lines(), get_provider(step), step=step
+        )
+    finally:
+        await response.aclose()
 
-        data = response.json()
+    record_step_timing(step, sdk_name, time.perf_counter() - start)
 
-        if "error" in data["openai"]:
-            raise Exception(data["openai"]["error"])
+    return streamed_response_data(message, usage, payload, get_provider(step))
 
-        message = data["openai"]["generated_text"]
-        history = data["openai"]["message"]
 
-    return message, history
+def usage_tokens(
+    data: dict, body: dict, message: str, *, step: Step
+) -> tuple[int, int]:
+    """
+    Get the prompt and completion tokens of a call, from the usage sent by the
+    provider or else counted with the tokenizer of the model.
+    """
+    usage = data.get("usage")
+    if usage:
+        return usage["prompt_tokens"], usage["completion_tokens"]
 
+    prompt_tokens = request_tokens(body, step=step) - body["max_tokens"]
+    return prompt_tokens, count_tokens(message, step=step)
 
-def split_openapi_spec(file_path: Path, output_dir_path: Path):
+
+@contextmanager
+def instrument_llm_call(body: dict, *, step: Step, sdk_name: str) -> Iterator[dict]:
     """
-    Split an OpenAPI specification file into separate files for each resource.
-    :param file_path: Path to the OpenAPI specification file.
-    :param output_dir_path: Path to the directory where the split files will be saved.
+    Time an LLM call and record it in the metrics and in a span of the current trace.
 
-    :return: None
+    The caller sets the "outcome" of the yielded dict to "cached", or to "success"
+    with the "data" of the response and its "message", and optionally its "usage"
+    (see `usage_tokens`). Otherwise the call is an error.
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        if file_path.suffix == ".yaml" or file_path.suffix == ".yml":
-            spec = yaml.safe_load(file)
-        elif file_path.suffix == ".json":
-            spec = json.load(file)
+    model = AGENT[step]["model"]
+    call = {"outcome": "error"}
+    start = time.perf_counter()
+
+    with span(
+        f"llm.{step}", **{"llm.step": step, "llm.model": model, "sdk.name": sdk_name}
+    ) as llm_span:
+        try:
+            yield call
+        finally:
+            prompt_tokens = completion_tokens = 0
+            if call["outcome"] == "success":
+                prompt_tokens, completion_tokens = call.get("usage") or usage_tokens(
+                    call["data"], body, call["message"], step=step
+                )
+
+            cost = record_llm_call(
+                step,
+                model,
+                outcome=call["outcome"],
+                seconds=time.perf_counter() - start,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+            )
+            if llm_span is not None:
+                llm_span.set(
+                    **{
+                        "llm.outcome": call["outcome"],
+                        "llm.prompt_tokens": prompt_tokens,
+                        "llm.completion_tokens": completion_tokens,
+                        "llm.cost_usd": cost,
+                    }
+                )
+
+
+def generate_llm_response(
+    payload: dict, *, step: Step, sdk_name: str
+) -> tuple[str, list]:
+    """
+    Generate code for the API spec via the language model.
+
+    Responses are served from the response cache when the exact same request was already made,
+    and streamed when STREAMING is enabled.
+
+    :return: The response from the language model.
+    """
+    url, headers, body = build_llm_request(payload, step=step)
+
+    with instrument_llm_call(body, step=step, sdk_name=sdk_name) as call:
+        cache = get_response_cache()
+        key = cache_key(url, body)
+        if (data := cache.get(key)) is not None:
+            call["outcome"] = "cached"
+            return parse_llm_response(data, payload, step=step)
+
+        if STREAMING["enabled"]:
+            data = stream_llm_response(
+                url,
+                headers=headers,
+                body=body,
+                payload=payload,
+                step=step,
+                sdk_name=sdk_name,
+            )
         else:
-            raise ValueError(
-                "Unsupported file format. Please provide a YAML or JSON file."
+            response = post_llm_request(
+                url, headers=headers, body=body, step=step, sdk_name=sdk_name
             )
+            response.raise_for_status()
+            data = response.json()
 
-    paths = spec.get("paths", {})
-    default_spec = spec.copy()
-    del default_spec["paths"]
+        log_llm_response(body, data, step=step, sdk_name=sdk_name)
 
-    max_level = 0
-    for path in paths:
-        level = len(path.split("/"))
-        if level > max_level:
-            max_level = level
+        message, history = parse_llm_response(data, payload, step=step)
+        cache.set(key, data)
+        call.update(outcome="success", data=data, message=message)
 
-    specs = {}
-    level = 1
-    while len(specs) < 2 and level < max_level:
-        specs = {}
-        for path, methods in paths.items():
-            resource = path.split("/")[level]
-            if resource not in specs:
-                specs[resource] = default_spec.copy()
-                specs[resource]["paths"] = {}
+        return message, history
 
-            specs[resource]["paths"][path] = methods
 
-        level += 1
+async def agenerate_llm_response(
+    payload: dict, *, step: Step, sdk_name: str
+) -> tuple[str, list]:
+    """
+    Async version of `generate_llm_response`.
 
-    if not specs or len(specs) < 2:
-        raise ValueError("Failed to split the OpenAPI spec.")
+    The response cache (SQLite), the tokenizer and the logger block, so they run
+    in threads, off the event loop.
+
+    :return: The response from the language model.
+    """
+    url, headers, body = build_llm_request(payload, step=step)
+
+    with instrument_llm_call(body, step=step, sdk_name=sdk_name) as call:
+        cache = get_response_cache()
+        key = cache_key(url, body)
+        if (data := await asyncio.to_thread(cache.get, key)) is not None:
+            call["outcome"] = "cached"
+            return parse_llm_response(data, payload, step=step)
+
+        if STREAMING["enabled"]:
+            data = await astream_llm_response(
+                url,
+                headers=headers,
+                body=body,
+                payload=payload,
+                step=step,
+                sdk_name=sdk_name,
+            )
+        else:
+            response = await apost_llm_request(
+                url, headers=headers, body=body, step=step, sdk_name=sdk_name
+            )
+            response.raise_for_status()
+            data = response.json()
+
+        await asyncio.to_thread(
+            log_llm_response, body, data, step=step, sdk_name=sdk_name
+        )
 
-    for resource, spec in specs.items():
-        resource = resource.replace("{", "").replace("}", "")
-        output_file = output_dir_path / f"{resource}.json"
-        with open(output_file, "w", encoding="utf-8") as file:
-            json.dump(spec, file, indent=2)
+        message, history = parse_llm_response(data, payload, step=step)
+        await asyncio.to_thread(cache.set, key, data)
+        usage = await asyncio.to_thread(usage_tokens, data, body, message, step=step)
+        call.update(outcome="success", data=data, message=message, usage=usage)
+
+        return message, history
 
 
 def check_step_count(txt: str, *, step: Step) -> bool:
@@ -215,10 +683,7 @@ def check_step_count(txt: str, *, step: Step) -> bool:
     :return: True if the number of tokens is within the limit, False otherwise.
     :rtype: bool
     """
-    model = AGENT[step]["model"]
-    encoding = tiktoken.encoding_for_model(model)
-    num_token = len(encoding.encode(txt))
-    return num_token <= MAX_PROMPT_LENGTH[step]
+    return count_tokens(txt, step=step) <= MAX_PROMPT_LENGTH[step]
 
 
 def is_all_steps_within_limit(
@@ -240,64 +705,8 @@ def is_all_steps_within_limit(
 
     :rtype: bool
     """
-    rules = "#RULES:\n" + user_rules if user_rules else ""
-    with_types = not not types_json
-
-    if with_types:
-        steps: list[dict] = [
-            {
-                "name": "types",
-                "prompt": TEMPLATES[lang]["types"].format(
-                    types=types_json, rules=rules
-                ),
-            },
-            {
-                "name": "initial_code",
-                "prompt": TEMPLATES[lang]["initial_code"].format(
-                    api_spec=open_specs, rules=rules
-                ),
-            },
-            {
-                "name": "feedback",
-                "prompt": TEMPLATES[lang]["feedback"].format(
-                    generated_code="# " * MAX_TOKENS["feedback"], rules=rules
-                ),
-            },
-            {
-                "name": "final_code",
-                "prompt": TEMPLATES[lang]["final_code"].format(
-                    feedback="# " * MAX_TOKENS["final_code"], rules=rules
-                ),
-            },
-        ]
-    else:
-        steps: list[dict] = [
-            {
-                "name": "initial_code",
-                "prompt": TEMPLATES_WITHOUT_TYPES[lang]["initial_code"].format(
-                    api_spec=open_specs, rules=rules
-                ),
-            },
-            {
-                "name": "feedback",
-                "prompt": TEMPLATES_WITHOUT_TYPES[lang]["feedback"].format(
-                    generated_code="#" * MAX_TOKENS["feedback"], rules=rules
-                ),
-            },
-            {
-                "name": "final_code",
-                "prompt": TEMPLATES_WITHOUT_TYPES[lang]["final_code"].format(
-                    feedback="#" * MAX_TOKENS["final_code"], rules=rules
-                ),
-            },
-        ]
-
-    return all(
-        check_step_count(
-            step["prompt"],
-            step=step["name"],
-        )
-        for step in steps
+    return is_within_budget(
+        step_budget_report(open_specs, types_json, user_rules=user_rules, language=lang)
     )
 
 